@@ -0,0 +1 @@
+"""Agent loop benchmarks (see README.md)."""
@@ -0,0 +1,77 @@
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare before.json after.json [--threshold 0.10]
+
+Prints every numeric metric side by side with the relative change. Timing and
+memory metrics (suffixes _s, _us, _bytes, _bytes_per_step) count as
+regressions when they grow by more than --threshold; the exit status is 1 if
+any regression is found, so the script can gate CI.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+# Metrics where larger values are worse
+COST_SUFFIXES = ("_s", "_us", "_bytes", "_bytes_per_step")
+
+
+def flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Flatten nested results into dotted metric names with numeric values."""
+    flat: dict[str, float] = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(before: dict[str, Any], after: dict[str, Any], threshold: float) -> tuple[list[tuple], list[str]]:
+    """Compare two reports.
+
+    Returns:
+        (rows, regressions): rows of (metric, before, after, change) and the
+        names of cost metrics that grew by more than threshold
+    """
+    old = flatten(before.get("results", {}))
+    new = flatten(after.get("results", {}))
+    rows = []
+    regressions = []
+    for metric in sorted(old.keys() & new.keys()):
+        a, b = old[metric], new[metric]
+        change = (b - a) / a if a else 0.0
+        rows.append((metric, a, b, change))
+        if metric.endswith(COST_SUFFIXES) and change > threshold:
+            regressions.append(metric)
+    return rows, regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before", help="Baseline results JSON")
+    parser.add_argument("after", help="New results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative growth counted as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    before = json.loads(Path(args.before).read_text(encoding="utf-8"))
+    after = json.loads(Path(args.after).read_text(encoding="utf-8"))
+    rows, regressions = compare(before, after, args.threshold)
+
+    print(f"before: {before.get('meta', {}).get('commit')}  after: {after.get('meta', {}).get('commit')}")
+    width = max((len(row[0]) for row in rows), default=10)
+    for metric, a, b, change in rows:
+        marker = "  <-- regression" if metric in regressions else ""
+        print(f"{metric:<{width}}  {a:>14.3f}  {b:>14.3f}  {change:>+8.1%}{marker}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Deterministic in-process LLM client for benchmarks.
+
+``ScriptedLLMClient`` replays canned responses instead of calling an API, so
+benchmarks measure only the agent's own overhead. By default it still runs the
+Anthropic request conversion (messages, tool schemas, cache breakpoints) on
+every call, like a real client would before sending the request.
+"""
+
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from mini_agent.llm.anthropic_client import AnthropicClient
+from mini_agent.llm.base import LLMClientBase
+from mini_agent.schema import FunctionCall, LLMResponse, Message, TokenUsage, ToolCall
+
+Responder = Callable[[list[Message], Any, int], LLMResponse]
+
+
+class ScriptedLLMClient(LLMClientBase):
+    """LLM client that answers from a script instead of the network."""
+
+    def __init__(self, responder: Responder, convert_requests: bool = True):
+        """Initialize scripted client.
+
+        Args:
+            responder: Called as responder(messages, tools, call_index) for every generate()
+            convert_requests: Build the Anthropic request payload for each call (no network I/O)
+        """
+        super().__init__(api_key="benchmark", api_base="http://127.0.0.1:9", model="scripted")
+        self.responder = responder
+        self.convert_requests = convert_requests
+        self.calls = 0
+        # perf_counter() at the start of every generate() call
+        self.call_times: list[float] = []
+        # Optional hook run at the start of every call (e.g. memory sampling)
+        self.on_call: Callable[[int], None] | None = None
+        self._converter = AnthropicClient(api_key="benchmark", api_base="http://127.0.0.1:9") if convert_requests else None
+
+    async def generate(self, messages: list[Message], tools: list[Any] | None = None) -> LLMResponse:
+        self.call_times.append(perf_counter())
+        if self.on_call is not None:
+            self.on_call(self.calls)
+        if self.convert_requests:
+            self._prepare_request(messages, tools)
+        response = self.responder(messages, tools, self.calls)
+        self.calls += 1
+        return response
+
+    def _prepare_request(self, messages: list[Message], tools: list[Any] | None = None) -> dict[str, Any]:
+        system_message, api_messages = self._convert_messages(messages)
+        return self._converter._build_params(system_message, api_messages, tools)
+
+    def _convert_messages(self, messages: list[Message]) -> tuple[str | None, list[dict[str, Any]]]:
+        return self._converter._convert_messages(messages)
+
+
+def tool_loop_responder(steps: int, tool_name: str, arguments: dict[str, Any] | None = None, tools_per_step: int = 1) -> Responder:
+    """Responder that calls tool_name tools_per_step times per step for steps steps, then finishes."""
+
+    def respond(messages: list[Message], tools: Any, call_index: int) -> LLMResponse:
+        usage = TokenUsage(prompt_tokens=1000, completion_tokens=50, total_tokens=1050)
+        if call_index >= steps:
+            return LLMResponse(content="Task complete.", finish_reason="stop", usage=usage)
+        tool_calls = [
+            ToolCall(
+                id=f"call_{call_index}_{i}",
+                type="function",
+                function=FunctionCall(name=tool_name, arguments=dict(arguments or {"key": f"{call_index}-{i}"})),
+            )
+            for i in range(tools_per_step)
+        ]
+        return LLMResponse(
+            content=f"Step {call_index}: running {tool_name}.",
+            thinking="Next I will call the tool again.",
+            tool_calls=tool_calls,
+            finish_reason="tool_use",
+            usage=usage,
+        )
+
+    return respond
+
+
+def summary_responder(summary: str = "Executed the requested tools; all calls succeeded.") -> Responder:
+    """Responder that returns a fixed summary text (for summarization benchmarks)."""
+
+    def respond(messages: list[Message], tools: Any, call_index: int) -> LLMResponse:
+        return LLMResponse(content=summary, finish_reason="stop")
+
+    return respond
@@ -0,0 +1,462 @@
+"""Agent loop benchmarks.
+
+Runs the agent against a scripted in-process LLM (see fake_llm.py) and writes
+the results as JSON, so runs can be compared between commits:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json
+    python -m benchmarks.compare before.json after.json
+
+Use --quick for a fast smoke run and --only to select benchmarks.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from mini_agent.agent import Agent
+from mini_agent.schema import FunctionCall, Message, ToolCall
+from mini_agent.tools.base import Tool, ToolResult
+from mini_agent.tools.bash_tool import BashKillTool, BashOutputTool, BashTool, close_persistent_shells
+from mini_agent.tools.file_cache import FileCache
+from mini_agent.tools.file_tools import EditTool, GlobTool, GrepTool, MultiEditTool, ReadTool, WriteTool, read_line_range
+from mini_agent.tools.note_tool import RecallNoteTool, SessionNoteTool
+from mini_agent.tools.search_index import WorkspaceIndex
+
+from .fake_llm import ScriptedLLMClient, summary_responder, tool_loop_responder
+
+RESULT_SIZE = 400  # Characters returned by the benchmark tool per call
+
+
+class NoopTool(Tool):
+    """Read-only tool that returns a fixed payload immediately."""
+
+    @property
+    def name(self) -> str:
+        return "noop"
+
+    @property
+    def description(self) -> str:
+        return "Return a fixed payload."
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"key": {"type": "string"}}}
+
+    @property
+    def read_only(self) -> bool:
+        return True
+
+    async def execute(self, key: str = "") -> ToolResult:
+        return ToolResult(success=True, content=f"{key}:" + "x" * RESULT_SIZE)
+
+
+def _make_agent(llm: ScriptedLLMClient, workspace: Path, tools: list[Tool] | None = None, **kwargs) -> Agent:
+    return Agent(
+        llm_client=llm,
+        system_prompt="You are a benchmark agent.",
+        tools=tools if tools is not None else [NoopTool()],
+        workspace_dir=str(workspace),
+        **kwargs,
+    )
+
+
+def _default_tools(workspace: Path) -> list[Tool]:
+    """The tool set the CLI registers (without MCP and skills)."""
+    cache = FileCache()
+    return [
+        BashTool(),
+        BashOutputTool(),
+        BashKillTool(),
+        ReadTool(workspace_dir=str(workspace), cache=cache),
+        WriteTool(workspace_dir=str(workspace), cache=cache),
+        EditTool(workspace_dir=str(workspace), cache=cache),
+        MultiEditTool(workspace_dir=str(workspace), cache=cache),
+        GrepTool(workspace_dir=str(workspace)),
+        GlobTool(workspace_dir=str(workspace)),
+        SessionNoteTool(memory_file=str(workspace / ".agent_memory.json")),
+        RecallNoteTool(memory_file=str(workspace / ".agent_memory.json")),
+    ]
+
+
+def _distribution_us(samples: list[float]) -> dict[str, float]:
+    """Summarize durations (seconds) as microsecond statistics."""
+    ordered = sorted(samples)
+    return {
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p95_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+def _time_per_call(func: Callable[[], Any], repeat: int) -> float:
+    """Average microseconds per call of func."""
+    start = perf_counter()
+    for _ in range(repeat):
+        func()
+    return (perf_counter() - start) / repeat * 1e6
+
+
+def _history(rounds: int, steps_per_round: int = 3) -> list[Message]:
+    """Synthetic history: each round is a user message followed by tool-call steps."""
+    messages = [Message(role="system", content="You are a benchmark agent.")]
+    for r in range(rounds):
+        messages.append(Message(role="user", content=f"Task {r}: process file_{r}.txt and report."))
+        for s in range(steps_per_round):
+            call_id = f"call_{r}_{s}"
+            messages.append(
+                Message(
+                    role="assistant",
+                    content=f"Working on step {s} of task {r}.",
+                    tool_calls=[ToolCall(id=call_id, type="function", function=FunctionCall(name="noop", arguments={"key": call_id}))],
+                )
+            )
+            messages.append(Message(role="tool", content=f"{call_id}:" + "x" * RESULT_SIZE, tool_call_id=call_id, name="noop"))
+    return messages
+
+
+async def bench_step_overhead(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Per-step overhead of Agent.run (everything except the LLM and the tool itself)."""
+    steps = 50 if quick else 300
+    llm = ScriptedLLMClient(tool_loop_responder(steps, "noop"))
+    agent = _make_agent(llm, workspace, max_steps=steps + 1, token_limit=10**9)
+    agent.add_user_message("Run the benchmark.")
+
+    start = perf_counter()
+    await agent.run()
+    total = perf_counter() - start
+    agent.logger.close()
+
+    intervals = [b - a for a, b in zip(llm.call_times, llm.call_times[1:])]
+    return {"steps": steps, "total_s": total, **_distribution_us(intervals)}
+
+
+async def bench_memory_growth(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Memory growth of a long run (history grows by one assistant + one tool message per step)."""
+    steps = 200 if quick else 1000
+    warmup = steps // 10
+    samples: dict[int, int] = {}
+
+    def sample(call_index: int):
+        if call_index in (warmup, steps):
+            samples[call_index] = tracemalloc.get_traced_memory()[0]
+
+    llm = ScriptedLLMClient(tool_loop_responder(steps, "noop"))
+    llm.on_call = sample
+    agent = _make_agent(llm, workspace, max_steps=steps + 1, token_limit=10**9)
+    agent.add_user_message("Run the benchmark.")
+
+    tracemalloc.start()
+    try:
+        await agent.run()
+        agent.logger.flush()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    agent.logger.close()
+
+    growth = samples[steps] - samples[warmup]
+    return {
+        "steps": steps,
+        "messages": len(agent.messages),
+        "peak_bytes": peak,
+        "growth_bytes": growth,
+        "growth_bytes_per_step": growth / (steps - warmup),
+    }
+
+
+async def bench_summarization(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Cost of compacting histories of several sizes, and of re-compacting after one new round."""
+    sizes = [10, 50] if quick else [10, 50, 200]
+    results: dict[str, Any] = {}
+    for rounds in sizes:
+        llm = ScriptedLLMClient(summary_responder())
+        agent = _make_agent(llm, workspace, token_limit=1)
+        agent.messages = _history(rounds)
+        messages_before = len(agent.messages)
+
+        start = perf_counter()
+        await agent._summarize_messages()
+        first = perf_counter() - start
+        first_calls = llm.calls
+
+        # One more round, then compact again: unchanged rounds are reused
+        agent.messages.extend(_history(1)[1:])
+        agent._skip_next_token_check = False
+        start = perf_counter()
+        await agent._summarize_messages()
+        second = perf_counter() - start
+
+        results[f"rounds_{rounds}"] = {
+            "messages_before": messages_before,
+            "messages_after": len(agent.messages),
+            "first_s": first,
+            "first_llm_calls": first_calls,
+            "recompact_s": second,
+            "recompact_llm_calls": llm.calls - first_calls,
+        }
+    return results
+
+
+async def bench_schema_conversion(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Tool schema conversion per LLM call: cached registry vs rebuilding every schema."""
+    repeat = 2000 if quick else 20000
+    llm = ScriptedLLMClient(summary_responder())
+    agent = _make_agent(llm, workspace, tools=_default_tools(workspace))
+    converter = llm._converter
+    tools = list(agent.tools.values())
+    return {
+        "tools": len(tools),
+        "registry_us": _time_per_call(lambda: converter._convert_tools(agent.tools), repeat),
+        "rebuild_us": _time_per_call(lambda: converter._convert_tools(tools), repeat),
+    }
+
+
+async def bench_token_estimation(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Local token estimation: full recount vs incremental after one new message."""
+    rounds = 50 if quick else 200
+    llm = ScriptedLLMClient(summary_responder())
+    agent = _make_agent(llm, workspace)
+    agent.messages = _history(rounds)
+
+    start = perf_counter()
+    agent._estimate_tokens()
+    cold = perf_counter() - start
+
+    def full():
+        agent._reset_token_total()
+        agent._estimate_tokens()
+
+    extra = _history(1)[1:]
+
+    def incremental():
+        agent.messages.append(extra[0])
+        agent._estimate_tokens()
+        agent.messages.pop()
+        agent._estimate_tokens()
+
+    return {
+        "messages": len(agent.messages),
+        "cold_us": cold * 1e6,
+        "recount_cached_us": _time_per_call(full, 20),
+        "incremental_us": _time_per_call(incremental, 200) / 2,
+    }
+
+
+async def bench_logging(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Caller-side cost of logging one LLM request at a long history."""
+    rounds = 50 if quick else 200
+    messages = _history(rounds)
+    results: dict[str, Any] = {"messages": len(messages)}
+    for log_format in ("text", "jsonl"):
+        llm = ScriptedLLMClient(summary_responder())
+        agent = _make_agent(llm, workspace, log_format=log_format)
+        agent.logger.start_new_run()
+        tools = agent.tools.values()
+        history = list(messages)
+
+        def log_step():
+            history.append(messages[-1])
+            agent.logger.log_request(history, tools=tools)
+
+        results[f"{log_format}_us"] = _time_per_call(log_step, 200)
+        start = perf_counter()
+        agent.logger.flush(timeout=None)
+        results[f"{log_format}_drain_s"] = perf_counter() - start
+        agent.logger.close()
+    return results
+
+
+async def bench_tool_dispatch(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Dispatch overhead for a batch of parallel read-only tool calls."""
+    repeat = 200 if quick else 2000
+    llm = ScriptedLLMClient(summary_responder())
+    agent = _make_agent(llm, workspace)
+    calls = [ToolCall(id=f"c{i}", type="function", function=FunctionCall(name="noop", arguments={"key": str(i)})) for i in range(8)]
+
+    start = perf_counter()
+    for _ in range(repeat):
+        for batch in agent._group_tool_calls(calls):
+            await agent._execute_tool_batch(batch)
+    per_batch = (perf_counter() - start) / repeat
+    return {"calls_per_batch": len(calls), "batch_us": per_batch * 1e6, "per_call_us": per_batch / len(calls) * 1e6}
+
+
+async def bench_bash_latency(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Latency of short foreground bash commands: spawn per command vs a persistent session."""
+    repeat = 20 if quick else 200
+    results = {}
+    for label, persistent in (("spawn", False), ("persistent", True)):
+        tool = BashTool(workspace_dir=str(workspace), persistent_session=persistent)
+        await tool.execute(command="true")  # start the session outside the measurement
+        samples = []
+        for _ in range(repeat):
+            start = perf_counter()
+            await tool.execute(command="echo ok")
+            samples.append(perf_counter() - start)
+        results[label] = _distribution_us(samples)
+    await close_persistent_shells()
+    return results
+
+
+async def bench_read_range(workspace: Path, quick: bool) -> dict[str, Any]:
+    """Reading 50 lines near the end of a large file: first read (builds the line index) and cached reads."""
+    line_count = 200_000 if quick else 2_000_000
+    path = workspace / "bench_read_range.log"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(line_count):
+            f.write(f"2024-01-01T00:00:00 INFO worker-{i % 16} processed request {i}\n")
+    start_line = line_count - 1000
+
+    start = perf_counter()
+    read_line_range(path, start_line, 50)
+    first = perf_counter() - start
+    samples = []
+    for i in range(20):
+        start = perf_counter()
+        read_line_range(path, start_line - i * 100, 50)
+        samples.append(perf_counter() - start)
+    path.unlink()
+    return {"lines": line_count, "first_read_us": first * 1e6, "cached": _distribution_us(samples)}
+
+
+async def bench_search(workspace: Path, quick: bool) -> dict[str, Any]:
+    """grep/glob over a synthetic tree: first search (lists files, builds signatures), repeated searches, refresh."""
+    file_count = 2_000 if quick else 50_000
+    root = workspace / "bench_search"
+    for i in range(file_count):
+        directory = root / f"pkg{i % 50}" / f"mod{i % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        body = "".join(f"def handler_{i}_{j}(request):\n    return process(request, {j})\n\n" for j in range(20))
+        (directory / f"file{i}.py").write_text(body, encoding="utf-8")
+    index = WorkspaceIndex(root, refresh_interval=3600, cache_dir=workspace / "search_index")
+    grep = GrepTool(workspace_dir=str(root), index=index)
+    glob = GlobTool(workspace_dir=str(root), index=index)
+
+    start = perf_counter()
+    await grep.execute(pattern=r"def handler_17_3\(")
+    first = perf_counter() - start
+    samples = []
+    for i in range(20):
+        start = perf_counter()
+        await grep.execute(pattern=rf"def handler_{i * 37 % file_count}_5\(")
+        samples.append(perf_counter() - start)
+    glob_samples = []
+    for i in range(20):
+        start = perf_counter()
+        await glob.execute(pattern=f"pkg{i}/**/*.py")
+        glob_samples.append(perf_counter() - start)
+    start = perf_counter()
+    index.refresh(force=True)
+    refresh = perf_counter() - start
+    # After a file tool write: directories are stat'ed, files only in changed directories
+    index.mark_stale(index.root / index.files()[0].path)
+    start = perf_counter()
+    index.refresh()
+    incremental_refresh = perf_counter() - start
+    # Next process: signatures come from the saved index instead of reading every file
+    index.save()
+    restored = GrepTool(workspace_dir=str(root), index=WorkspaceIndex(root, refresh_interval=3600, cache_dir=index.cache_dir))
+    start = perf_counter()
+    await restored.execute(pattern=r"def handler_17_3\(")
+    first_restored = perf_counter() - start
+    return {
+        "files": file_count,
+        "first_grep_us": first * 1e6,
+        "first_grep_saved_index_us": first_restored * 1e6,
+        "grep": _distribution_us(samples),
+        "glob": _distribution_us(glob_samples),
+        "refresh_us": refresh * 1e6,
+        "incremental_refresh_us": incremental_refresh * 1e6,
+    }
+
+
+BENCHMARKS: dict[str, Callable[[Path, bool], Awaitable[dict[str, Any]]]] = {
+    "step_overhead": bench_step_overhead,
+    "memory_growth": bench_memory_growth,
+    "summarization": bench_summarization,
+    "schema_conversion": bench_schema_conversion,
+    "token_estimation": bench_token_estimation,
+    "logging": bench_logging,
+    "tool_dispatch": bench_tool_dispatch,
+    "bash_latency": bench_bash_latency,
+    "read_range": bench_read_range,
+    "search": bench_search,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5, cwd=Path(__file__).parent)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+async def run_benchmarks(names: list[str], quick: bool = False) -> dict[str, Any]:
+    """Run the selected benchmarks and return the JSON-serializable report.
+
+    Agent output is discarded and run logs go to a temporary home directory.
+    """
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="mini-agent-bench-") as tmp:
+        tmp_path = Path(tmp)
+        old_home = os.environ.get("HOME")
+        os.environ["HOME"] = str(tmp_path)
+        try:
+            with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+                for name in names:
+                    workspace = tmp_path / name
+                    workspace.mkdir()
+                    results[name] = await BENCHMARKS[name](workspace, quick)
+        finally:
+            if old_home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = old_home
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Mini-Agent loop benchmarks")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmarks(args.only or list(BENCHMARKS), quick=args.quick))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
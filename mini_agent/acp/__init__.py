@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from contextlib import aclosing
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
@@ -19,6 +21,7 @@ from acp import (
     NewSessionResponse,
     PromptRequest,
     PromptResponse,
+    RequestError,
     session_notification,
     start_tool_call,
     stdio_streams,
@@ -31,15 +34,22 @@ from acp import (
 from pydantic import field_validator
 from acp.schema import AgentCapabilities, Implementation, McpCapabilities
 
+from mini_agent.acp.scheduler import SchedulerStats, SessionScheduler
 from mini_agent.agent import Agent
 from mini_agent.cli import add_workspace_tools, initialize_base_tools
 from mini_agent.config import Config
-from mini_agent.llm import LLMClient
+from mini_agent.llm import LLMClient, TransportConfig
 from mini_agent.retry import RetryConfig as RetryConfigBase
-from mini_agent.schema import Message
+from mini_agent.schema import LLMResponse, Message
+from mini_agent.tools.bash_tool import BashTool, remove_spill_files
+from mini_agent.tools.file_cache import release_workspace_file_cache
+from mini_agent.tools.search_index import release_workspace_indexes, save_workspace_indexes
 
 logger = logging.getLogger(__name__)
 
+# Longest time between idle-session sweeps (seconds)
+SESSION_SWEEP_INTERVAL = 60.0
+
 
 try:
     class InitializeRequestPatch(InitializeRequest):
@@ -65,6 +75,8 @@ except Exception:  # pragma: no cover - defensive
 class SessionState:
     agent: Agent
     cancelled: bool = False
+    busy: bool = False  # A prompt is running (never evicted while busy)
+    last_active: float = field(default_factory=time.monotonic)
 
 
 class MiniMaxACPAgent:
@@ -84,6 +96,27 @@ class MiniMaxACPAgent:
         self._base_tools = base_tools
         self._system_prompt = system_prompt
         self._sessions: dict[str, SessionState] = {}
+        self._scheduler = SessionScheduler(
+            max_concurrent_llm_requests=config.acp.max_concurrent_llm_requests,
+            max_concurrent_tools=config.acp.max_concurrent_tools,
+        )
+        self._sweeper: asyncio.Task | None = None
+
+    def scheduler_stats(self) -> SchedulerStats:
+        """Get LLM/tool queueing metrics across all sessions."""
+        return self._scheduler.stats()
+
+    async def extMethod(self, method: str, params: dict[str, Any]) -> dict[str, Any]:  # noqa: ARG002
+        """ACP extension methods; "mini-agent/stats" returns scheduler metrics and session counts."""
+        if method != "mini-agent/stats":
+            raise RequestError.method_not_found(f"_{method}")
+        stats = self._scheduler.stats()
+        return {
+            **asdict(stats),
+            "llm_wait_avg": stats.llm_wait_avg,
+            "sessions": len(self._sessions),
+            "busy_sessions": sum(state.busy for state in self._sessions.values()),
+        }
 
     async def initialize(self, params: InitializeRequest) -> InitializeResponse:  # noqa: ARG002
         return InitializeResponse(
@@ -93,30 +126,53 @@ class MiniMaxACPAgent:
         )
 
     async def newSession(self, params: NewSessionRequest) -> NewSessionResponse:
+        await self._evict_idle_sessions(reserve=1)
+        self._start_sweeper()
         session_id = f"sess-{len(self._sessions)}-{uuid4().hex[:8]}"
         workspace = Path(params.cwd or self._config.agent.workspace_dir).expanduser()
         if not workspace.is_absolute():
             workspace = workspace.resolve()
         tools = list(self._base_tools)
         add_workspace_tools(tools, self._config, workspace)
-        agent = Agent(llm_client=self._llm, system_prompt=self._system_prompt, tools=tools, max_steps=self._config.agent.max_steps, workspace_dir=str(workspace))
+        agent = Agent(
+            llm_client=self._llm,
+            system_prompt=self._system_prompt,
+            tools=tools,
+            max_steps=self._config.agent.max_steps,
+            workspace_dir=str(workspace),
+            parallel_tool_calls=self._config.agent.parallel_tool_calls,
+            max_parallel_tools=self._config.agent.max_parallel_tools,
+            stream=self._config.agent.stream,
+            log_format=self._config.agent.log_format,
+        )
         self._sessions[session_id] = SessionState(agent=agent)
         return NewSessionResponse(sessionId=session_id)
 
     async def prompt(self, params: PromptRequest) -> PromptResponse:
         state = self._sessions.get(params.sessionId)
         if not state:
-            # Auto-create session if not found (compatibility with clients that skip newSession)
-            logger.warning(f"Session '{params.sessionId}' not found, auto-creating new session")
-            new_session = await self.newSession(NewSessionRequest(cwd=None))
-            state = self._sessions.get(new_session.sessionId)
-            if not state:
-                logger.error("Failed to auto-create session")
-                return PromptResponse(stopReason="refusal")
+            # Unknown or evicted: a new session would silently lose the history and the client's workspace
+            logger.warning("Prompt for unknown or evicted session '%s' refused", params.sessionId)
+            await self._send(
+                params.sessionId,
+                update_agent_message(text_block("Error: this session does not exist or expired after being idle; start a new session.")),
+            )
+            return PromptResponse(stopReason="refusal")
         state.cancelled = False
-        user_text = "\n".join(block.get("text", "") if isinstance(block, dict) else getattr(block, "text", "") for block in params.prompt)
-        state.agent.messages.append(Message(role="user", content=user_text))
-        stop_reason = await self._run_turn(state, params.sessionId)
+        state.busy = True
+        state.last_active = time.monotonic()
+        try:
+            user_text = "\n".join(block.get("text", "") if isinstance(block, dict) else getattr(block, "text", "") for block in params.prompt)
+            state.agent.messages.append(Message(role="user", content=user_text))
+            stop_reason = await self._run_turn(state, params.sessionId)
+        finally:
+            state.busy = False
+            state.last_active = time.monotonic()
+        stats = self._scheduler.stats()
+        logger.debug(
+            "Prompt done: session=%s, llm inflight=%d queued=%d, avg wait=%.3fs max wait=%.3fs",
+            params.sessionId, stats.llm_inflight, stats.llm_queued, stats.llm_wait_avg, stats.llm_wait_max,
+        )
         return PromptResponse(stopReason=stop_reason)
 
     async def cancel(self, params: CancelNotification) -> None:
@@ -129,17 +185,21 @@ class MiniMaxACPAgent:
         for _ in range(agent.max_steps):
             if state.cancelled:
                 return "cancelled"
-            tool_schemas = [tool.to_schema() for tool in agent.tools.values()]
             try:
-                response = await agent.llm.generate(messages=agent.messages, tools=tool_schemas)
+                async with self._scheduler.llm_slot(session_id):
+                    if agent.stream:
+                        response = await self._stream_response(agent, session_id)
+                    else:
+                        response = await agent.llm.generate(messages=agent.messages, tools=agent.tools)
+                if not agent.stream:
+                    if response.thinking:
+                        await self._send(session_id, update_agent_thought(text_block(response.thinking)))
+                    if response.content:
+                        await self._send(session_id, update_agent_message(text_block(response.content)))
             except Exception as exc:
                 logger.exception("LLM error")
                 await self._send(session_id, update_agent_message(text_block(f"Error: {exc}")))
                 return "refusal"
-            if response.thinking:
-                await self._send(session_id, update_agent_thought(text_block(response.thinking)))
-            if response.content:
-                await self._send(session_id, update_agent_message(text_block(response.content)))
             agent.messages.append(Message(role="assistant", content=response.content, thinking=response.thinking, tool_calls=response.tool_calls))
             if not response.tool_calls:
                 return "end_turn"
@@ -154,7 +214,8 @@ class MiniMaxACPAgent:
                     text, status = f"❌ Unknown tool: {name}", "failed"
                 else:
                     try:
-                        result = await tool.execute(**args)
+                        async with self._scheduler.tool_slot():
+                            result = await tool.execute(**args)
                         status = "completed" if result.success else "failed"
                         prefix = "✅" if result.success else "❌"
                         text = f"{prefix} {result.content if result.success else result.error or 'Tool execution failed'}"
@@ -164,6 +225,80 @@ class MiniMaxACPAgent:
                 agent.messages.append(Message(role="tool", content=text, tool_call_id=call.id, name=name))
         return "max_turn_requests"
 
+    async def _stream_response(self, agent: Agent, session_id: str) -> LLMResponse:
+        """Forward thinking/text deltas to the client as they stream in and return the final response."""
+        response = None
+        async with aclosing(agent.llm.generate_stream(messages=agent.messages, tools=agent.tools)) as stream:
+            async for event in stream:
+                if event.type == "thinking" and event.delta:
+                    await self._send(session_id, update_agent_thought(text_block(event.delta)))
+                elif event.type == "text" and event.delta:
+                    await self._send(session_id, update_agent_message(text_block(event.delta)))
+                elif event.type == "done":
+                    response = event.response
+        if response is None:
+            raise RuntimeError("LLM stream ended without a final response")
+        return response
+
+    def _start_sweeper(self) -> None:
+        """Start the periodic idle-session sweep (once, from the running event loop)."""
+        idle_timeout = self._config.acp.session_idle_timeout
+        if self._sweeper is None and idle_timeout > 0:
+            interval = min(SESSION_SWEEP_INTERVAL, idle_timeout / 2)
+            self._sweeper = asyncio.create_task(self._sweep_idle_sessions(interval), name="acp-session-sweeper")
+
+    async def _sweep_idle_sessions(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._evict_idle_sessions()
+            except Exception:
+                logger.exception("Idle session sweep failed")
+
+    async def _evict_idle_sessions(self, reserve: int = 0) -> None:
+        """Drop idle sessions (and their message histories) past the idle timeout or session cap.
+
+        Args:
+            reserve: Sessions about to be created, kept free under the session cap
+        """
+        now = time.monotonic()
+        idle_timeout = self._config.acp.session_idle_timeout
+        idle = [(sid, state) for sid, state in self._sessions.items() if not state.busy]
+        evict = {sid for sid, state in idle if idle_timeout > 0 and now - state.last_active > idle_timeout}
+
+        # Keep room for the reserved sessions under the cap, evicting least recently active first
+        excess = len(self._sessions) - len(evict) - (self._config.acp.max_sessions - reserve)
+        if excess > 0:
+            remaining = sorted((state.last_active, sid) for sid, state in idle if sid not in evict)
+            evict.update(sid for _, sid in remaining[:excess])
+
+        for sid in evict:
+            await self._close_session(self._sessions.pop(sid))
+        if evict:
+            self._scheduler.record_evictions(len(evict))
+            logger.info("Evicted %d idle session(s), %d active", len(evict), len(self._sessions))
+
+    async def _close_session(self, state: SessionState) -> None:
+        """Close a session removed from _sessions; the last session of a workspace releases its caches."""
+        await state.agent.logger.aclose()
+        bash_tool = state.agent.tools.get("bash")
+        if isinstance(bash_tool, BashTool):
+            bash_tool.close()
+        workspace = state.agent.workspace_dir
+        if not any(other.agent.workspace_dir == workspace for other in self._sessions.values()):
+            release_workspace_file_cache(workspace)
+            await asyncio.to_thread(release_workspace_indexes, workspace)
+
+    async def close(self) -> None:
+        """Stop the idle-session sweep and close all sessions (server shutdown)."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        sessions, self._sessions = self._sessions, {}
+        for state in sessions.values():
+            await self._close_session(state)
+
     async def _send(self, session_id: str, update: Any) -> None:
         await self._conn.sessionUpdate(session_notification(session_id, update))
 
@@ -183,11 +318,24 @@ async def run_acp_server(config: Config | None = None) -> None:
         if meta:
             system_prompt = f"{system_prompt.rstrip()}\n\n{meta}"
     rcfg = config.llm.retry
-    llm = LLMClient(api_key=config.llm.api_key, api_base=config.llm.api_base, model=config.llm.model, retry_config=RetryConfigBase(enabled=rcfg.enabled, max_retries=rcfg.max_retries, initial_delay=rcfg.initial_delay, max_delay=rcfg.max_delay, exponential_base=rcfg.exponential_base))
+    llm = LLMClient(api_key=config.llm.api_key, api_base=config.llm.api_base, model=config.llm.model, retry_config=RetryConfigBase(enabled=rcfg.enabled, max_retries=rcfg.max_retries, initial_delay=rcfg.initial_delay, max_delay=rcfg.max_delay, exponential_base=rcfg.exponential_base), prompt_cache=config.llm.prompt_cache, transport_config=TransportConfig(**config.llm.http.model_dump()))
     reader, writer = await stdio_streams()
-    AgentSideConnection(lambda conn: MiniMaxACPAgent(conn, config, llm, base_tools, system_prompt), writer, reader)
+    agents: list[MiniMaxACPAgent] = []
+
+    def create_agent(conn: AgentSideConnection) -> MiniMaxACPAgent:
+        agent = MiniMaxACPAgent(conn, config, llm, base_tools, system_prompt)
+        agents.append(agent)
+        return agent
+
+    AgentSideConnection(create_agent, writer, reader)
     logger.info("Mini-Agent ACP server running")
-    await asyncio.Event().wait()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for agent in agents:
+            await agent.close()
+        remove_spill_files()
+        await asyncio.to_thread(save_workspace_indexes)
 
 
 def main() -> None:
@@ -0,0 +1,135 @@
+"""Admission control for concurrent ACP sessions.
+
+All sessions served by one ACP process share a single upstream LLM client.
+``SessionScheduler`` bounds how many LLM requests and tool calls run at the
+same time and hands out free LLM slots round-robin across sessions, so one
+busy session cannot starve the others. It also records queueing metrics.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+
+@dataclass
+class SchedulerStats:
+    """Snapshot of scheduler metrics."""
+
+    llm_inflight: int = 0  # LLM requests currently running
+    llm_queued: int = 0  # LLM requests waiting for a slot
+    llm_peak_queued: int = 0  # Highest number of waiting LLM requests seen
+    llm_requests: int = 0  # LLM requests admitted so far
+    llm_wait_total: float = 0.0  # Total seconds spent waiting for LLM slots
+    llm_wait_max: float = 0.0  # Longest wait for an LLM slot (seconds)
+    tools_inflight: int = 0  # Tool calls currently running
+    evicted_sessions: int = 0  # Sessions evicted for being idle
+
+    @property
+    def llm_wait_avg(self) -> float:
+        """Average wait for an LLM slot (seconds)."""
+        return self.llm_wait_total / self.llm_requests if self.llm_requests else 0.0
+
+
+class SessionScheduler:
+    """Global LLM/tool concurrency limits with per-session round-robin fairness."""
+
+    def __init__(self, max_concurrent_llm_requests: int = 4, max_concurrent_tools: int = 8):
+        """Initialize scheduler.
+
+        Args:
+            max_concurrent_llm_requests: Maximum LLM requests in flight across all sessions
+            max_concurrent_tools: Maximum tool calls running across all sessions
+        """
+        self.max_concurrent_llm_requests = max(1, max_concurrent_llm_requests)
+        self.max_concurrent_tools = max(1, max_concurrent_tools)
+        self._llm_inflight = 0
+        # session_id -> waiting futures; session order is the round-robin order
+        self._llm_waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._tool_semaphore = asyncio.Semaphore(self.max_concurrent_tools)
+        self._stats = SchedulerStats()
+
+    @asynccontextmanager
+    async def llm_slot(self, session_id: str) -> AsyncIterator[None]:
+        """Hold one of the global LLM request slots for the duration of the block."""
+        start = time.monotonic()
+        await self._acquire_llm(session_id)
+        waited = time.monotonic() - start
+        self._stats.llm_requests += 1
+        self._stats.llm_wait_total += waited
+        self._stats.llm_wait_max = max(self._stats.llm_wait_max, waited)
+        try:
+            yield
+        finally:
+            self._release_llm()
+
+    @asynccontextmanager
+    async def tool_slot(self) -> AsyncIterator[None]:
+        """Hold one of the global tool execution slots for the duration of the block."""
+        async with self._tool_semaphore:
+            self._stats.tools_inflight += 1
+            try:
+                yield
+            finally:
+                self._stats.tools_inflight -= 1
+
+    def record_evictions(self, count: int) -> None:
+        """Add evicted sessions to the metrics."""
+        self._stats.evicted_sessions += count
+
+    def stats(self) -> SchedulerStats:
+        """Get a snapshot of the current metrics."""
+        self._stats.llm_inflight = self._llm_inflight
+        self._stats.llm_queued = self._queued()
+        return SchedulerStats(**vars(self._stats))
+
+    def _queued(self) -> int:
+        return sum(len(waiters) for waiters in self._llm_waiters.values())
+
+    async def _acquire_llm(self, session_id: str) -> None:
+        if self._llm_inflight < self.max_concurrent_llm_requests and not self._llm_waiters:
+            self._llm_inflight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._llm_waiters.setdefault(session_id, deque()).append(future)
+        self._stats.llm_peak_queued = max(self._stats.llm_peak_queued, self._queued())
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as we were cancelled: hand it on
+                self._release_llm()
+            else:
+                self._discard_waiter(session_id, future)
+            raise
+
+    def _release_llm(self) -> None:
+        self._llm_inflight -= 1
+        self._wake_llm_waiters()
+
+    def _wake_llm_waiters(self) -> None:
+        """Grant free slots, taking one waiter per session in turn."""
+        while self._llm_inflight < self.max_concurrent_llm_requests and self._llm_waiters:
+            session_id, waiters = self._llm_waiters.popitem(last=False)
+            future = waiters.popleft()
+            if waiters:
+                # Session goes to the back of the rotation
+                self._llm_waiters[session_id] = waiters
+            if future.done():
+                continue
+            self._llm_inflight += 1
+            future.set_result(None)
+
+    def _discard_waiter(self, session_id: str, future: asyncio.Future) -> None:
+        waiters = self._llm_waiters.get(session_id)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._llm_waiters[session_id]
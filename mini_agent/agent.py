@@ -2,18 +2,21 @@
 
 import asyncio
 import json
+from contextlib import aclosing
 from pathlib import Path
 from time import perf_counter
 from typing import Optional
 
-import tiktoken
-
 from .llm import LLMClient
 from .logger import AgentLogger
-from .schema import Message
+from .schema import LLMResponse, Message, ToolCall
 from .tools.base import Tool, ToolResult
-from .utils import calculate_display_width
+from .tools.registry import ToolRegistry
+from .tracing import Tracer, resolve_tracer
+from .utils import calculate_display_width, count_tokens, truncate_text_by_tokens
 
+# Token budget for each tool result quoted in a round summary request
+SUMMARY_TOOL_RESULT_TOKENS = 2000
 
 # ANSI color codes
 class Colors:
@@ -53,11 +56,21 @@ class Agent:
         max_steps: int = 50,
         workspace_dir: str = "./workspace",
         token_limit: int = 80000,  # Summary triggered when tokens exceed this value
+        parallel_tool_calls: bool = True,  # Run read-only tool calls of one step concurrently
+        max_parallel_tools: int = 8,  # Concurrency cap for parallel tool calls
+        stream: bool = False,  # Stream thinking/text deltas to the terminal as they arrive
+        summary_concurrency: int = 4,  # Max concurrent LLM calls when summarizing rounds
+        log_format: str = "text",  # Run log format: "text" (full history per request) or "jsonl" (message deltas)
+        tracer: Tracer | None = None,  # Span/counter recorder for Agent.run (None = process-wide tracer)
     ):
         self.llm = llm_client
-        self.tools = {tool.name: tool for tool in tools}
+        self.tools = ToolRegistry(tools)
         self.max_steps = max_steps
         self.token_limit = token_limit
+        self.parallel_tool_calls = parallel_tool_calls
+        self.max_parallel_tools = max(1, max_parallel_tools)
+        self.stream = stream
+        self.summary_concurrency = max(1, summary_concurrency)
         self.workspace_dir = Path(workspace_dir)
         # Cancellation event for interrupting agent execution (set externally, e.g., by Esc key)
         self.cancel_event: Optional[asyncio.Event] = None
@@ -76,13 +89,35 @@ class Agent:
         self.messages: list[Message] = [Message(role="system", content=system_prompt)]
 
         # Initialize logger
-        self.logger = AgentLogger()
+        self.logger = AgentLogger(log_format=log_format, tracer=tracer)
+        self._tracer = tracer
 
         # Token usage from last API response (updated after each LLM call)
         self.api_total_tokens: int = 0
+        # Cumulative prompt cache usage across all LLM calls
+        self.api_cache_read_tokens: int = 0
+        self.api_cache_creation_tokens: int = 0
         # Flag to skip token check right after summary (avoid consecutive triggers)
         self._skip_next_token_check: bool = False
 
+        # Incremental token accounting: per-message counts keyed by message identity
+        # (the message is kept alongside its count so a recycled id() never matches),
+        # plus a running total for the first _counted_len entries of _counted_messages
+        self._message_tokens: dict[int, tuple[Message, int]] = {}
+        self._counted_messages: list[Message] | None = None
+        self._counted_len: int = 0
+        self._token_total: int = 0
+
+        # Summary messages produced by the last compaction, keyed by identity.
+        # A round whose execution messages are exactly one of these is unchanged
+        # and is reused without another LLM call.
+        self._summary_messages: dict[int, Message] = {}
+
+    @property
+    def tracer(self) -> Tracer:
+        """Tracer recording Agent.run spans (the process-wide tracer unless one was passed in)."""
+        return resolve_tracer(self._tracer)
+
     def add_user_message(self, content: str):
         """Add a user message to history."""
         self.messages.append(Message(role="user", content=content))
@@ -117,65 +152,89 @@ class Agent:
         # Remove the last assistant message and all tool results after it
         removed_count = len(self.messages) - last_assistant_idx
         if removed_count > 0:
+            tracked = self.messages is self._counted_messages and self._counted_len <= len(self.messages)
+            counted_removed = self.messages[last_assistant_idx : self._counted_len] if tracked else []
             self.messages = self.messages[:last_assistant_idx]
+
+            # Keep the running token total in sync (untracked lists are rebuilt lazily)
+            if tracked:
+                for msg in counted_removed:
+                    self._token_total -= self._message_token_count(msg)
+                    self._message_tokens.pop(id(msg), None)
+                self._counted_messages = self.messages
+                self._counted_len = min(self._counted_len, len(self.messages))
             print(f"{Colors.DIM}   Cleaned up {removed_count} incomplete message(s){Colors.RESET}")
 
+    def _message_token_count(self, msg: Message) -> int:
+        """Get token count for a single message, encoding it at most once."""
+        cached = self._message_tokens.get(id(msg))
+        if cached is not None and cached[0] is msg:
+            return cached[1]
+
+        tokens = 0
+        # Count text content
+        if isinstance(msg.content, str):
+            tokens += count_tokens(msg.content)
+        elif isinstance(msg.content, list):
+            for block in msg.content:
+                if isinstance(block, dict):
+                    # Convert dict to string for calculation
+                    tokens += count_tokens(str(block))
+
+        # Count thinking
+        if msg.thinking:
+            tokens += count_tokens(msg.thinking)
+
+        # Count tool_calls
+        if msg.tool_calls:
+            tokens += count_tokens(str(msg.tool_calls))
+
+        # Metadata overhead per message (approximately 4 tokens)
+        tokens += 4
+
+        self._message_tokens[id(msg)] = (msg, tokens)
+        return tokens
+
+    def _reset_token_total(self):
+        """Recompute the running total for the current message list.
+
+        Used after the history has been rewritten (e.g. by summarization).
+        Messages seen before are served from the per-message cache; entries
+        for messages no longer in the history are dropped.
+        """
+        counts = {id(msg): (msg, self._message_token_count(msg)) for msg in self.messages}
+        self._message_tokens = counts
+        self._token_total = sum(count for _, count in counts.values())
+        self._counted_messages = self.messages
+        self._counted_len = len(self.messages)
+
     def _estimate_tokens(self) -> int:
-        """Accurately calculate token count for message history using tiktoken
+        """Calculate token count for message history using tiktoken.
 
-        Uses cl100k_base encoder (GPT-4/Claude/M2 compatible)
+        Uses cl100k_base encoder (GPT-4/Claude/M2 compatible), falling back to a
+        character-based estimate when tiktoken is unavailable.
+
+        The count is maintained incrementally: only messages appended since the
+        previous call are encoded, so the cost is independent of history length.
+        If the message list was replaced or truncated, the total is rebuilt from
+        the per-message cache.
         """
-        try:
-            # Use cl100k_base encoder (used by GPT-4 and most modern models)
-            encoding = tiktoken.get_encoding("cl100k_base")
-        except Exception:
-            # Fallback: if tiktoken initialization fails, use simple estimation
-            return self._estimate_tokens_fallback()
-
-        total_tokens = 0
-
-        for msg in self.messages:
-            # Count text content
-            if isinstance(msg.content, str):
-                total_tokens += len(encoding.encode(msg.content))
-            elif isinstance(msg.content, list):
-                for block in msg.content:
-                    if isinstance(block, dict):
-                        # Convert dict to string for calculation
-                        total_tokens += len(encoding.encode(str(block)))
-
-            # Count thinking
-            if msg.thinking:
-                total_tokens += len(encoding.encode(msg.thinking))
-
-            # Count tool_calls
-            if msg.tool_calls:
-                total_tokens += len(encoding.encode(str(msg.tool_calls)))
-
-            # Metadata overhead per message (approximately 4 tokens)
-            total_tokens += 4
-
-        return total_tokens
-
-    def _estimate_tokens_fallback(self) -> int:
-        """Fallback token estimation method (when tiktoken is unavailable)"""
-        total_chars = 0
-        for msg in self.messages:
-            if isinstance(msg.content, str):
-                total_chars += len(msg.content)
-            elif isinstance(msg.content, list):
-                for block in msg.content:
-                    if isinstance(block, dict):
-                        total_chars += len(str(block))
-
-            if msg.thinking:
-                total_chars += len(msg.thinking)
-
-            if msg.tool_calls:
-                total_chars += len(str(msg.tool_calls))
-
-        # Rough estimation: average 2.5 characters = 1 token
-        return int(total_chars / 2.5)
+        messages = self.messages
+        counted = self._counted_len
+        prefix_intact = messages is self._counted_messages and len(messages) >= counted
+        if prefix_intact and counted > 0:
+            # The last counted message must still be in place (list not rewritten in place)
+            cached = self._message_tokens.get(id(messages[counted - 1]))
+            prefix_intact = cached is not None and cached[0] is messages[counted - 1]
+
+        if prefix_intact:
+            for msg in messages[counted:]:
+                self._token_total += self._message_token_count(msg)
+            self._counted_len = len(messages)
+        else:
+            self._reset_token_total()
+
+        return self._token_total
 
     async def _summarize_messages(self):
         """Message history summarization: summarize conversations between user messages when tokens exceed limit
@@ -209,46 +268,59 @@ class Agent:
         )
         print(f"{Colors.BRIGHT_YELLOW}🔄 Triggering message history summarization...{Colors.RESET}")
 
-        # Find all user message indices (skip system prompt)
-        user_indices = [i for i, msg in enumerate(self.messages) if msg.role == "user" and i > 0]
+        # Find all user message indices (skip system prompt and previous summaries)
+        user_indices = [
+            i for i, msg in enumerate(self.messages) if msg.role == "user" and i > 0 and not self._is_summary_message(msg)
+        ]
 
         # Need at least 1 user message to perform summary
         if len(user_indices) < 1:
             print(f"{Colors.BRIGHT_YELLOW}⚠️  Insufficient messages, cannot summarize{Colors.RESET}")
             return
 
-        # Build new message list
-        new_messages = [self.messages[0]]  # Keep system prompt
-        summary_count = 0
-
-        # Iterate through each user message and summarize the execution process after it
+        # Split history into rounds: each user message and the execution messages after it
+        # (if last user, go to end of message list; otherwise to before next user)
+        rounds: list[tuple[Message, list[Message]]] = []
         for i, user_idx in enumerate(user_indices):
-            # Add current user message
-            new_messages.append(self.messages[user_idx])
+            next_user_idx = user_indices[i + 1] if i < len(user_indices) - 1 else len(self.messages)
+            rounds.append((self.messages[user_idx], self.messages[user_idx + 1 : next_user_idx]))
+
+        # Summarize all rounds concurrently (bounded), reusing unchanged summaries
+        semaphore = asyncio.Semaphore(self.summary_concurrency)
+
+        async def summarize_round(execution_messages: list[Message], round_num: int) -> Message | None:
+            if not execution_messages:
+                return None
+            if len(execution_messages) == 1 and self._is_summary_message(execution_messages[0]):
+                # Round unchanged since the last compaction
+                return execution_messages[0]
+            async with semaphore:
+                summary_text = await self._create_summary(execution_messages, round_num)
+            if not summary_text:
+                return None
+            return Message(
+                role="user",
+                content=f"[Assistant Execution Summary]\n\n{summary_text}",
+            )
 
-            # Determine message range to summarize
-            # If last user, go to end of message list; otherwise to before next user
-            if i < len(user_indices) - 1:
-                next_user_idx = user_indices[i + 1]
-            else:
-                next_user_idx = len(self.messages)
-
-            # Extract execution messages for this round
-            execution_messages = self.messages[user_idx + 1 : next_user_idx]
-
-            # If there are execution messages in this round, summarize them
-            if execution_messages:
-                summary_text = await self._create_summary(execution_messages, i + 1)
-                if summary_text:
-                    summary_message = Message(
-                        role="user",
-                        content=f"[Assistant Execution Summary]\n\n{summary_text}",
-                    )
-                    new_messages.append(summary_message)
-                    summary_count += 1
+        summaries = await asyncio.gather(
+            *(summarize_round(execution_messages, i + 1) for i, (_, execution_messages) in enumerate(rounds))
+        )
+
+        # Build new message list: system -> user1 -> summary1 -> user2 -> summary2 ...
+        new_messages = [self.messages[0]]  # Keep system prompt
+        summary_messages: dict[int, Message] = {}
+        for (user_msg, _), summary_message in zip(rounds, summaries):
+            new_messages.append(user_msg)
+            if summary_message is not None:
+                new_messages.append(summary_message)
+                summary_messages[id(summary_message)] = summary_message
+        summary_count = len(summary_messages)
 
         # Replace message list
         self.messages = new_messages
+        self._summary_messages = summary_messages
+        self._reset_token_total()
 
         # Skip next token check to avoid consecutive summary triggers
         # (api_total_tokens will be updated after next LLM call)
@@ -259,6 +331,10 @@ class Agent:
         print(f"{Colors.DIM}  Structure: system + {len(user_indices)} user messages + {summary_count} summaries{Colors.RESET}")
         print(f"{Colors.DIM}  Note: API token count will update on next LLM call{Colors.RESET}")
 
+    def _is_summary_message(self, msg: Message) -> bool:
+        """Check whether msg is a summary produced by the last compaction."""
+        return self._summary_messages.get(id(msg)) is msg
+
     async def _create_summary(self, messages: list[Message], round_num: int) -> str:
         """Create summary for one execution round
 
@@ -283,7 +359,11 @@ class Agent:
                     summary_content += f"  → Called tools: {', '.join(tool_names)}\n"
             elif msg.role == "tool":
                 result_preview = msg.content if isinstance(msg.content, str) else str(msg.content)
+                result_preview = truncate_text_by_tokens(result_preview, SUMMARY_TOOL_RESULT_TOKENS)
                 summary_content += f"  ← Tool returned: {result_preview}...\n"
+            elif self._is_summary_message(msg):
+                # Round continued after a previous compaction: fold the old summary in
+                summary_content += f"Earlier summary: {msg.content}\n"
 
         # Call LLM to generate concise summary
         try:
@@ -318,6 +398,147 @@ Requirements:
             # Use simple text summary on failure
             return summary_content
 
+    def _group_tool_calls(self, tool_calls: list[ToolCall]) -> list[list[ToolCall]]:
+        """Split one step's tool calls into execution batches.
+
+        Consecutive calls to read-only tools are grouped into a single batch that
+        may run concurrently. Side-effecting (or unknown) tools always form a batch
+        of their own, so their ordering relative to other calls is preserved.
+
+        Args:
+            tool_calls: Tool calls from one LLM response, in order
+
+        Returns:
+            List of batches, each a list of tool calls in original order
+        """
+        batches: list[list[ToolCall]] = []
+        last_batch_parallel = False
+
+        for tool_call in tool_calls:
+            tool = self.tools.get(tool_call.function.name)
+            parallel = self.parallel_tool_calls and tool is not None and tool.read_only
+
+            if parallel and last_batch_parallel:
+                batches[-1].append(tool_call)
+            else:
+                batches.append([tool_call])
+            last_batch_parallel = parallel
+
+        return batches
+
+    async def _execute_tool(self, function_name: str, arguments: dict) -> ToolResult:
+        """Execute a single tool call, converting any failure into a failed ToolResult."""
+        if function_name not in self.tools:
+            return ToolResult(
+                success=False,
+                content="",
+                error=f"Unknown tool: {function_name}",
+            )
+
+        tracer = self.tracer
+        try:
+            tool = self.tools[function_name]
+            with tracer.span("tool.execute", tool=function_name) as span:
+                result = await tool.execute(**arguments)
+                span.set_attribute("success", result.success)
+            tracer.count("tool.calls")
+            if not result.success:
+                tracer.count("tool.failures")
+            return result
+        except Exception as e:
+            tracer.count("tool.calls")
+            tracer.count("tool.failures")
+            # Catch all exceptions during tool execution, convert to failed ToolResult
+            import traceback
+
+            error_detail = f"{type(e).__name__}: {str(e)}"
+            error_trace = traceback.format_exc()
+            return ToolResult(
+                success=False,
+                content="",
+                error=f"Tool execution failed: {error_detail}\n\nTraceback:\n{error_trace}",
+            )
+
+    async def _execute_tool_batch(self, tool_calls: list[ToolCall]) -> list[ToolResult]:
+        """Execute read-only tool calls concurrently, bounded by max_parallel_tools.
+
+        Returns:
+            Tool results in the same order as tool_calls
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+
+        async def run_one(tool_call: ToolCall) -> ToolResult:
+            async with semaphore:
+                return await self._execute_tool(tool_call.function.name, tool_call.function.arguments)
+
+        return list(await asyncio.gather(*(run_one(tool_call) for tool_call in tool_calls)))
+
+    def _print_tool_call(self, function_name: str, arguments: dict):
+        """Print tool call header and (truncated) arguments."""
+        # Tool call header
+        print(f"\n{Colors.BRIGHT_YELLOW}🔧 Tool Call:{Colors.RESET} {Colors.BOLD}{Colors.CYAN}{function_name}{Colors.RESET}")
+
+        # Arguments (formatted display)
+        print(f"{Colors.DIM}   Arguments:{Colors.RESET}")
+        # Truncate each argument value to avoid overly long output
+        truncated_args = {}
+        for key, value in arguments.items():
+            value_str = str(value)
+            if len(value_str) > 200:
+                truncated_args[key] = value_str[:200] + "..."
+            else:
+                truncated_args[key] = value
+        args_json = json.dumps(truncated_args, indent=2, ensure_ascii=False)
+        for line in args_json.split("\n"):
+            print(f"   {Colors.DIM}{line}{Colors.RESET}")
+
+    def _print_tool_result(self, result: ToolResult):
+        """Print tool execution result."""
+        if result.success:
+            result_text = result.content
+            if len(result_text) > 300:
+                result_text = result_text[:300] + f"{Colors.DIM}...{Colors.RESET}"
+            print(f"{Colors.BRIGHT_GREEN}✓ Result:{Colors.RESET} {result_text}")
+        else:
+            print(f"{Colors.BRIGHT_RED}✗ Error:{Colors.RESET} {Colors.RED}{result.error}{Colors.RESET}")
+
+    async def _generate_streaming(self, tools: ToolRegistry) -> LLMResponse:
+        """Call the LLM in streaming mode, printing thinking and text deltas as they arrive.
+
+        Args:
+            tools: Tools available for this step
+
+        Returns:
+            The complete LLMResponse assembled by the client
+        """
+        response = None
+        current_section = None  # "thinking" or "text"
+
+        # aclosing: an early exit (cancel, error) closes the HTTP response right away
+        async with aclosing(self.llm.generate_stream(messages=self.messages, tools=tools)) as stream:
+            async for event in stream:
+                if event.type == "thinking":
+                    if current_section != "thinking":
+                        print(f"\n{Colors.BOLD}{Colors.MAGENTA}🧠 Thinking:{Colors.RESET}")
+                        current_section = "thinking"
+                    print(f"{Colors.DIM}{event.delta}{Colors.RESET}", end="", flush=True)
+                elif event.type == "text":
+                    if current_section != "text":
+                        if current_section is not None:
+                            print()
+                        print(f"\n{Colors.BOLD}{Colors.BRIGHT_BLUE}🤖 Assistant:{Colors.RESET}")
+                        current_section = "text"
+                    print(event.delta, end="", flush=True)
+                elif event.type == "done":
+                    response = event.response
+
+        if current_section is not None:
+            print()
+
+        if response is None:
+            raise RuntimeError("LLM stream ended without a final response")
+        return response
+
     async def run(self, cancel_event: Optional[asyncio.Event] = None) -> str:
         """Execute agent loop until task is complete or max steps reached.
 
@@ -339,179 +560,155 @@ Requirements:
 
         step = 0
         run_start_time = perf_counter()
+        tracer = self.tracer
 
         while step < self.max_steps:
-            # Check for cancellation at start of each step
-            if self._check_cancelled():
-                self._cleanup_incomplete_messages()
-                cancel_msg = "Task cancelled by user."
-                print(f"\n{Colors.BRIGHT_YELLOW}⚠️  {cancel_msg}{Colors.RESET}")
-                return cancel_msg
-
-            step_start_time = perf_counter()
-            # Check and summarize message history to prevent context overflow
-            await self._summarize_messages()
-
-            # Step header with proper width calculation
-            BOX_WIDTH = 58
-            step_text = f"{Colors.BOLD}{Colors.BRIGHT_CYAN}💭 Step {step + 1}/{self.max_steps}{Colors.RESET}"
-            step_display_width = calculate_display_width(step_text)
-            padding = max(0, BOX_WIDTH - 1 - step_display_width)  # -1 for leading space
-
-            print(f"\n{Colors.DIM}╭{'─' * BOX_WIDTH}╮{Colors.RESET}")
-            print(f"{Colors.DIM}│{Colors.RESET} {step_text}{' ' * padding}{Colors.DIM}│{Colors.RESET}")
-            print(f"{Colors.DIM}╰{'─' * BOX_WIDTH}╯{Colors.RESET}")
-
-            # Get tool list for LLM call
-            tool_list = list(self.tools.values())
-
-            # Log LLM request and call LLM with Tool objects directly
-            self.logger.log_request(messages=self.messages, tools=tool_list)
-
-            try:
-                response = await self.llm.generate(messages=self.messages, tools=tool_list)
-            except Exception as e:
-                # Check if it's a retry exhausted error
-                from .retry import RetryExhaustedError
-
-                if isinstance(e, RetryExhaustedError):
-                    error_msg = f"LLM call failed after {e.attempts} retries\nLast error: {str(e.last_exception)}"
-                    print(f"\n{Colors.BRIGHT_RED}❌ Retry failed:{Colors.RESET} {error_msg}")
-                else:
-                    error_msg = f"LLM call failed: {str(e)}"
-                    print(f"\n{Colors.BRIGHT_RED}❌ Error:{Colors.RESET} {error_msg}")
-                return error_msg
-
-            # Accumulate API reported token usage
-            if response.usage:
-                self.api_total_tokens = response.usage.total_tokens
-
-            # Log LLM response
-            self.logger.log_response(
-                content=response.content,
-                thinking=response.thinking,
-                tool_calls=response.tool_calls,
-                finish_reason=response.finish_reason,
-            )
-
-            # Add assistant message
-            assistant_msg = Message(
-                role="assistant",
-                content=response.content,
-                thinking=response.thinking,
-                tool_calls=response.tool_calls,
-            )
-            self.messages.append(assistant_msg)
-
-            # Print thinking if present
-            if response.thinking:
-                print(f"\n{Colors.BOLD}{Colors.MAGENTA}🧠 Thinking:{Colors.RESET}")
-                print(f"{Colors.DIM}{response.thinking}{Colors.RESET}")
-
-            # Print assistant response
-            if response.content:
-                print(f"\n{Colors.BOLD}{Colors.BRIGHT_BLUE}🤖 Assistant:{Colors.RESET}")
-                print(f"{response.content}")
+            with tracer.span("agent.step", step=step + 1):
+                # Check for cancellation at start of each step
+                if self._check_cancelled():
+                    self._cleanup_incomplete_messages()
+                    cancel_msg = "Task cancelled by user."
+                    print(f"\n{Colors.BRIGHT_YELLOW}⚠️  {cancel_msg}{Colors.RESET}")
+                    return cancel_msg
 
-            # Check if task is complete (no tool calls)
-            if not response.tool_calls:
-                step_elapsed = perf_counter() - step_start_time
-                total_elapsed = perf_counter() - run_start_time
-                print(f"\n{Colors.DIM}⏱️  Step {step + 1} completed in {step_elapsed:.2f}s (total: {total_elapsed:.2f}s){Colors.RESET}")
-                return response.content
-
-            # Check for cancellation before executing tools
-            if self._check_cancelled():
-                self._cleanup_incomplete_messages()
-                cancel_msg = "Task cancelled by user."
-                print(f"\n{Colors.BRIGHT_YELLOW}⚠️  {cancel_msg}{Colors.RESET}")
-                return cancel_msg
-
-            # Execute tool calls
-            for tool_call in response.tool_calls:
-                tool_call_id = tool_call.id
-                function_name = tool_call.function.name
-                arguments = tool_call.function.arguments
-
-                # Tool call header
-                print(f"\n{Colors.BRIGHT_YELLOW}🔧 Tool Call:{Colors.RESET} {Colors.BOLD}{Colors.CYAN}{function_name}{Colors.RESET}")
-
-                # Arguments (formatted display)
-                print(f"{Colors.DIM}   Arguments:{Colors.RESET}")
-                # Truncate each argument value to avoid overly long output
-                truncated_args = {}
-                for key, value in arguments.items():
-                    value_str = str(value)
-                    if len(value_str) > 200:
-                        truncated_args[key] = value_str[:200] + "..."
+                step_start_time = perf_counter()
+                # Check and summarize message history to prevent context overflow
+                with tracer.span("agent.summarize_check"):
+                    await self._summarize_messages()
+
+                # Step header with proper width calculation
+                BOX_WIDTH = 58
+                step_text = f"{Colors.BOLD}{Colors.BRIGHT_CYAN}💭 Step {step + 1}/{self.max_steps}{Colors.RESET}"
+                step_display_width = calculate_display_width(step_text)
+                padding = max(0, BOX_WIDTH - 1 - step_display_width)  # -1 for leading space
+
+                print(f"\n{Colors.DIM}╭{'─' * BOX_WIDTH}╮{Colors.RESET}")
+                print(f"{Colors.DIM}│{Colors.RESET} {step_text}{' ' * padding}{Colors.DIM}│{Colors.RESET}")
+                print(f"{Colors.DIM}╰{'─' * BOX_WIDTH}╯{Colors.RESET}")
+
+                # Log LLM request and call LLM with the tool registry directly
+                # (clients reuse its cached schemas while the tool set is unchanged)
+                self.logger.log_request(messages=self.messages, tools=self.tools.values())
+
+                try:
+                    with tracer.span("llm.generate", stream=self.stream, messages=len(self.messages)):
+                        if self.stream:
+                            response = await self._generate_streaming(self.tools)
+                        else:
+                            response = await self.llm.generate(messages=self.messages, tools=self.tools)
+                except Exception as e:
+                    # Check if it's a retry exhausted error
+                    from .retry import RetryExhaustedError
+
+                    if isinstance(e, RetryExhaustedError):
+                        error_msg = f"LLM call failed after {e.attempts} retries\nLast error: {str(e.last_exception)}"
+                        print(f"\n{Colors.BRIGHT_RED}❌ Retry failed:{Colors.RESET} {error_msg}")
                     else:
-                        truncated_args[key] = value
-                args_json = json.dumps(truncated_args, indent=2, ensure_ascii=False)
-                for line in args_json.split("\n"):
-                    print(f"   {Colors.DIM}{line}{Colors.RESET}")
-
-                # Execute tool
-                if function_name not in self.tools:
-                    result = ToolResult(
-                        success=False,
-                        content="",
-                        error=f"Unknown tool: {function_name}",
-                    )
-                else:
-                    try:
-                        tool = self.tools[function_name]
-                        result = await tool.execute(**arguments)
-                    except Exception as e:
-                        # Catch all exceptions during tool execution, convert to failed ToolResult
-                        import traceback
-
-                        error_detail = f"{type(e).__name__}: {str(e)}"
-                        error_trace = traceback.format_exc()
-                        result = ToolResult(
-                            success=False,
-                            content="",
-                            error=f"Tool execution failed: {error_detail}\n\nTraceback:\n{error_trace}",
-                        )
-
-                # Log tool execution result
-                self.logger.log_tool_result(
-                    tool_name=function_name,
-                    arguments=arguments,
-                    result_success=result.success,
-                    result_content=result.content if result.success else None,
-                    result_error=result.error if not result.success else None,
+                        error_msg = f"LLM call failed: {str(e)}"
+                        print(f"\n{Colors.BRIGHT_RED}❌ Error:{Colors.RESET} {error_msg}")
+                    return error_msg
+
+                # Accumulate API reported token usage
+                tracer.count("llm.calls")
+                if response.usage:
+                    tracer.count("llm.input_tokens", response.usage.prompt_tokens)
+                    tracer.count("llm.output_tokens", response.usage.completion_tokens)
+                    tracer.count("llm.cache_read_tokens", response.usage.cache_read_tokens)
+                    self.api_total_tokens = response.usage.total_tokens
+                    self.api_cache_read_tokens += response.usage.cache_read_tokens
+                    self.api_cache_creation_tokens += response.usage.cache_creation_tokens
+
+                # Log LLM response
+                self.logger.log_response(
+                    content=response.content,
+                    thinking=response.thinking,
+                    tool_calls=response.tool_calls,
+                    finish_reason=response.finish_reason,
                 )
 
-                # Print result
-                if result.success:
-                    result_text = result.content
-                    if len(result_text) > 300:
-                        result_text = result_text[:300] + f"{Colors.DIM}...{Colors.RESET}"
-                    print(f"{Colors.BRIGHT_GREEN}✓ Result:{Colors.RESET} {result_text}")
-                else:
-                    print(f"{Colors.BRIGHT_RED}✗ Error:{Colors.RESET} {Colors.RED}{result.error}{Colors.RESET}")
-
-                # Add tool result message
-                tool_msg = Message(
-                    role="tool",
-                    content=result.content if result.success else f"Error: {result.error}",
-                    tool_call_id=tool_call_id,
-                    name=function_name,
+                # Add assistant message
+                assistant_msg = Message(
+                    role="assistant",
+                    content=response.content,
+                    thinking=response.thinking,
+                    tool_calls=response.tool_calls,
                 )
-                self.messages.append(tool_msg)
-
-                # Check for cancellation after each tool execution
+                self.messages.append(assistant_msg)
+
+                # Print thinking and response (already printed incrementally when streaming)
+                if not self.stream:
+                    if response.thinking:
+                        print(f"\n{Colors.BOLD}{Colors.MAGENTA}🧠 Thinking:{Colors.RESET}")
+                        print(f"{Colors.DIM}{response.thinking}{Colors.RESET}")
+
+                    if response.content:
+                        print(f"\n{Colors.BOLD}{Colors.BRIGHT_BLUE}🤖 Assistant:{Colors.RESET}")
+                        print(f"{response.content}")
+
+                # Check if task is complete (no tool calls)
+                if not response.tool_calls:
+                    step_elapsed = perf_counter() - step_start_time
+                    total_elapsed = perf_counter() - run_start_time
+                    print(f"\n{Colors.DIM}⏱️  Step {step + 1} completed in {step_elapsed:.2f}s (total: {total_elapsed:.2f}s){Colors.RESET}")
+                    return response.content
+
+                # Check for cancellation before executing tools
                 if self._check_cancelled():
                     self._cleanup_incomplete_messages()
                     cancel_msg = "Task cancelled by user."
                     print(f"\n{Colors.BRIGHT_YELLOW}⚠️  {cancel_msg}{Colors.RESET}")
                     return cancel_msg
 
-            step_elapsed = perf_counter() - step_start_time
-            total_elapsed = perf_counter() - run_start_time
-            print(f"\n{Colors.DIM}⏱️  Step {step + 1} completed in {step_elapsed:.2f}s (total: {total_elapsed:.2f}s){Colors.RESET}")
+                # Execute tool calls (consecutive read-only calls run concurrently)
+                for batch in self._group_tool_calls(response.tool_calls):
+                    for tool_call in batch:
+                        self._print_tool_call(tool_call.function.name, tool_call.function.arguments)
+
+                    if len(batch) == 1:
+                        tool_call = batch[0]
+                        results = [await self._execute_tool(tool_call.function.name, tool_call.function.arguments)]
+                    else:
+                        results = await self._execute_tool_batch(batch)
+
+                    # Results are recorded in the original tool_call order
+                    for tool_call, result in zip(batch, results):
+                        function_name = tool_call.function.name
+
+                        # Log tool execution result
+                        self.logger.log_tool_result(
+                            tool_name=function_name,
+                            arguments=tool_call.function.arguments,
+                            result_success=result.success,
+                            result_content=result.content if result.success else None,
+                            result_error=result.error if not result.success else None,
+                        )
+
+                        # Print result
+                        if len(batch) > 1:
+                            print(f"\n{Colors.DIM}   [{function_name}]{Colors.RESET}")
+                        self._print_tool_result(result)
+
+                        # Add tool result message
+                        tool_msg = Message(
+                            role="tool",
+                            content=result.content if result.success else f"Error: {result.error}",
+                            tool_call_id=tool_call.id,
+                            name=function_name,
+                        )
+                        self.messages.append(tool_msg)
+
+                    # Check for cancellation after each tool batch
+                    if self._check_cancelled():
+                        self._cleanup_incomplete_messages()
+                        cancel_msg = "Task cancelled by user."
+                        print(f"\n{Colors.BRIGHT_YELLOW}⚠️  {cancel_msg}{Colors.RESET}")
+                        return cancel_msg
+
+                step_elapsed = perf_counter() - step_start_time
+                total_elapsed = perf_counter() - run_start_time
+                print(f"\n{Colors.DIM}⏱️  Step {step + 1} completed in {step_elapsed:.2f}s (total: {total_elapsed:.2f}s){Colors.RESET}")
 
-            step += 1
+                step += 1
 
         # Max steps reached
         error_msg = f"Task couldn't be completed after {self.max_steps} steps."
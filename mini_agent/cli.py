@@ -7,6 +7,7 @@ Usage:
 Examples:
     mini-agent                              # Use current directory as workspace
     mini-agent --workspace /path/to/dir     # Use specific workspace directory
+    mini-agent --trace trace.json           # Record per-phase timings (open in ui.perfetto.dev)
 """
 
 import argparse
@@ -29,13 +30,29 @@ from prompt_toolkit.styles import Style
 from mini_agent import LLMClient
 from mini_agent.agent import Agent
 from mini_agent.config import Config
+from mini_agent.llm import TransportConfig, close_shared_http_clients
 from mini_agent.schema import LLMProvider
 from mini_agent.tools.base import Tool
-from mini_agent.tools.bash_tool import BashKillTool, BashOutputTool, BashTool
-from mini_agent.tools.file_tools import EditTool, ReadTool, WriteTool
-from mini_agent.tools.mcp_loader import cleanup_mcp_connections, load_mcp_tools_async, set_mcp_timeout_config
+from mini_agent.tools.bash_tool import (
+    BashKillTool,
+    BashOutputTool,
+    BashTool,
+    ResourceLimits,
+    close_persistent_shells,
+    remove_spill_files,
+)
+from mini_agent.tools.file_cache import get_workspace_file_cache
+from mini_agent.tools.file_tools import EditTool, GlobTool, GrepTool, MultiEditTool, ReadTool, WriteTool
+from mini_agent.tools.mcp_loader import (
+    cleanup_mcp_connections,
+    get_mcp_server_stats,
+    load_mcp_tools_async,
+    set_mcp_timeout_config,
+)
 from mini_agent.tools.note_tool import SessionNoteTool
+from mini_agent.tools.search_index import save_workspace_indexes
 from mini_agent.tools.skill_tool import create_skill_tools
+from mini_agent.tracing import ChromeTraceExporter, RecordingTracer, set_tracer
 from mini_agent.utils import calculate_display_width
 
 
@@ -93,7 +110,7 @@ def show_log_directory(open_file_manager: bool = True) -> None:
         print(f"{Colors.RED}Log directory does not exist: {log_dir}{Colors.RESET}\n")
         return
 
-    log_files = list(log_dir.glob("*.log"))
+    log_files = list(log_dir.glob("*.log")) + list(log_dir.glob("*.jsonl"))
 
     if not log_files:
         print(f"{Colors.YELLOW}No log files found in directory.{Colors.RESET}\n")
@@ -278,6 +295,25 @@ def print_stats(agent: Agent, session_start: datetime):
     print(f"  Available Tools: {len(agent.tools)}")
     if agent.api_total_tokens > 0:
         print(f"  API Tokens Used: {Colors.BRIGHT_MAGENTA}{agent.api_total_tokens:,}{Colors.RESET}")
+    if agent.api_cache_read_tokens or agent.api_cache_creation_tokens:
+        print(
+            f"  Prompt Cache: {Colors.BRIGHT_GREEN}{agent.api_cache_read_tokens:,}{Colors.RESET} read, "
+            f"{agent.api_cache_creation_tokens:,} written"
+        )
+    read_tool = agent.tools.get("read_file")
+    file_cache = getattr(read_tool, "cache", None)
+    if file_cache is not None and (file_cache.hits or file_cache.misses):
+        stats = file_cache.stats()
+        print(f"  File Cache: {Colors.BRIGHT_GREEN}{stats['hit_rate']:.0%}{Colors.RESET} hit rate ({stats['hits']} hits, {stats['misses']} misses)")
+    for name, stats in get_mcp_server_stats().items():
+        status = f"{Colors.BRIGHT_GREEN}up{Colors.RESET}" if stats["available"] else f"{Colors.RED}down{Colors.RESET}"
+        latency = f", mean call {stats['mean_call_ms']:.0f}ms" if stats["mean_call_ms"] is not None else ""
+        ping = f", ping {stats['last_ping_ms']:.0f}ms" if stats["last_ping_ms"] is not None else ""
+        pool = f" ({stats['sessions']}/{stats['pool_size']} sessions)" if stats["pool_size"] > 1 else ""
+        print(
+            f"  MCP {name}: {status}{pool} - {stats['calls']} calls ({stats['call_failures']} failed){latency}{ping}, "
+            f"{stats['reconnects']} reconnects"
+        )
     print(f"{Colors.DIM}{'─' * 40}{Colors.RESET}\n")
 
 
@@ -305,6 +341,12 @@ Examples:
         default=None,
         help="Workspace directory (default: current directory)",
     )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help="Write a Chrome trace-event JSON file with per-phase timing spans on exit",
+    )
     parser.add_argument(
         "--version",
         "-v",
@@ -344,10 +386,11 @@ async def initialize_base_tools(config: Config):
     skill_loader = None
 
     # 1. Bash tool and Bash Output tool
+    # (with persistent sessions the Bash tool is per workspace, see add_workspace_tools)
     if config.tools.enable_bash:
-        bash_tool = BashTool()
-        tools.append(bash_tool)
-        print(f"{Colors.GREEN}✅ Loaded Bash tool{Colors.RESET}")
+        if not config.tools.bash.persistent_session:
+            tools.append(create_bash_tool(config))
+            print(f"{Colors.GREEN}✅ Loaded Bash tool{Colors.RESET}")
 
         bash_output_tool = BashOutputTool()
         tools.append(bash_output_tool)
@@ -402,16 +445,19 @@ async def initialize_base_tools(config: Config):
                 connect_timeout=mcp_config.connect_timeout,
                 execute_timeout=mcp_config.execute_timeout,
                 sse_read_timeout=mcp_config.sse_read_timeout,
+                startup_timeout=mcp_config.startup_timeout,
+                health_check_interval=mcp_config.health_check_interval,
             )
             print(
                 f"{Colors.DIM}  MCP timeouts: connect={mcp_config.connect_timeout}s, "
-                f"execute={mcp_config.execute_timeout}s, sse_read={mcp_config.sse_read_timeout}s{Colors.RESET}"
+                f"execute={mcp_config.execute_timeout}s, sse_read={mcp_config.sse_read_timeout}s, "
+                f"startup={mcp_config.startup_timeout}s{Colors.RESET}"
             )
 
             # Use priority search for mcp.json
             mcp_config_path = Config.find_config_file(config.tools.mcp_config_path)
             if mcp_config_path:
-                mcp_tools = await load_mcp_tools_async(str(mcp_config_path))
+                mcp_tools = await load_mcp_tools_async(str(mcp_config_path), lazy=mcp_config.lazy_connect)
                 if mcp_tools:
                     tools.extend(mcp_tools)
                     print(f"{Colors.GREEN}✅ Loaded {len(mcp_tools)} MCP tools (from: {mcp_config_path}){Colors.RESET}")
@@ -426,6 +472,29 @@ async def initialize_base_tools(config: Config):
     return tools, skill_loader
 
 
+def create_bash_tool(config: Config, workspace_dir: Path | None = None) -> BashTool:
+    """Create the Bash tool from configuration
+
+    Args:
+        config: Configuration object
+        workspace_dir: Workspace directory (required for persistent shell sessions)
+    """
+    bash_config = config.tools.bash
+    return BashTool(
+        max_output_bytes=bash_config.max_output_bytes,
+        spill_output=bash_config.spill_output,
+        background_max_lines=bash_config.background_max_lines,
+        workspace_dir=str(workspace_dir) if workspace_dir else None,
+        persistent_session=bash_config.persistent_session,
+        limits=ResourceLimits(
+            cpu_seconds=bash_config.cpu_time_limit,
+            memory_bytes=bash_config.memory_limit_mb * 1024 * 1024 if bash_config.memory_limit_mb else None,
+            open_files=bash_config.open_files_limit,
+            max_processes=bash_config.max_processes,
+        ),
+    )
+
+
 def add_workspace_tools(tools: List[Tool], config: Config, workspace_dir: Path):
     """Add workspace-dependent tools
 
@@ -441,29 +510,47 @@ def add_workspace_tools(tools: List[Tool], config: Config, workspace_dir: Path):
 
     # File tools - need workspace to resolve relative paths
     if config.tools.enable_file_tools:
+        # Content cache shared by the file tools of this workspace (validated by mtime and size)
+        cache = None
+        if config.tools.file_cache_mb > 0:
+            cache = get_workspace_file_cache(workspace_dir, max_bytes=config.tools.file_cache_mb * 1024 * 1024)
         tools.extend(
             [
-                ReadTool(workspace_dir=str(workspace_dir)),
-                WriteTool(workspace_dir=str(workspace_dir)),
-                EditTool(workspace_dir=str(workspace_dir)),
+                ReadTool(workspace_dir=str(workspace_dir), cache=cache),
+                WriteTool(workspace_dir=str(workspace_dir), cache=cache),
+                EditTool(workspace_dir=str(workspace_dir), cache=cache),
+                MultiEditTool(workspace_dir=str(workspace_dir), cache=cache),
+                GrepTool(workspace_dir=str(workspace_dir)),
+                GlobTool(workspace_dir=str(workspace_dir)),
             ]
         )
         print(f"{Colors.GREEN}✅ Loaded file operation tools (workspace: {workspace_dir}){Colors.RESET}")
 
+    # Bash tool with a persistent shell session - one session per workspace
+    if config.tools.enable_bash and config.tools.bash.persistent_session:
+        tools.append(create_bash_tool(config, workspace_dir))
+        print(f"{Colors.GREEN}✅ Loaded Bash tool (persistent session in {workspace_dir}){Colors.RESET}")
+
     # Session note tool - needs workspace to store memory file
     if config.tools.enable_note:
         tools.append(SessionNoteTool(memory_file=str(workspace_dir / ".agent_memory.json")))
         print(f"{Colors.GREEN}✅ Loaded session note tool{Colors.RESET}")
 
 
-async def run_agent(workspace_dir: Path):
+async def run_agent(workspace_dir: Path, trace_path: Path | None = None):
     """Run interactive Agent
 
     Args:
         workspace_dir: Workspace directory path
+        trace_path: Optional Chrome trace output file (enables tracing)
     """
     session_start = datetime.now()
 
+    trace_exporter = None
+    if trace_path is not None:
+        trace_exporter = ChromeTraceExporter(trace_path)
+        set_tracer(RecordingTracer([trace_exporter]))
+
     # 1. Load configuration from package directory
     config_path = Config.get_default_config_path()
 
@@ -536,6 +623,8 @@ async def run_agent(workspace_dir: Path):
         api_base=config.llm.api_base,
         model=config.llm.model,
         retry_config=retry_config if config.llm.retry.enabled else None,
+        prompt_cache=config.llm.prompt_cache,
+        transport_config=TransportConfig(**config.llm.http.model_dump()),
     )
 
     # Set retry callback
@@ -579,6 +668,10 @@ async def run_agent(workspace_dir: Path):
         tools=tools,
         max_steps=config.agent.max_steps,
         workspace_dir=str(workspace_dir),
+        parallel_tool_calls=config.agent.parallel_tool_calls,
+        max_parallel_tools=config.agent.max_parallel_tools,
+        stream=config.agent.stream,
+        log_format=config.agent.log_format,
     )
 
     # 8. Display welcome information
@@ -793,13 +886,30 @@ async def run_agent(workspace_dir: Path):
             print(f"\n{Colors.RED}❌ Error: {e}{Colors.RESET}")
             print(f"{Colors.DIM}{'─' * 60}{Colors.RESET}\n")
 
-    # 11. Cleanup MCP connections
-    try:
-        print(f"{Colors.BRIGHT_CYAN}Cleaning up MCP connections...{Colors.RESET}")
-        await cleanup_mcp_connections()
+    # 11. Cleanup MCP connections, shared HTTP connection pool, shells and caches
+    # (each step runs even if an earlier one fails, e.g. a stdio MCP server teardown)
+    print(f"{Colors.BRIGHT_CYAN}Cleaning up MCP connections...{Colors.RESET}")
+    cleanup_steps = [
+        ("MCP connections", cleanup_mcp_connections),
+        ("HTTP connection pool", close_shared_http_clients),
+        ("shell sessions", close_persistent_shells),
+        ("bash output files", lambda: asyncio.to_thread(remove_spill_files)),
+        ("search indexes", lambda: asyncio.to_thread(save_workspace_indexes)),
+    ]
+    cleanup_failed = False
+    for step_name, step in cleanup_steps:
+        try:
+            await step()
+        except Exception as e:
+            cleanup_failed = True
+            print(f"{Colors.YELLOW}Error cleaning up {step_name} (can be ignored): {e}{Colors.RESET}")
+    if not cleanup_failed:
         print(f"{Colors.GREEN}✅ Cleanup complete{Colors.RESET}\n")
-    except Exception as e:
-        print(f"{Colors.YELLOW}Error during cleanup (can be ignored): {e}{Colors.RESET}\n")
+
+    # 12. Write trace file
+    if trace_exporter is not None:
+        agent.logger.flush()
+        print(f"{Colors.DIM}📈 Trace written to {trace_exporter.write()}{Colors.RESET}\n")
 
 
 def main():
@@ -827,7 +937,8 @@ def main():
     workspace_dir.mkdir(parents=True, exist_ok=True)
 
     # Run the agent (config always loaded from package directory)
-    asyncio.run(run_agent(workspace_dir))
+    trace_path = Path(args.trace).expanduser().absolute() if args.trace else None
+    asyncio.run(run_agent(workspace_dir, trace_path))
 
 
 if __name__ == "__main__":
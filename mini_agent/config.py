@@ -19,6 +19,17 @@ class RetryConfig(BaseModel):
     exponential_base: float = 2.0
 
 
+class HTTPConfig(BaseModel):
+    """HTTP transport configuration (connection pool shared by LLM clients)"""
+
+    max_connections: int = 100  # Maximum concurrent connections
+    max_keepalive_connections: int = 20  # Idle connections kept warm for reuse
+    keepalive_expiry: float = 30.0  # Seconds before an idle connection is closed
+    http2: bool = False  # Negotiate HTTP/2 (requires: pip install "httpx[http2]")
+    connect_timeout: float = 10.0  # Connection timeout (seconds)
+    timeout: float = 600.0  # Read/write timeout (seconds)
+
+
 class LLMConfig(BaseModel):
     """LLM configuration"""
 
@@ -26,7 +37,9 @@ class LLMConfig(BaseModel):
     api_base: str = "https://api.minimax.io"
     model: str = "MiniMax-M2.1"
     provider: str = "anthropic"  # "anthropic" or "openai"
+    prompt_cache: bool = True  # Anthropic prompt caching for system prompt, tools and history
     retry: RetryConfig = Field(default_factory=RetryConfig)
+    http: HTTPConfig = Field(default_factory=HTTPConfig)
 
 
 class AgentConfig(BaseModel):
@@ -35,6 +48,10 @@ class AgentConfig(BaseModel):
     max_steps: int = 50
     workspace_dir: str = "./workspace"
     system_prompt_path: str = "system_prompt.md"
+    parallel_tool_calls: bool = True  # Run read-only tool calls of one step concurrently
+    max_parallel_tools: int = 8  # Concurrency cap for parallel tool calls
+    stream: bool = False  # Stream LLM responses (thinking/text deltas) as they arrive
+    log_format: str = "text"  # Run log format: "text" or "jsonl" (compact, message deltas only)
 
 
 class MCPConfig(BaseModel):
@@ -43,6 +60,23 @@ class MCPConfig(BaseModel):
     connect_timeout: float = 10.0  # Connection timeout (seconds)
     execute_timeout: float = 60.0  # Tool execution timeout (seconds)
     sse_read_timeout: float = 120.0  # SSE read timeout (seconds)
+    startup_timeout: float = 30.0  # Deadline for connecting all servers at startup (seconds)
+    lazy_connect: bool = False  # Register servers from the cached tool list, connect on first use
+    health_check_interval: float = 30.0  # Seconds between health pings; broken sessions reconnect (0 = off)
+
+
+class BashConfig(BaseModel):
+    """Bash tool configuration"""
+
+    max_output_bytes: int = 65536  # In-memory cap per output stream (head + tail kept)
+    spill_output: bool = True  # Save full output of truncated commands to a temp file
+    background_max_lines: int = 10000  # Output lines buffered per background shell
+    persistent_session: bool = False  # Keep one bash process per workspace (cd/export state persists)
+    # Per-command resource limits (Unix; None = unlimited)
+    cpu_time_limit: int | None = None  # CPU seconds per process
+    memory_limit_mb: int | None = None  # Address space per process (MB)
+    open_files_limit: int | None = None  # Open file descriptors per process
+    max_processes: int | None = None  # Processes of the user (RLIMIT_NPROC)
 
 
 class ToolsConfig(BaseModel):
@@ -52,6 +86,8 @@ class ToolsConfig(BaseModel):
     enable_file_tools: bool = True
     enable_bash: bool = True
     enable_note: bool = True
+    file_cache_mb: int = 64  # Per-workspace file content cache shared by the file tools (0 = off)
+    bash: BashConfig = Field(default_factory=BashConfig)
 
     # Skills
     enable_skills: bool = True
@@ -63,12 +99,22 @@ class ToolsConfig(BaseModel):
     mcp: MCPConfig = Field(default_factory=MCPConfig)
 
 
+class ACPConfig(BaseModel):
+    """ACP server configuration (admission control for concurrent sessions)"""
+
+    max_concurrent_llm_requests: int = 4  # LLM requests in flight across all sessions
+    max_concurrent_tools: int = 8  # Tool calls running across all sessions
+    session_idle_timeout: float = 1800.0  # Evict sessions idle longer than this (seconds, 0 = never)
+    max_sessions: int = 64  # Evict least recently used idle sessions beyond this count
+
+
 class Config(BaseModel):
     """Main configuration class"""
 
     llm: LLMConfig
     agent: AgentConfig
     tools: ToolsConfig
+    acp: ACPConfig = Field(default_factory=ACPConfig)
 
     @classmethod
     def load(cls) -> "Config":
@@ -120,12 +166,25 @@ class Config(BaseModel):
             exponential_base=retry_data.get("exponential_base", 2.0),
         )
 
+        # Parse HTTP transport configuration
+        http_data = data.get("http", {})
+        http_config = HTTPConfig(
+            max_connections=http_data.get("max_connections", 100),
+            max_keepalive_connections=http_data.get("max_keepalive_connections", 20),
+            keepalive_expiry=http_data.get("keepalive_expiry", 30.0),
+            http2=http_data.get("http2", False),
+            connect_timeout=http_data.get("connect_timeout", 10.0),
+            timeout=http_data.get("timeout", 600.0),
+        )
+
         llm_config = LLMConfig(
             api_key=data["api_key"],
             api_base=data.get("api_base", "https://api.minimax.io"),
             model=data.get("model", "MiniMax-M2.1"),
             provider=data.get("provider", "anthropic"),
+            prompt_cache=data.get("prompt_cache", True),
             retry=retry_config,
+            http=http_config,
         )
 
         # Parse Agent configuration
@@ -133,6 +192,10 @@ class Config(BaseModel):
             max_steps=data.get("max_steps", 50),
             workspace_dir=data.get("workspace_dir", "./workspace"),
             system_prompt_path=data.get("system_prompt_path", "system_prompt.md"),
+            parallel_tool_calls=data.get("parallel_tool_calls", True),
+            max_parallel_tools=data.get("max_parallel_tools", 8),
+            stream=data.get("stream", False),
+            log_format=data.get("log_format", "text"),
         )
 
         # Parse tools configuration
@@ -144,12 +207,30 @@ class Config(BaseModel):
             connect_timeout=mcp_data.get("connect_timeout", 10.0),
             execute_timeout=mcp_data.get("execute_timeout", 60.0),
             sse_read_timeout=mcp_data.get("sse_read_timeout", 120.0),
+            startup_timeout=mcp_data.get("startup_timeout", 30.0),
+            lazy_connect=mcp_data.get("lazy_connect", False),
+            health_check_interval=mcp_data.get("health_check_interval", 30.0),
+        )
+
+        # Parse Bash configuration
+        bash_data = tools_data.get("bash", {})
+        bash_config = BashConfig(
+            max_output_bytes=bash_data.get("max_output_bytes", 65536),
+            spill_output=bash_data.get("spill_output", True),
+            background_max_lines=bash_data.get("background_max_lines", 10000),
+            persistent_session=bash_data.get("persistent_session", False),
+            cpu_time_limit=bash_data.get("cpu_time_limit"),
+            memory_limit_mb=bash_data.get("memory_limit_mb"),
+            open_files_limit=bash_data.get("open_files_limit"),
+            max_processes=bash_data.get("max_processes"),
         )
 
         tools_config = ToolsConfig(
             enable_file_tools=tools_data.get("enable_file_tools", True),
             enable_bash=tools_data.get("enable_bash", True),
             enable_note=tools_data.get("enable_note", True),
+            file_cache_mb=tools_data.get("file_cache_mb", 64),
+            bash=bash_config,
             enable_skills=tools_data.get("enable_skills", True),
             skills_dir=tools_data.get("skills_dir", "./skills"),
             enable_mcp=tools_data.get("enable_mcp", True),
@@ -157,10 +238,20 @@ class Config(BaseModel):
             mcp=mcp_config,
         )
 
+        # Parse ACP server configuration
+        acp_data = data.get("acp", {})
+        acp_config = ACPConfig(
+            max_concurrent_llm_requests=acp_data.get("max_concurrent_llm_requests", 4),
+            max_concurrent_tools=acp_data.get("max_concurrent_tools", 8),
+            session_idle_timeout=acp_data.get("session_idle_timeout", 1800.0),
+            max_sessions=acp_data.get("max_sessions", 64),
+        )
+
         return cls(
             llm=llm_config,
             agent=agent_config,
             tools=tools_config,
+            acp=acp_config,
         )
 
     @staticmethod
@@ -4,6 +4,15 @@ from .anthropic_client import AnthropicClient
 from .base import LLMClientBase
 from .llm_wrapper import LLMClient
 from .openai_client import OpenAIClient
+from .transport import TransportConfig, close_shared_http_clients, get_shared_http_client
 
-__all__ = ["LLMClientBase", "AnthropicClient", "OpenAIClient", "LLMClient"]
+__all__ = [
+    "LLMClientBase",
+    "AnthropicClient",
+    "OpenAIClient",
+    "LLMClient",
+    "TransportConfig",
+    "get_shared_http_client",
+    "close_shared_http_clients",
+]
 
@@ -1,16 +1,26 @@
 """Anthropic LLM client implementation."""
 
+import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
 import anthropic
+import httpx
 
 from ..retry import RetryConfig, async_retry
-from ..schema import FunctionCall, LLMResponse, Message, TokenUsage, ToolCall
+from ..schema import FunctionCall, LLMResponse, LLMStreamEvent, Message, TokenUsage, ToolCall
+from ..tracing import resolve_tracer
 from .base import LLMClientBase
 
 logger = logging.getLogger(__name__)
 
+# Anthropic prompt cache breakpoint marker
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Content blocks that cannot carry a cache breakpoint
+_UNCACHEABLE_BLOCK_TYPES = ("thinking", "redacted_thinking")
+
 
 class AnthropicClient(LLMClientBase):
     """LLM client using Anthropic's protocol.
@@ -18,6 +28,8 @@ class AnthropicClient(LLMClientBase):
     This client uses the official Anthropic SDK and supports:
     - Extended thinking content
     - Tool calling
+    - Streaming responses
+    - Prompt caching
     - Retry logic
     """
 
@@ -27,6 +39,8 @@ class AnthropicClient(LLMClientBase):
         api_base: str = "https://api.minimaxi.com/anthropic",
         model: str = "MiniMax-M2.1",
         retry_config: RetryConfig | None = None,
+        prompt_cache: bool = True,
+        http_client: httpx.AsyncClient | None = None,
     ):
         """Initialize Anthropic client.
 
@@ -35,14 +49,20 @@ class AnthropicClient(LLMClientBase):
             api_base: Base URL for the API (default: MiniMax Anthropic endpoint)
             model: Model name to use (default: MiniMax-M2.1)
             retry_config: Optional retry configuration
+            prompt_cache: Add cache breakpoints to the system prompt, tool
+                definitions and the end of the message history
+            http_client: Optional shared httpx client (see llm.transport);
+                the SDK creates its own when omitted
         """
         super().__init__(api_key, api_base, model, retry_config)
+        self.prompt_cache = prompt_cache
 
         # Initialize Anthropic async client
         self.client = anthropic.AsyncAnthropic(
             base_url=api_base,
             api_key=api_key,
             default_headers={"Authorization": f"Bearer {api_key}"},
+            http_client=http_client,
         )
 
     async def _make_api_request(
@@ -64,21 +84,102 @@ class AnthropicClient(LLMClientBase):
         Raises:
             Exception: API call failed
         """
+        params = self._build_params(system_message, api_messages, tools)
+
+        # Use Anthropic SDK's async messages.create
+        response = await self.client.messages.create(**params)
+        return response
+
+    async def _make_stream_request(
+        self,
+        system_message: str | None,
+        api_messages: list[dict[str, Any]],
+        tools: list[Any] | None = None,
+    ) -> anthropic.AsyncStream:
+        """Open a streaming API request (core method that can be retried).
+
+        The call returns as soon as the response headers arrive, so connection
+        and HTTP errors are raised here and covered by the retry logic.
+
+        Args:
+            system_message: Optional system message
+            api_messages: List of messages in Anthropic format
+            tools: Optional list of tools
+
+        Returns:
+            Async stream of raw Anthropic message events
+
+        Raises:
+            Exception: API call failed
+        """
+        params = self._build_params(system_message, api_messages, tools)
+        return await self.client.messages.create(**params, stream=True)
+
+    def _build_params(
+        self,
+        system_message: str | None,
+        api_messages: list[dict[str, Any]],
+        tools: list[Any] | None = None,
+    ) -> dict[str, Any]:
+        """Build keyword arguments for messages.create.
+
+        With prompt caching enabled, up to three cache breakpoints are set:
+        the system prompt, the last tool definition and the last message of
+        the history. The history breakpoint moves forward every step; the API
+        finds the previous step's cache entry by looking back from it.
+        """
         params = {
             "model": self.model,
             "max_tokens": 16384,
-            "messages": api_messages,
+            "messages": self._add_history_breakpoint(api_messages) if self.prompt_cache else api_messages,
         }
 
         if system_message:
-            params["system"] = system_message
+            if self.prompt_cache:
+                params["system"] = [{"type": "text", "text": system_message, "cache_control": CACHE_CONTROL}]
+            else:
+                params["system"] = system_message
 
         if tools:
-            params["tools"] = self._convert_tools(tools)
+            tool_schemas = self._convert_tools(tools)
+            if self.prompt_cache and tool_schemas:
+                # Copy the last schema so cached/shared tool dicts are never mutated
+                tool_schemas = tool_schemas[:-1] + [{**tool_schemas[-1], "cache_control": CACHE_CONTROL}]
+            params["tools"] = tool_schemas
 
-        # Use Anthropic SDK's async messages.create
-        response = await self.client.messages.create(**params)
-        return response
+        return params
+
+    @staticmethod
+    def _add_history_breakpoint(api_messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return api_messages with a cache breakpoint on the last cacheable block.
+
+        The last message (and the block carrying the marker) is copied, so the
+        caller's message dicts and content blocks are left untouched.
+        """
+        if not api_messages:
+            return api_messages
+
+        last_message = api_messages[-1]
+        content = last_message["content"]
+
+        if isinstance(content, str):
+            if not content:
+                return api_messages
+            blocks = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+        else:
+            blocks = list(content)
+            for idx in range(len(blocks) - 1, -1, -1):
+                block = blocks[idx]
+                if not isinstance(block, dict) or block.get("type") in _UNCACHEABLE_BLOCK_TYPES:
+                    continue
+                if block.get("type") == "text" and not block.get("text"):
+                    continue
+                blocks[idx] = {**block, "cache_control": CACHE_CONTROL}
+                break
+            else:
+                return api_messages
+
+        return api_messages[:-1] + [{**last_message, "content": blocks}]
 
     def _convert_tools(self, tools: list[Any]) -> list[dict[str, Any]]:
         """Convert tools to Anthropic format.
@@ -95,11 +196,15 @@ class AnthropicClient(LLMClientBase):
         }
 
         Args:
-            tools: List of Tool objects or dicts
+            tools: List of Tool objects or dicts, or a ToolRegistry
 
         Returns:
             List of tools in Anthropic dict format
         """
+        # Tool registries cache the converted list until tools are added or removed
+        if hasattr(tools, "to_schemas"):
+            return tools.to_schemas()
+
         result = []
         for tool in tools:
             if isinstance(tool, dict):
@@ -232,19 +337,9 @@ class AnthropicClient(LLMClientBase):
                 )
 
         # Extract token usage from response
-        # Anthropic usage includes: input_tokens, output_tokens, cache_read_input_tokens, cache_creation_input_tokens
         usage = None
         if hasattr(response, "usage") and response.usage:
-            input_tokens = response.usage.input_tokens or 0
-            output_tokens = response.usage.output_tokens or 0
-            cache_read_tokens = getattr(response.usage, "cache_read_input_tokens", 0) or 0
-            cache_creation_tokens = getattr(response.usage, "cache_creation_input_tokens", 0) or 0
-            total_input_tokens = input_tokens + cache_read_tokens + cache_creation_tokens
-            usage = TokenUsage(
-                prompt_tokens=total_input_tokens,
-                completion_tokens=output_tokens,
-                total_tokens=total_input_tokens + output_tokens,
-            )
+            usage = self._build_usage(response.usage)
 
         return LLMResponse(
             content=text_content,
@@ -254,6 +349,30 @@ class AnthropicClient(LLMClientBase):
             usage=usage,
         )
 
+    @staticmethod
+    def _build_usage(api_usage: Any, output_tokens: int | None = None) -> TokenUsage:
+        """Convert Anthropic usage into TokenUsage.
+
+        Anthropic usage includes: input_tokens, output_tokens, cache_read_input_tokens, cache_creation_input_tokens
+
+        Args:
+            api_usage: Anthropic usage object
+            output_tokens: Optional override for output tokens (streaming reports them at the end)
+        """
+        input_tokens = getattr(api_usage, "input_tokens", 0) or 0
+        if output_tokens is None:
+            output_tokens = getattr(api_usage, "output_tokens", 0) or 0
+        cache_read_tokens = getattr(api_usage, "cache_read_input_tokens", 0) or 0
+        cache_creation_tokens = getattr(api_usage, "cache_creation_input_tokens", 0) or 0
+        total_input_tokens = input_tokens + cache_read_tokens + cache_creation_tokens
+        return TokenUsage(
+            prompt_tokens=total_input_tokens,
+            completion_tokens=output_tokens,
+            total_tokens=total_input_tokens + output_tokens,
+            cache_read_tokens=cache_read_tokens,
+            cache_creation_tokens=cache_creation_tokens,
+        )
+
     async def generate(
         self,
         messages: list[Message],
@@ -268,26 +387,140 @@ class AnthropicClient(LLMClientBase):
         Returns:
             LLMResponse containing the generated content
         """
+        tracer = resolve_tracer(self.tracer)
+
         # Prepare request
-        request_params = self._prepare_request(messages, tools)
+        with tracer.span("llm.convert_request", messages=len(messages)):
+            request_params = self._prepare_request(messages, tools)
 
         # Make API request with retry logic
+        with tracer.span("llm.request", model=self.model):
+            if self.retry_config.enabled:
+                # Apply retry logic
+                retry_decorator = async_retry(config=self.retry_config, on_retry=self.retry_callback)
+                api_call = retry_decorator(self._make_api_request)
+                response = await api_call(
+                    request_params["system_message"],
+                    request_params["api_messages"],
+                    request_params["tools"],
+                )
+            else:
+                # Don't use retry
+                response = await self._make_api_request(
+                    request_params["system_message"],
+                    request_params["api_messages"],
+                    request_params["tools"],
+                )
+
+        # Parse and return response
+        with tracer.span("llm.parse_response"):
+            return self._parse_response(response)
+
+    async def generate_stream(
+        self,
+        messages: list[Message],
+        tools: list[Any] | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Stream response from Anthropic LLM.
+
+        Yields thinking, text and tool-use deltas as raw stream events arrive and
+        builds the final LLMResponse incrementally.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of available tools
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event
+        """
+        tracer = resolve_tracer(self.tracer)
+
+        # Prepare request
+        with tracer.span("llm.convert_request", messages=len(messages)):
+            request_params = self._prepare_request(messages, tools)
+
+        # Open stream with retry logic (only connection setup is retried)
         if self.retry_config.enabled:
-            # Apply retry logic
             retry_decorator = async_retry(config=self.retry_config, on_retry=self.retry_callback)
-            api_call = retry_decorator(self._make_api_request)
-            response = await api_call(
-                request_params["system_message"],
-                request_params["api_messages"],
-                request_params["tools"],
-            )
+            api_call = retry_decorator(self._make_stream_request)
         else:
-            # Don't use retry
-            response = await self._make_api_request(
+            api_call = self._make_stream_request
+        # Span covers the wait for the response headers (time to stream start)
+        with tracer.span("llm.request", model=self.model, stream=True):
+            stream = await api_call(
                 request_params["system_message"],
                 request_params["api_messages"],
                 request_params["tools"],
             )
 
-        # Parse and return response
-        return self._parse_response(response)
+        text_parts: list[str] = []
+        thinking_parts: list[str] = []
+        # Tool use blocks by content block index: {"id", "name", "json": [fragments]}
+        tool_blocks: dict[int, dict[str, Any]] = {}
+        start_usage = None
+        output_tokens = None
+        stop_reason = None
+
+        # Close the response when the consumer stops early (cancel, error) so the
+        # connection goes back to the shared pool
+        try:
+            async for event in stream:
+                if event.type == "message_start":
+                    start_usage = event.message.usage
+                elif event.type == "content_block_start":
+                    block = event.content_block
+                    if block.type == "tool_use":
+                        tool_blocks[event.index] = {"id": block.id, "name": block.name, "json": []}
+                        yield LLMStreamEvent(type="tool_use", tool_call_id=block.id, tool_name=block.name)
+                elif event.type == "content_block_delta":
+                    delta = event.delta
+                    if delta.type == "text_delta":
+                        text_parts.append(delta.text)
+                        yield LLMStreamEvent(type="text", delta=delta.text)
+                    elif delta.type == "thinking_delta":
+                        thinking_parts.append(delta.thinking)
+                        yield LLMStreamEvent(type="thinking", delta=delta.thinking)
+                    elif delta.type == "input_json_delta" and event.index in tool_blocks:
+                        block = tool_blocks[event.index]
+                        block["json"].append(delta.partial_json)
+                        yield LLMStreamEvent(
+                            type="tool_use",
+                            delta=delta.partial_json,
+                            tool_call_id=block["id"],
+                            tool_name=block["name"],
+                        )
+                elif event.type == "message_delta":
+                    stop_reason = event.delta.stop_reason or stop_reason
+                    if event.usage is not None:
+                        output_tokens = event.usage.output_tokens
+        finally:
+            await stream.close()
+
+        tool_calls = []
+        for index in sorted(tool_blocks):
+            block = tool_blocks[index]
+            raw_json = "".join(block["json"])
+            tool_calls.append(
+                ToolCall(
+                    id=block["id"],
+                    type="function",
+                    function=FunctionCall(
+                        name=block["name"],
+                        arguments=json.loads(raw_json) if raw_json else {},
+                    ),
+                )
+            )
+
+        usage = self._build_usage(start_usage, output_tokens) if start_usage is not None else None
+        thinking_content = "".join(thinking_parts)
+
+        yield LLMStreamEvent(
+            type="done",
+            response=LLMResponse(
+                content="".join(text_parts),
+                thinking=thinking_content if thinking_content else None,
+                tool_calls=tool_calls if tool_calls else None,
+                finish_reason=stop_reason or "stop",
+                usage=usage,
+            ),
+        )
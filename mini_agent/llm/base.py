@@ -1,10 +1,13 @@
 """Base class for LLM clients."""
 
+import json
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any
 
 from ..retry import RetryConfig
-from ..schema import LLMResponse, Message
+from ..schema import LLMResponse, LLMStreamEvent, Message
+from ..tracing import Tracer
 
 
 class LLMClientBase(ABC):
@@ -37,6 +40,9 @@ class LLMClientBase(ABC):
         # Callback for tracking retry count
         self.retry_callback = None
 
+        # Tracer for request conversion/network/parsing spans (None = process-wide tracer)
+        self.tracer: Tracer | None = None
+
     @abstractmethod
     async def generate(
         self,
@@ -54,6 +60,41 @@ class LLMClientBase(ABC):
         """
         pass
 
+    async def generate_stream(
+        self,
+        messages: list[Message],
+        tools: list[Any] | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Generate response from LLM as a stream of incremental events.
+
+        Yields thinking, text and tool-use deltas as they arrive, followed by a
+        final "done" event carrying the complete LLMResponse.
+
+        The default implementation calls generate() and replays the full response
+        as deltas; clients with native streaming support override it.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of Tool objects or dicts
+
+        Yields:
+            LLMStreamEvent objects
+        """
+        response = await self.generate(messages, tools)
+
+        if response.thinking:
+            yield LLMStreamEvent(type="thinking", delta=response.thinking)
+        if response.content:
+            yield LLMStreamEvent(type="text", delta=response.content)
+        for tool_call in response.tool_calls or []:
+            yield LLMStreamEvent(
+                type="tool_use",
+                delta=json.dumps(tool_call.function.arguments, ensure_ascii=False),
+                tool_call_id=tool_call.id,
+                tool_name=tool_call.function.name,
+            )
+        yield LLMStreamEvent(type="done", response=response)
+
     @abstractmethod
     def _prepare_request(
         self,
@@ -5,12 +5,15 @@ This module provides a unified interface for different LLM providers
 """
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 
 from ..retry import RetryConfig
-from ..schema import LLMProvider, LLMResponse, Message
+from ..schema import LLMProvider, LLMResponse, LLMStreamEvent, Message
 from .anthropic_client import AnthropicClient
 from .base import LLMClientBase
 from .openai_client import OpenAIClient
+from .transport import TransportConfig, get_shared_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +43,8 @@ class LLMClient:
         api_base: str = "https://api.minimaxi.com",
         model: str = "MiniMax-M2.1",
         retry_config: RetryConfig | None = None,
+        prompt_cache: bool = True,
+        transport_config: TransportConfig | None = None,
     ):
         """Initialize LLM client with specified provider.
 
@@ -51,6 +56,9 @@ class LLMClient:
                      For third-party APIs (e.g., https://api.siliconflow.cn/v1), used as-is.
             model: Model name to use
             retry_config: Optional retry configuration
+            prompt_cache: Enable prompt caching breakpoints (Anthropic protocol only)
+            transport_config: HTTP pool/keep-alive/HTTP2 settings. LLMClients with the
+                same settings share one pooled httpx client.
         """
         self.provider = provider
         self.api_key = api_key
@@ -79,6 +87,10 @@ class LLMClient:
 
         self.api_base = full_api_base
 
+        # Shared connection pool (reused by every LLMClient with the same transport settings)
+        self.transport_config = transport_config or TransportConfig()
+        http_client = get_shared_http_client(self.transport_config)
+
         # Instantiate the appropriate client
         self._client: LLMClientBase
         if provider == LLMProvider.ANTHROPIC:
@@ -87,6 +99,8 @@ class LLMClient:
                 api_base=full_api_base,
                 model=model,
                 retry_config=retry_config,
+                prompt_cache=prompt_cache,
+                http_client=http_client,
             )
         elif provider == LLMProvider.OPENAI:
             self._client = OpenAIClient(
@@ -94,6 +108,7 @@ class LLMClient:
                 api_base=full_api_base,
                 model=model,
                 retry_config=retry_config,
+                http_client=http_client,
             )
         else:
             raise ValueError(f"Unsupported provider: {provider}")
@@ -110,6 +125,16 @@ class LLMClient:
         """Set retry callback."""
         self._client.retry_callback = value
 
+    @property
+    def tracer(self):
+        """Get tracer used by the underlying client."""
+        return self._client.tracer
+
+    @tracer.setter
+    def tracer(self, value):
+        """Set tracer used by the underlying client (None = process-wide tracer)."""
+        self._client.tracer = value
+
     async def generate(
         self,
         messages: list[Message],
@@ -125,3 +150,21 @@ class LLMClient:
             LLMResponse containing the generated content
         """
         return await self._client.generate(messages, tools)
+
+    async def generate_stream(
+        self,
+        messages: list[Message],
+        tools: list | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Stream response from LLM as incremental events.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of Tool objects or dicts
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event carrying the LLMResponse
+        """
+        async with aclosing(self._client.generate_stream(messages, tools)) as stream:
+            async for event in stream:
+                yield event
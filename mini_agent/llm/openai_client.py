@@ -2,12 +2,15 @@
 
 import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
+import httpx
 from openai import AsyncOpenAI
 
 from ..retry import RetryConfig, async_retry
-from ..schema import FunctionCall, LLMResponse, Message, TokenUsage, ToolCall
+from ..schema import FunctionCall, LLMResponse, LLMStreamEvent, Message, TokenUsage, ToolCall
+from ..tracing import resolve_tracer
 from .base import LLMClientBase
 
 logger = logging.getLogger(__name__)
@@ -19,6 +22,7 @@ class OpenAIClient(LLMClientBase):
     This client uses the official OpenAI SDK and supports:
     - Reasoning content (via reasoning_split=True)
     - Tool calling
+    - Streaming responses
     - Retry logic
     """
 
@@ -28,6 +32,7 @@ class OpenAIClient(LLMClientBase):
         api_base: str = "https://api.minimaxi.com/v1",
         model: str = "MiniMax-M2.1",
         retry_config: RetryConfig | None = None,
+        http_client: httpx.AsyncClient | None = None,
     ):
         """Initialize OpenAI client.
 
@@ -36,6 +41,8 @@ class OpenAIClient(LLMClientBase):
             api_base: Base URL for the API (default: MiniMax OpenAI endpoint)
             model: Model name to use (default: MiniMax-M2.1)
             retry_config: Optional retry configuration
+            http_client: Optional shared httpx client (see llm.transport);
+                the SDK creates its own when omitted
         """
         super().__init__(api_key, api_base, model, retry_config)
 
@@ -43,6 +50,7 @@ class OpenAIClient(LLMClientBase):
         self.client = AsyncOpenAI(
             api_key=api_key,
             base_url=api_base,
+            http_client=http_client,
         )
 
     async def _make_api_request(
@@ -62,6 +70,43 @@ class OpenAIClient(LLMClientBase):
         Raises:
             Exception: API call failed
         """
+        params = self._build_params(api_messages, tools)
+
+        # Use OpenAI SDK's chat.completions.create
+        response = await self.client.chat.completions.create(**params)
+        # Return full response to access usage info
+        return response
+
+    async def _make_stream_request(
+        self,
+        api_messages: list[dict[str, Any]],
+        tools: list[Any] | None = None,
+    ) -> Any:
+        """Open a streaming API request (core method that can be retried).
+
+        Args:
+            api_messages: List of messages in OpenAI format
+            tools: Optional list of tools
+
+        Returns:
+            Async stream of ChatCompletionChunk objects (last chunk carries usage)
+
+        Raises:
+            Exception: API call failed
+        """
+        params = self._build_params(api_messages, tools)
+        return await self.client.chat.completions.create(
+            **params,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+    def _build_params(
+        self,
+        api_messages: list[dict[str, Any]],
+        tools: list[Any] | None = None,
+    ) -> dict[str, Any]:
+        """Build keyword arguments for chat.completions.create."""
         params = {
             "model": self.model,
             "messages": api_messages,
@@ -72,20 +117,21 @@ class OpenAIClient(LLMClientBase):
         if tools:
             params["tools"] = self._convert_tools(tools)
 
-        # Use OpenAI SDK's chat.completions.create
-        response = await self.client.chat.completions.create(**params)
-        # Return full response to access usage info
-        return response
+        return params
 
     def _convert_tools(self, tools: list[Any]) -> list[dict[str, Any]]:
         """Convert tools to OpenAI format.
 
         Args:
-            tools: List of Tool objects or dicts
+            tools: List of Tool objects or dicts, or a ToolRegistry
 
         Returns:
             List of tools in OpenAI dict format
         """
+        # Tool registries cache the converted list until tools are added or removed
+        if hasattr(tools, "to_openai_schemas"):
+            return tools.to_openai_schemas()
+
         result = []
         for tool in tools:
             if isinstance(tool, dict):
@@ -244,11 +290,7 @@ class OpenAIClient(LLMClientBase):
         # Extract token usage from response
         usage = None
         if hasattr(response, "usage") and response.usage:
-            usage = TokenUsage(
-                prompt_tokens=response.usage.prompt_tokens or 0,
-                completion_tokens=response.usage.completion_tokens or 0,
-                total_tokens=response.usage.total_tokens or 0,
-            )
+            usage = self._build_usage(response.usage)
 
         return LLMResponse(
             content=text_content,
@@ -258,6 +300,18 @@ class OpenAIClient(LLMClientBase):
             usage=usage,
         )
 
+    @staticmethod
+    def _build_usage(api_usage: Any) -> TokenUsage:
+        """Convert OpenAI usage into TokenUsage (cached prompt tokens count as cache reads)."""
+        details = getattr(api_usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        return TokenUsage(
+            prompt_tokens=api_usage.prompt_tokens or 0,
+            completion_tokens=api_usage.completion_tokens or 0,
+            total_tokens=api_usage.total_tokens or 0,
+            cache_read_tokens=cached_tokens,
+        )
+
     async def generate(
         self,
         messages: list[Message],
@@ -272,24 +326,144 @@ class OpenAIClient(LLMClientBase):
         Returns:
             LLMResponse containing the generated content
         """
+        tracer = resolve_tracer(self.tracer)
+
         # Prepare request
-        request_params = self._prepare_request(messages, tools)
+        with tracer.span("llm.convert_request", messages=len(messages)):
+            request_params = self._prepare_request(messages, tools)
 
         # Make API request with retry logic
+        with tracer.span("llm.request", model=self.model):
+            if self.retry_config.enabled:
+                # Apply retry logic
+                retry_decorator = async_retry(config=self.retry_config, on_retry=self.retry_callback)
+                api_call = retry_decorator(self._make_api_request)
+                response = await api_call(
+                    request_params["api_messages"],
+                    request_params["tools"],
+                )
+            else:
+                # Don't use retry
+                response = await self._make_api_request(
+                    request_params["api_messages"],
+                    request_params["tools"],
+                )
+
+        # Parse and return response
+        with tracer.span("llm.parse_response"):
+            return self._parse_response(response)
+
+    async def generate_stream(
+        self,
+        messages: list[Message],
+        tools: list[Any] | None = None,
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Stream response from OpenAI LLM.
+
+        Yields thinking, text and tool-use deltas as chunks arrive and builds
+        the final LLMResponse incrementally.
+
+        Args:
+            messages: List of conversation messages
+            tools: Optional list of available tools
+
+        Yields:
+            LLMStreamEvent objects, ending with a "done" event
+        """
+        tracer = resolve_tracer(self.tracer)
+
+        # Prepare request
+        with tracer.span("llm.convert_request", messages=len(messages)):
+            request_params = self._prepare_request(messages, tools)
+
+        # Open stream with retry logic (only connection setup is retried)
         if self.retry_config.enabled:
-            # Apply retry logic
             retry_decorator = async_retry(config=self.retry_config, on_retry=self.retry_callback)
-            api_call = retry_decorator(self._make_api_request)
-            response = await api_call(
-                request_params["api_messages"],
-                request_params["tools"],
-            )
+            api_call = retry_decorator(self._make_stream_request)
         else:
-            # Don't use retry
-            response = await self._make_api_request(
+            api_call = self._make_stream_request
+        # Span covers the wait for the response headers (time to stream start)
+        with tracer.span("llm.request", model=self.model, stream=True):
+            stream = await api_call(
                 request_params["api_messages"],
                 request_params["tools"],
             )
 
-        # Parse and return response
-        return self._parse_response(response)
+        text_parts: list[str] = []
+        thinking_parts: list[str] = []
+        # Tool call fragments by index: {"id", "name", "args": [fragments]}
+        tool_acc: dict[int, dict[str, Any]] = {}
+        usage = None
+        finish_reason = None
+
+        # Close the response when the consumer stops early (cancel, error) so the
+        # connection goes back to the shared pool
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = self._build_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+
+                choice = chunk.choices[0]
+                delta = choice.delta
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+                # reasoning_details is a MiniMax extension; items may arrive as dicts
+                for detail in getattr(delta, "reasoning_details", None) or []:
+                    detail_text = detail.get("text") if isinstance(detail, dict) else getattr(detail, "text", None)
+                    if detail_text:
+                        thinking_parts.append(detail_text)
+                        yield LLMStreamEvent(type="thinking", delta=detail_text)
+
+                if delta.content:
+                    text_parts.append(delta.content)
+                    yield LLMStreamEvent(type="text", delta=delta.content)
+
+                for tool_delta in delta.tool_calls or []:
+                    entry = tool_acc.setdefault(tool_delta.index, {"id": None, "name": "", "args": []})
+                    if tool_delta.id:
+                        entry["id"] = tool_delta.id
+                    fragment = ""
+                    if tool_delta.function:
+                        if tool_delta.function.name:
+                            entry["name"] += tool_delta.function.name
+                        fragment = tool_delta.function.arguments or ""
+                        entry["args"].append(fragment)
+                    yield LLMStreamEvent(
+                        type="tool_use",
+                        delta=fragment,
+                        tool_call_id=entry["id"],
+                        tool_name=entry["name"] or None,
+                    )
+        finally:
+            await stream.close()
+
+        tool_calls = []
+        for index in sorted(tool_acc):
+            entry = tool_acc[index]
+            raw_args = "".join(entry["args"])
+            tool_calls.append(
+                ToolCall(
+                    id=entry["id"] or f"call_{index}",
+                    type="function",
+                    function=FunctionCall(
+                        name=entry["name"],
+                        arguments=json.loads(raw_args) if raw_args else {},
+                    ),
+                )
+            )
+
+        thinking_content = "".join(thinking_parts)
+
+        yield LLMStreamEvent(
+            type="done",
+            response=LLMResponse(
+                content="".join(text_parts),
+                thinking=thinking_content if thinking_content else None,
+                tool_calls=tool_calls if tool_calls else None,
+                finish_reason=finish_reason or "stop",
+                usage=usage,
+            ),
+        )
@@ -0,0 +1,150 @@
+"""Shared HTTP transport for LLM clients.
+
+The Anthropic and OpenAI SDKs each create their own httpx client with default
+pool settings. This module provides one pooled ``httpx.AsyncClient`` per
+transport configuration, shared by every LLM client in the process, so
+concurrent agents (e.g. ACP sessions) reuse warm keep-alive connections
+instead of paying a TCP/TLS handshake per client.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class TransportConfig:
+    """HTTP transport configuration class"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        connect_timeout: float = 10.0,
+        timeout: float = 600.0,
+    ):
+        """
+        Args:
+            max_connections: Maximum number of concurrent connections in the pool
+            max_keepalive_connections: Maximum number of idle connections kept alive
+            keepalive_expiry: Seconds an idle connection is kept before closing
+            http2: Negotiate HTTP/2 (requires the ``h2`` package, ``pip install httpx[http2]``)
+            connect_timeout: Connection timeout (seconds)
+            timeout: Read/write/pool timeout (seconds)
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+
+    def key(self) -> tuple:
+        """Hashable identity of the settings (clients with equal keys share a pool)."""
+        return (
+            self.max_connections,
+            self.max_keepalive_connections,
+            self.keepalive_expiry,
+            self.http2,
+            self.connect_timeout,
+            self.timeout,
+        )
+
+
+# Keyed by (event loop, config key): pooled connections are bound to the loop that opened them
+_shared_clients: dict[tuple[asyncio.AbstractEventLoop | None, tuple], httpx.AsyncClient] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def http2_available() -> bool:
+    """Check whether HTTP/2 support (the ``h2`` package) is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(config: TransportConfig | None = None) -> httpx.AsyncClient:
+    """Create a new pooled httpx client from a transport configuration.
+
+    If HTTP/2 is requested but ``h2`` is not installed, a warning is logged and
+    the client falls back to HTTP/1.1.
+
+    Args:
+        config: Transport configuration (defaults to TransportConfig())
+
+    Returns:
+        Configured httpx.AsyncClient
+    """
+    config = config or TransportConfig()
+
+    http2 = config.http2
+    if http2 and not http2_available():
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        # Same as the SDKs' default clients
+        follow_redirects=True,
+    )
+
+
+def get_shared_http_client(config: TransportConfig | None = None) -> httpx.AsyncClient:
+    """Get the process-wide httpx client for a transport configuration.
+
+    Clients are cached by the running event loop (None outside one) and
+    ``config.key()``, so a later ``asyncio.run`` gets its own pool. A closed
+    client is replaced; clients of closed loops are dropped.
+
+    Args:
+        config: Transport configuration (defaults to TransportConfig())
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    config = config or TransportConfig()
+    key = (_running_loop(), config.key())
+    with _shared_clients_lock:
+        _drop_dead_loop_clients()
+        client = _shared_clients.get(key)
+        if client is None or client.is_closed:
+            client = create_http_client(config)
+            _shared_clients[key] = client
+        return client
+
+
+async def close_shared_http_clients():
+    """Close the shared httpx clients of the running event loop (call once at shutdown)."""
+    loop = _running_loop()
+    with _shared_clients_lock:
+        _drop_dead_loop_clients()
+        keys = [key for key in _shared_clients if key[0] is loop or key[0] is None]
+        clients = [_shared_clients.pop(key) for key in keys]
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug("Error closing HTTP client: %s", e)
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _drop_dead_loop_clients() -> None:
+    """Forget clients whose event loop is closed (their connections cannot be closed gracefully anymore)."""
+    for key in [key for key in _shared_clients if key[0] is not None and key[0].is_closed()]:
+        del _shared_clients[key]
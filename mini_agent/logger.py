@@ -1,11 +1,19 @@
 """Agent run logger"""
 
+import asyncio
 import json
+import queue
+import threading
+import weakref
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from .schema import Message, ToolCall
+from .tracing import Tracer, resolve_tracer
+
+# Supported log formats
+LOG_FORMATS = ("text", "jsonl")
 
 
 class AgentLogger:
@@ -14,73 +22,93 @@ class AgentLogger:
     Responsible for recording the complete interaction process of each agent run, including:
     - LLM requests and responses
     - Tool calls and results
+
+    Entries are handed to a background writer thread, which serializes them and
+    writes them in batches to a file it keeps open, so logging never blocks the
+    event loop on JSON encoding or disk I/O.
+
+    Two formats are supported:
+    - "text": human-readable blocks, each request containing the full message history
+    - "jsonl": one JSON object per line; requests only contain the messages added
+      since the previous request (the full history is logged again, with
+      "reset": true, whenever the history is rewritten, e.g. by summarization)
     """
 
-    def __init__(self):
+    def __init__(self, log_format: str = "text", batch_size: int = 64, tracer: Tracer | None = None):
         """Initialize logger
 
         Logs are stored in ~/.mini-agent/log/ directory
+
+        Args:
+            log_format: Log format, "text" or "jsonl"
+            batch_size: Maximum number of entries written per batch
+            tracer: Tracer for log call and write spans (None = process-wide tracer)
         """
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Unsupported log format: {log_format} (expected one of {', '.join(LOG_FORMATS)})")
+
         # Use ~/.mini-agent/log/ directory for logs
         self.log_dir = Path.home() / ".mini-agent" / "log"
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.log_format = log_format
+        self.batch_size = max(1, batch_size)
+        self.tracer = tracer
         self.log_file = None
         self.log_index = 0
 
+        # Messages already logged in the current run (jsonl delta mode)
+        self._logged_messages: list[Message] = []
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+        # Stops the writer on close(), garbage collection or interpreter exit
+        self._finalizer: weakref.finalize | None = None
+
     def start_new_run(self):
         """Start new run, create new log file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = f"agent_run_{timestamp}.log"
-        self.log_file = self.log_dir / log_filename
+        suffix = "jsonl" if self.log_format == "jsonl" else "log"
+        self.log_file = self.log_dir / f"agent_run_{timestamp}.{suffix}"
         self.log_index = 0
+        self._logged_messages = []
 
         # Write log header
-        with open(self.log_file, "w", encoding="utf-8") as f:
-            f.write("=" * 80 + "\n")
-            f.write(f"Agent Run Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
+        if self.log_format == "jsonl":
+            header = {"type": "RUN_START", "timestamp": self._timestamp()}
+        else:
+            header = (
+                "=" * 80 + "\n"
+                f"Agent Run Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n" + "=" * 80 + "\n\n"
+            )
+        self._enqueue(("open", self.log_file, header))
 
-    def log_request(self, messages: list[Message], tools: list[Any] | None = None):
+    def log_request(self, messages: list[Message], tools: Iterable[Any] | None = None):
         """Log LLM request
 
         Args:
             messages: Message list
             tools: Tool list (optional)
         """
-        self.log_index += 1
-
-        # Build complete request data structure
-        request_data = {
-            "messages": [],
-            "tools": [],
-        }
-
-        # Convert messages to JSON serializable format
-        for msg in messages:
-            msg_dict = {
-                "role": msg.role,
-                "content": msg.content,
-            }
-            if msg.thinking:
-                msg_dict["thinking"] = msg.thinking
-            if msg.tool_calls:
-                msg_dict["tool_calls"] = [tc.model_dump() for tc in msg.tool_calls]
-            if msg.tool_call_id:
-                msg_dict["tool_call_id"] = msg.tool_call_id
-            if msg.name:
-                msg_dict["name"] = msg.name
-
-            request_data["messages"].append(msg_dict)
-
-        # Only record tool names
-        if tools:
-            request_data["tools"] = [tool.name for tool in tools]
-
-        # Format as JSON
-        content = "LLM Request:\n\n"
-        content += json.dumps(request_data, indent=2, ensure_ascii=False)
-
-        self._write_log("REQUEST", content)
+        with resolve_tracer(self.tracer).span("log.request", messages=len(messages)):
+            self.log_index += 1
+
+            # Only record tool names
+            tool_names = [tool.name for tool in tools] if tools else []
+
+            if self.log_format == "jsonl":
+                offset = self._logged_prefix_len(messages)
+                reset = offset == 0 and bool(self._logged_messages)
+                new_messages = messages[offset:]
+                self._logged_messages = list(messages)
+                entry = {"offset": offset, "messages": new_messages, "tools": tool_names}
+                if reset:
+                    entry["reset"] = True
+            else:
+                # Snapshot the list; messages themselves are not mutated once appended
+                entry = {"messages": list(messages), "tools": tool_names}
+
+            self._write_log("REQUEST", entry)
 
     def log_response(
         self,
@@ -108,16 +136,12 @@ class AgentLogger:
             response_data["thinking"] = thinking
 
         if tool_calls:
-            response_data["tool_calls"] = [tc.model_dump() for tc in tool_calls]
+            response_data["tool_calls"] = list(tool_calls)
 
         if finish_reason:
             response_data["finish_reason"] = finish_reason
 
-        # Format as JSON
-        log_content = "LLM Response:\n\n"
-        log_content += json.dumps(response_data, indent=2, ensure_ascii=False)
-
-        self._write_log("RESPONSE", log_content)
+        self._write_log("RESPONSE", response_data)
 
     def log_tool_result(
         self,
@@ -150,29 +174,188 @@ class AgentLogger:
         else:
             tool_result_data["error"] = result_error
 
-        # Format as JSON
-        content = "Tool Execution:\n\n"
-        content += json.dumps(tool_result_data, indent=2, ensure_ascii=False)
+        self._write_log("TOOL_RESULT", tool_result_data)
 
-        self._write_log("TOOL_RESULT", content)
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until every entry queued so far has been written.
 
-    def _write_log(self, log_type: str, content: str):
-        """Write log entry
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if all entries were written within the timeout
+        """
+        if self._writer is None or not self._writer.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self):
+        """Flush pending entries and stop the writer thread."""
+        with self._writer_lock:
+            finalizer = self._finalizer
+            self._writer = None
+            self._finalizer = None
+        if finalizer is not None:
+            finalizer()
+
+    async def aclose(self):
+        """Async variant of close(): wait for the writer thread off the event loop."""
+        await asyncio.to_thread(self.close)
+
+    def _write_log(self, log_type: str, data: dict[str, Any]):
+        """Queue a log entry for the writer thread
 
         Args:
             log_type: Log type (REQUEST, RESPONSE, TOOL_RESULT)
-            content: Log content
+            data: Entry data (serialized by the writer thread)
         """
         if self.log_file is None:
             return
 
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write("\n" + "-" * 80 + "\n")
-            f.write(f"[{self.log_index}] {log_type}\n")
-            f.write(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}\n")
-            f.write("-" * 80 + "\n")
-            f.write(content + "\n")
+        self._enqueue(("entry", self.log_index, log_type, self._timestamp(), data))
+
+    def _enqueue(self, item: tuple):
+        """Put an item on the writer queue, starting the writer thread on first use."""
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(
+                        target=_writer_loop,
+                        args=(self._queue, self.log_format, self.batch_size, self.tracer),
+                        name="mini-agent-logger",
+                        daemon=True,
+                    )
+                    self._writer.start()
+                    self._finalizer = weakref.finalize(self, _stop_writer, self._queue, self._writer)
+        self._queue.put(item)
+
+    def _logged_prefix_len(self, messages: list[Message]) -> int:
+        """Length of the already-logged history that messages still starts with (0 if rewritten)."""
+        logged = self._logged_messages
+        if len(messages) < len(logged):
+            return 0
+        for old, new in zip(logged, messages):
+            if old is not new:
+                return 0
+        return len(logged)
+
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
 
     def get_log_file_path(self) -> Path:
         """Get current log file path"""
         return self.log_file
+
+
+def _message_to_dict(msg: Message) -> dict[str, Any]:
+    """Convert a message to a JSON serializable dict."""
+    msg_dict = {
+        "role": msg.role,
+        "content": msg.content,
+    }
+    if msg.thinking:
+        msg_dict["thinking"] = msg.thinking
+    if msg.tool_calls:
+        msg_dict["tool_calls"] = [tc.model_dump() for tc in msg.tool_calls]
+    if msg.tool_call_id:
+        msg_dict["tool_call_id"] = msg.tool_call_id
+    if msg.name:
+        msg_dict["name"] = msg.name
+    return msg_dict
+
+
+def _entry_data_to_json(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert queued entry data (which may hold Message/ToolCall objects) to plain JSON data."""
+    result = dict(data)
+    if "messages" in result:
+        result["messages"] = [_message_to_dict(msg) for msg in result["messages"]]
+    if "tool_calls" in result:
+        result["tool_calls"] = [tc.model_dump() for tc in result["tool_calls"]]
+    return result
+
+
+_TEXT_TITLES = {
+    "REQUEST": "LLM Request",
+    "RESPONSE": "LLM Response",
+    "TOOL_RESULT": "Tool Execution",
+}
+
+
+def _format_entry(log_format: str, index: int, log_type: str, timestamp: str, data: dict[str, Any]) -> str:
+    """Serialize one log entry in the given format."""
+    data = _entry_data_to_json(data)
+
+    if log_format == "jsonl":
+        record = {"index": index, "type": log_type, "timestamp": timestamp, **data}
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    content = f"{_TEXT_TITLES.get(log_type, log_type)}:\n\n"
+    content += json.dumps(data, indent=2, ensure_ascii=False)
+    return (
+        "\n" + "-" * 80 + "\n"
+        f"[{index}] {log_type}\n"
+        f"Timestamp: {timestamp}\n" + "-" * 80 + "\n" + content + "\n"
+    )
+
+
+def _writer_loop(items: queue.SimpleQueue, log_format: str, batch_size: int, tracer: Tracer | None):
+    """Background writer: drain the queue in batches and write them to the current log file."""
+    handle = None
+    running = True
+    try:
+        while running:
+            batch = [items.get()]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(items.get_nowait())
+                except queue.Empty:
+                    break
+
+            chunks: list[str] = []
+            flushed: list[threading.Event] = []
+            with resolve_tracer(tracer).span("log.serialize", entries=len(batch)):
+                for item in batch:
+                    if item is None:
+                        running = False
+                        break
+                    kind = item[0]
+                    if kind == "entry":
+                        chunks.append(_format_entry(log_format, *item[1:]))
+                    elif kind == "open":
+                        # Switch files: write what belongs to the previous run first
+                        if handle is not None:
+                            handle.write("".join(chunks))
+                            handle.close()
+                        chunks = []
+                        _, path, header = item
+                        try:
+                            handle = open(path, "w", encoding="utf-8")
+                        except OSError:
+                            handle = None
+                            continue
+                        chunks.append(json.dumps(header) + "\n" if log_format == "jsonl" else header)
+                    elif kind == "flush":
+                        flushed.append(item[1])
+
+            if handle is not None and chunks:
+                with resolve_tracer(tracer).span("log.write", entries=len(chunks)):
+                    try:
+                        handle.write("".join(chunks))
+                        handle.flush()
+                    except OSError:
+                        pass
+            for event in flushed:
+                event.set()
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+def _stop_writer(items: queue.SimpleQueue, writer: threading.Thread):
+    """Ask the writer thread to finish its queue and wait for it."""
+    items.put(None)
+    if writer is not threading.current_thread():
+        writer.join(timeout=5.0)
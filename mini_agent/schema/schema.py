@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel
 
@@ -40,9 +40,16 @@ class Message(BaseModel):
 class TokenUsage(BaseModel):
     """Token usage statistics from LLM API response."""
 
-    prompt_tokens: int = 0
+    prompt_tokens: int = 0  # All input tokens, including cached ones
     completion_tokens: int = 0
     total_tokens: int = 0
+    cache_read_tokens: int = 0  # Input tokens served from the prompt cache (hits)
+    cache_creation_tokens: int = 0  # Input tokens written to the prompt cache (misses)
+
+    @property
+    def cache_hit(self) -> bool:
+        """Whether any part of the prompt was served from cache."""
+        return self.cache_read_tokens > 0
 
 
 class LLMResponse(BaseModel):
@@ -53,3 +60,21 @@ class LLMResponse(BaseModel):
     tool_calls: list[ToolCall] | None = None
     finish_reason: str
     usage: TokenUsage | None = None  # Token usage from API response
+
+
+class LLMStreamEvent(BaseModel):
+    """Incremental event yielded while an LLM response is streamed.
+
+    Event types:
+    - "thinking": `delta` holds a fragment of extended thinking
+    - "text": `delta` holds a fragment of the response text
+    - "tool_use": `delta` holds a fragment of the tool arguments JSON
+      for the tool call identified by `tool_call_id` / `tool_name`
+    - "done": `response` holds the complete LLMResponse (always the last event)
+    """
+
+    type: Literal["thinking", "text", "tool_use", "done"]
+    delta: str = ""
+    tool_call_id: str | None = None
+    tool_name: str | None = None
+    response: LLMResponse | None = None
@@ -2,15 +2,20 @@
 
 from .base import Tool, ToolResult
 from .bash_tool import BashTool
-from .file_tools import EditTool, ReadTool, WriteTool
+from .file_tools import EditTool, GlobTool, GrepTool, MultiEditTool, ReadTool, WriteTool
 from .note_tool import RecallNoteTool, SessionNoteTool
+from .registry import ToolRegistry
 
 __all__ = [
     "Tool",
     "ToolResult",
+    "ToolRegistry",
     "ReadTool",
     "WriteTool",
     "EditTool",
+    "MultiEditTool",
+    "GrepTool",
+    "GlobTool",
     "BashTool",
     "SessionNoteTool",
     "RecallNoteTool",
@@ -31,6 +31,15 @@ class Tool:
         """Tool parameters schema (JSON Schema format)."""
         raise NotImplementedError
 
+    @property
+    def read_only(self) -> bool:
+        """Whether the tool has no side effects.
+
+        Read-only tools may be executed concurrently with other read-only
+        tool calls of the same step. Side-effecting tools always run alone.
+        """
+        return False
+
     async def execute(self, *args, **kwargs) -> ToolResult:  # type: ignore
         """Execute the tool with arbitrary arguments."""
         raise NotImplementedError
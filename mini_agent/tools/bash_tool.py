@@ -4,15 +4,35 @@ Supports both bash (Unix/Linux/macOS) and PowerShell (Windows).
 """
 
 import asyncio
+import functools
+import itertools
+import math
+import os
 import platform
 import re
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
 import time
 import uuid
+import weakref
+from collections import deque
+from pathlib import Path
 from typing import Any
 
 from pydantic import Field, model_validator
 
+from ..utils.token_utils import count_tokens, truncate_text_by_tokens
 from .base import Tool, ToolResult
+from .search_index import mark_indexes_stale
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 
 class BashOutputResult(ToolResult):
@@ -28,6 +48,14 @@ class BashOutputResult(ToolResult):
     stderr: str = Field(description="The command's standard error output")
     exit_code: int = Field(description="The command's exit code")
     bash_id: str | None = Field(default=None, description="Shell process ID (only when run_in_background=True)")
+    truncated_bytes: int = Field(default=0, description="Bytes omitted from the middle of stdout and stderr")
+    truncated_lines: int = Field(default=0, description="Lines omitted from the middle of stdout and stderr")
+    stdout_file: str | None = Field(default=None, description="File holding the full stdout (only when truncated)")
+    stderr_file: str | None = Field(default=None, description="File holding the full stderr (only when truncated)")
+    status: str | None = Field(default=None, description="Background shell status (only from bash_output)")
+    matched: bool | None = Field(default=None, description="Whether until_regex matched (only when it was given)")
+    peak_rss_bytes: int | None = Field(default=None, description="Peak resident memory of the command's processes")
+    cpu_seconds: float | None = Field(default=None, description="User + system CPU time of the command's processes")
 
     @model_validator(mode="after")
     def format_content(self) -> "BashOutputResult":
@@ -41,6 +69,15 @@ class BashOutputResult(ToolResult):
             output += f"\n[bash_id]:\n{self.bash_id}"
         if self.exit_code:
             output += f"\n[exit_code]:\n{self.exit_code}"
+        if self.truncated_bytes:
+            output += f"\n[truncated]:\n{self.truncated_bytes} bytes ({self.truncated_lines} lines) omitted from the middle of the output"
+        for label, path in (("stdout_file", self.stdout_file), ("stderr_file", self.stderr_file)):
+            if path:
+                output += f"\n[{label}]:\n{path} (full output, page through it with read_file offset/limit)"
+        if self.status:
+            output += f"\n[status]:\n{self.status}"
+        if self.matched is not None:
+            output += f"\n[until_regex]:\n{'matched' if self.matched else 'not matched'}"
 
         if not output:
             output = "(no output)"
@@ -49,40 +86,580 @@ class BashOutputResult(ToolResult):
         return self
 
 
+# Pipe read size for foreground output capture
+READ_CHUNK_SIZE = 64 * 1024
+
+# Default in-memory output cap per stream for foreground commands
+DEFAULT_MAX_OUTPUT_BYTES = 64 * 1024
+
+# Default number of output lines buffered per background shell
+DEFAULT_BACKGROUND_MAX_LINES = 10000
+
+# Upper bound for bash_output wait_seconds
+MAX_WAIT_SECONDS = 600
+
+# Token budget for one bash/bash_output result (head and tail are kept)
+MAX_OUTPUT_TOKENS = 16000
+
+# Full-output spill files kept per process; older ones are deleted
+MAX_SPILL_FILES = 32
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_pattern(pattern: str) -> "re.Pattern[str] | None":
+    """Compile a user supplied regex once; None if it is invalid."""
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+
+class ResourceLimits:
+    """Per-command resource limits (Unix only).
+
+    Commands spawned per call get them with setrlimit in the child process;
+    commands in a persistent shell session get them as soft limits set with
+    ulimit around each command (see ulimit_commands).
+    """
+
+    def __init__(
+        self,
+        cpu_seconds: int | None = None,
+        memory_bytes: int | None = None,
+        open_files: int | None = None,
+        max_processes: int | None = None,
+    ):
+        """
+        Args:
+            cpu_seconds: CPU time per process (RLIMIT_CPU, SIGXCPU when exceeded)
+            memory_bytes: Address space per process (RLIMIT_AS)
+            open_files: Open file descriptors per process (RLIMIT_NOFILE)
+            max_processes: Processes of the current user (RLIMIT_NPROC; counts all processes of the user)
+        """
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.open_files = open_files
+        self.max_processes = max_processes
+
+    @property
+    def enabled(self) -> bool:
+        return resource is not None and any(
+            value is not None for value in (self.cpu_seconds, self.memory_bytes, self.open_files, self.max_processes)
+        )
+
+    def _limits(self) -> list[tuple[int, int, str, int]]:
+        """(rlimit, value, ulimit flag, ulimit unit in bytes) of the configured limits."""
+        limits = [
+            (resource.RLIMIT_CPU, self.cpu_seconds, "-t", 1),
+            (resource.RLIMIT_AS, self.memory_bytes, "-v", 1024),
+            (resource.RLIMIT_NOFILE, self.open_files, "-n", 1),
+            (resource.RLIMIT_NPROC, self.max_processes, "-u", 1),
+        ]
+        return [limit for limit in limits if limit[1] is not None]
+
+    def apply(self) -> None:
+        """Lower the limits of the current process (runs in the child before exec).
+
+        Used as subprocess preexec_fn. That is unsafe in general while other
+        threads run (the child may inherit locks they hold), which is the case
+        here (log writer, wait4 threads); this function only calls
+        getrlimit/setrlimit, which take no locks, so the fork-to-exec window
+        stays safe.
+        """
+        for limit, value, _, _ in self._limits():
+            _, hard = resource.getrlimit(limit)
+            # For CPU time, a hard limit one second above the soft limit delivers SIGXCPU before SIGKILL
+            new_hard = value + 1 if limit == resource.RLIMIT_CPU else value
+            if hard != resource.RLIM_INFINITY:
+                value, new_hard = min(value, hard), min(new_hard, hard)
+            resource.setrlimit(limit, (value, new_hard))
+
+    def ulimit_commands(self, cpu_used: float = 0.0) -> tuple[str, str]:
+        """bash commands that set the limits as soft limits for one command and restore them after it.
+
+        A persistent shell keeps running between commands, so its own limits
+        cannot be lowered for good: RLIMIT_CPU counts the shell's total CPU
+        time, which would add up across commands. Child processes start with
+        fresh counters; cpu_used (the shell's own CPU seconds so far) is added
+        so shell builtins also get the full budget per command.
+
+        Returns:
+            (set, restore) ulimit commands; restore goes back to this process's soft limits
+        """
+        set_args, restore_args = [], []
+        for limit, value, flag, unit in self._limits():
+            soft, hard = resource.getrlimit(limit)
+            if limit == resource.RLIMIT_CPU:
+                value += math.ceil(cpu_used)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            set_args.append(f"{flag} {value // unit}")
+            restore_args.append(f"{flag} {'unlimited' if soft == resource.RLIM_INFINITY else soft // unit}")
+        return f"ulimit -S {' '.join(set_args)}", f"ulimit -S {' '.join(restore_args)}"
+
+
+def _process_cpu_seconds(pid: int) -> float:
+    """CPU time (user + system) a running process used so far; 0 where /proc is unavailable."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return 0.0
+    # utime and stime are fields 14 and 15 of /proc/<pid>/stat, in clock ticks
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _kill_process_group(process: "asyncio.subprocess.Process | subprocess.Popen", force: bool = True) -> None:
+    """Signal every process in the command's process group (the process itself on Windows).
+
+    Commands are started in their own session, so the group id is the pid of
+    the shell; this also reaches grandchildren the shell started.
+    """
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        elif force:
+            process.kill()
+        else:
+            process.terminate()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _wait4(pid: int) -> "asyncio.Future[tuple[int, Any]]":
+    """Reap a child in a helper thread; resolves to (exit code, rusage).
+
+    os.wait4 returns the resource usage of the child and all descendants it
+    waited for, which gives exact per-command peak RSS and CPU time.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result) -> None:
+        if not future.done():
+            future.set_result(result)
+
+    def waiter() -> None:
+        _, status, rusage = os.wait4(pid, 0)
+        loop.call_soon_threadsafe(resolve, (os.waitstatus_to_exitcode(status), rusage))
+
+    threading.Thread(target=waiter, name=f"bash-wait-{pid}", daemon=True).start()
+    return future
+
+
+async def _open_pipe_reader(pipe) -> tuple[asyncio.StreamReader, asyncio.BaseTransport]:
+    """Wrap a subprocess pipe in an asyncio StreamReader."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(loop=loop)
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe)
+    return reader, transport
+
+
+# Spill files written by this process, oldest first
+_spill_files: deque[str] = deque()
+
+
+def _register_spill_file(path: str) -> None:
+    """Track a new spill file, deleting the oldest ones beyond MAX_SPILL_FILES."""
+    _spill_files.append(path)
+    while len(_spill_files) > MAX_SPILL_FILES:
+        Path(_spill_files.popleft()).unlink(missing_ok=True)
+
+
+def remove_spill_files() -> None:
+    """Delete all spill files written by this process (call at shutdown)."""
+    while _spill_files:
+        Path(_spill_files.popleft()).unlink(missing_ok=True)
+
+
+class OutputCapture:
+    """Bounded capture of a process output stream.
+
+    Keeps the first and last max_bytes / 2 bytes of the stream and counts what
+    is dropped in between, so memory stays bounded no matter how much a command
+    prints. Optionally the complete stream is spilled to a temporary file,
+    which is only created once the output actually exceeds the cap. Only the
+    newest MAX_SPILL_FILES spill files are kept.
+    """
+
+    def __init__(self, max_bytes: int, spill_dir: str | Path | None = None, name: str = "stdout"):
+        """Initialize capture.
+
+        Args:
+            max_bytes: Maximum bytes kept in memory (head + tail)
+            spill_dir: Directory for the full-output file (None disables spilling)
+            name: Stream name, used in the spill file name
+        """
+        self.head_limit = max(0, max_bytes) // 2
+        self.tail_limit = max(0, max_bytes) - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+        self.truncated_bytes = 0
+        self.truncated_lines = 0
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.spill_path: str | None = None
+        self._name = name
+        self._spill_file = None
+
+    def write(self, data: bytes) -> None:
+        """Append a chunk of output."""
+        if not data:
+            return
+        self.total_bytes += len(data)
+        if self._spill_file is not None:
+            self._spill_file.write(data)
+
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+            if not data:
+                return
+
+        self.tail += data
+        overflow = len(self.tail) - self.tail_limit
+        if overflow > 0:
+            if self.spill_dir is not None and self._spill_file is None:
+                # Nothing has been dropped yet, so head + tail is the complete stream so far
+                self._start_spill()
+            self.truncated_bytes += overflow
+            self.truncated_lines += self.tail.count(b"\n", 0, overflow)
+            del self.tail[:overflow]
+
+    def _start_spill(self) -> None:
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            spill = tempfile.NamedTemporaryFile(
+                mode="wb", prefix=f"bash_{self._name}_", suffix=".log", dir=self.spill_dir, delete=False
+            )
+        except OSError:
+            self.spill_dir = None
+            return
+        spill.write(self.head)
+        spill.write(self.tail)
+        self._spill_file = spill
+        self.spill_path = spill.name
+        _register_spill_file(spill.name)
+
+    def text(self) -> str:
+        """Decoded output, with a marker where bytes were dropped."""
+        head = self.head.decode("utf-8", errors="replace")
+        if not self.truncated_bytes:
+            return head + self.tail.decode("utf-8", errors="replace")
+        marker = f"\n\n... [{self.truncated_bytes} bytes / {self.truncated_lines} lines truncated] ...\n\n"
+        return head + marker + self.tail.decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        """Close the spill file (if any)."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+
+async def _capture_stream(stream: asyncio.StreamReader | None, capture: OutputCapture) -> None:
+    """Read a process pipe in chunks into capture until EOF."""
+    if stream is None:
+        return
+    while True:
+        chunk = await stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        capture.write(chunk)
+
+
+async def _capture_until(
+    stream: asyncio.StreamReader, capture: OutputCapture, marker: bytes
+) -> bytes | None:
+    """Read stream into capture until marker, returning the rest of the marker line.
+
+    Returns None if the stream hits EOF before the marker (the shell died).
+    """
+    buffer = bytearray()
+    while True:
+        index = buffer.find(marker)
+        if index != -1:
+            capture.write(bytes(buffer[:index]))
+            rest = buffer[index + len(marker) :]
+            while b"\n" not in rest:
+                chunk = await stream.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                rest += chunk
+            return bytes(rest.split(b"\n", 1)[0])
+        # Everything except a possible partial marker at the end is output
+        keep = len(marker) - 1
+        if len(buffer) > keep:
+            capture.write(bytes(buffer[: len(buffer) - keep]))
+            del buffer[: len(buffer) - keep]
+        try:
+            chunk = await stream.read(READ_CHUNK_SIZE)
+        except asyncio.CancelledError:
+            # Timed out: keep the bytes held back while looking for the marker
+            capture.write(bytes(buffer))
+            raise
+        if not chunk:
+            capture.write(bytes(buffer))
+            return None
+        buffer += chunk
+
+
+# Live persistent shells, terminated by close_persistent_shells() at shutdown
+_persistent_shells: "weakref.WeakSet[PersistentShell]" = weakref.WeakSet()
+
+
+class PersistentShell:
+    """Long-lived bash process that runs commands one after another.
+
+    Keeps working directory, exported variables and activated virtualenvs
+    between commands and avoids spawning a shell per command. Each command is
+    eval'ed with stdin from /dev/null and followed by a unique marker printed
+    to stdout (with the exit code) and to stderr, which frames its output.
+    A command that times out or exits the shell kills the session; the next
+    command starts a fresh one.
+    """
+
+    def __init__(self, cwd: str | None = None, limits: ResourceLimits | None = None):
+        """Initialize persistent shell (the process starts on first use).
+
+        Args:
+            cwd: Initial working directory (default: current directory)
+            limits: Resource limits set around each command (the shell itself is not limited)
+        """
+        self.cwd = cwd
+        self.limits = limits
+        self.process: asyncio.subprocess.Process | None = None
+        self.commands_run = 0
+        self._lock = asyncio.Lock()
+        _persistent_shells.add(self)
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        if not self.alive:
+            self.process = await asyncio.create_subprocess_exec(
+                "bash",
+                "--noprofile",
+                "--norc",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.cwd,
+                start_new_session=True,
+            )
+        return self.process
+
+    async def run(
+        self, command: str, timeout: float, stdout_capture: OutputCapture, stderr_capture: OutputCapture
+    ) -> int | None:
+        """Run a command in the session.
+
+        Args:
+            command: Shell command
+            timeout: Seconds before the session is killed
+            stdout_capture: Receives the command's stdout
+            stderr_capture: Receives the command's stderr
+
+        Returns:
+            Exit code, or None if the command timed out. If the command exits
+            the shell itself (e.g. `exit 3`), the shell's exit code.
+        """
+        async with self._lock:
+            process = await self._ensure_started()
+            marker = f"__MINI_AGENT_DONE_{uuid.uuid4().hex}__"
+            set_limits = restore_limits = ":"
+            if self.limits and self.limits.enabled:
+                set_limits, restore_limits = self.limits.ulimit_commands(_process_cpu_seconds(process.pid))
+            script = (
+                f"{set_limits}\n"
+                f"eval {shlex.quote(command)} < /dev/null\n"
+                f"__mini_agent_rc=$?; {restore_limits}\n"
+                f"printf '\\n{marker}%d\\n' \"$__mini_agent_rc\"; printf '\\n{marker}\\n' >&2\n"
+            )
+            process.stdin.write(script.encode("utf-8"))
+            try:
+                await process.stdin.drain()
+                stdout_rest, stderr_rest = await asyncio.wait_for(
+                    asyncio.gather(
+                        _capture_until(process.stdout, stdout_capture, f"\n{marker}".encode()),
+                        _capture_until(process.stderr, stderr_capture, f"\n{marker}".encode()),
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                self.close()
+                return None
+            except (BrokenPipeError, ConnectionResetError):
+                stdout_rest = None
+
+            self.commands_run += 1
+            if stdout_rest is None or stderr_rest is None:
+                # The shell itself exited
+                code = await process.wait()
+                self.process = None
+                return code
+            try:
+                return int(stdout_rest)
+            except ValueError:
+                return -1
+
+    def close(self) -> None:
+        """Kill the shell and everything it started (a new shell starts on the next command)."""
+        if self.process is not None:
+            _kill_process_group(self.process)
+        self.process = None
+
+
+async def close_persistent_shells() -> None:
+    """Kill all persistent shell processes and wait for them to exit (call at shutdown)."""
+    for shell in list(_persistent_shells):
+        process = shell.process
+        shell.close()
+        if process is not None:
+            await process.wait()
+
+
 class BackgroundShell:
     """Background shell data container.
 
     Pure data class that only stores state and output.
     IO operations are managed externally by BackgroundShellManager.
+
+    Output is kept in a capped line store: once more than max_lines lines are
+    buffered, the oldest ones are evicted (unread lines included) and counted.
     """
 
-    def __init__(self, bash_id: str, command: str, process: "asyncio.subprocess.Process", start_time: float):
+    def __init__(
+        self,
+        bash_id: str,
+        command: str,
+        process: "asyncio.subprocess.Process",
+        start_time: float,
+        max_lines: int = DEFAULT_BACKGROUND_MAX_LINES,
+    ):
         self.bash_id = bash_id
         self.command = command
         self.process = process
         self.start_time = start_time
-        self.output_lines: list[str] = []
+        self.max_lines = max_lines
+        self.output_lines: deque[str] = deque()
+        # Absolute line numbers: lines_evicted is the number of the oldest buffered line
+        self.lines_evicted = 0
         self.last_read_index = 0
         self.status = "running"
         self.exit_code: int | None = None
+        self._partial = bytearray()
+        self._output_event = asyncio.Event()
+
+    @property
+    def total_lines(self) -> int:
+        """Number of complete lines received so far (including evicted ones)."""
+        return self.lines_evicted + len(self.output_lines)
 
     def add_output(self, line: str):
         """Add new output line."""
         self.output_lines.append(line)
+        if len(self.output_lines) > self.max_lines:
+            self.output_lines.popleft()
+            self.lines_evicted += 1
+        self._notify()
+
+    def feed(self, data: bytes) -> None:
+        """Add a raw chunk read from the process, splitting it into lines."""
+        self._partial += data
+        if b"\n" not in data:
+            if len(self._partial) > READ_CHUNK_SIZE:
+                # Very long line (progress bars, binary data): store what we have
+                self.flush_partial()
+            return
+        *lines, rest = self._partial.split(b"\n")
+        self._partial = bytearray(rest)
+        for line in lines:
+            self.output_lines.append(line.decode("utf-8", errors="replace").rstrip("\r"))
+        overflow = len(self.output_lines) - self.max_lines
+        for _ in range(max(0, overflow)):
+            self.output_lines.popleft()
+        self.lines_evicted += max(0, overflow)
+        self._notify()
+
+    def flush_partial(self) -> None:
+        """Store a trailing line without newline (at end of output)."""
+        if self._partial:
+            line = self._partial.decode("utf-8", errors="replace")
+            self._partial = bytearray()
+            self.add_output(line)
+
+    def has_new_output(self) -> bool:
+        """Whether lines arrived since the last get_new_output()."""
+        return self.total_lines > self.last_read_index
+
+    async def wait_for_output(self, timeout: float, since: int | None = None) -> bool:
+        """Wait until new output arrives or the process ends.
+
+        Args:
+            timeout: Maximum seconds to wait
+            since: Absolute line number output counts as new from (default: last read)
+
+        Returns:
+            True if there is new output or the process is no longer running
+        """
+        since = self.last_read_index if since is None else since
+        deadline = time.monotonic() + timeout
+        while self.total_lines <= since and self.status == "running":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            event = self._output_event
+            try:
+                await asyncio.wait_for(event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def wait_for_match(self, pattern: "re.Pattern[str]", timeout: float) -> bool:
+        """Wait until an unread line matches pattern (without consuming output).
+
+        Args:
+            pattern: Compiled regex searched in each new line
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a line matched; False if the process ended or the timeout passed first
+        """
+        deadline = time.monotonic() + timeout
+        scanned = self.last_read_index
+        while True:
+            start = max(scanned, self.lines_evicted)
+            for line in itertools.islice(self.output_lines, start - self.lines_evicted, None):
+                if pattern.search(line):
+                    return True
+            scanned = self.total_lines
+            if self.status != "running":
+                return False
+            if not await self.wait_for_output(deadline - time.monotonic(), since=scanned):
+                return False
+
+    def _notify(self) -> None:
+        # Wake everyone waiting on the current event, then arm a fresh one
+        self._output_event.set()
+        self._output_event = asyncio.Event()
 
     def get_new_output(self, filter_pattern: str | None = None) -> list[str]:
         """Get new output since last check, optionally filtered by regex."""
-        new_lines = self.output_lines[self.last_read_index :]
-        self.last_read_index = len(self.output_lines)
+        start = max(self.last_read_index, self.lines_evicted)
+        skipped = start - self.last_read_index
+        new_lines = list(itertools.islice(self.output_lines, start - self.lines_evicted, None))
+        self.last_read_index = self.total_lines
 
         if filter_pattern:
-            try:
-                pattern = re.compile(filter_pattern)
+            pattern = _compile_pattern(filter_pattern)
+            # Invalid regex: return all lines
+            if pattern is not None:
                 new_lines = [line for line in new_lines if pattern.search(line)]
-            except re.error:
-                # Invalid regex, return all lines
-                pass
 
+        if skipped:
+            new_lines.insert(0, f"... [{skipped} lines evicted before they were read] ...")
         return new_lines
 
     def update_status(self, is_alive: bool, exit_code: int | None = None):
@@ -90,19 +667,21 @@ class BackgroundShell:
         if not is_alive:
             self.status = "completed" if exit_code == 0 else "failed"
             self.exit_code = exit_code
+            self._notify()
         else:
             self.status = "running"
 
     async def terminate(self):
-        """Terminate the background process."""
-        if self.process.returncode is None:
-            self.process.terminate()
-            try:
-                await asyncio.wait_for(self.process.wait(), timeout=5)
-            except asyncio.TimeoutError:
-                self.process.kill()
+        """Terminate the background process and everything it started."""
+        # Signal the group even if the shell already exited: its children may still run
+        _kill_process_group(self.process, force=False)
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            _kill_process_group(self.process)
         self.status = "terminated"
         self.exit_code = self.process.returncode
+        self._notify()
 
 
 class BackgroundShellManager:
@@ -142,22 +721,14 @@ class BackgroundShellManager:
         async def monitor():
             try:
                 process = shell.process
-                # Continuously read output until process ends
-                while process.returncode is None:
-                    try:
-                        if process.stdout:
-                            line = await asyncio.wait_for(process.stdout.readline(), timeout=0.1)
-                            if line:
-                                decoded_line = line.decode("utf-8", errors="replace").rstrip("\n")
-                                shell.add_output(decoded_line)
-                            else:
-                                break
-                    except asyncio.TimeoutError:
-                        await asyncio.sleep(0.1)
-                        continue
-                    except Exception:
-                        await asyncio.sleep(0.1)
-                        continue
+                # Block on the pipe until data or EOF arrives; no polling
+                if process.stdout:
+                    while True:
+                        chunk = await process.stdout.read(READ_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        shell.feed(chunk)
+                    shell.flush_partial()
 
                 # Process ended, wait for exit code
                 try:
@@ -222,10 +793,51 @@ class BashTool(Tool):
     - Unix/Linux/macOS: bash
     """
 
-    def __init__(self):
-        """Initialize BashTool with OS-specific shell detection."""
+    def __init__(
+        self,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        spill_output: bool = True,
+        spill_dir: str | None = None,
+        background_max_lines: int = DEFAULT_BACKGROUND_MAX_LINES,
+        workspace_dir: str | None = None,
+        persistent_session: bool = False,
+        limits: ResourceLimits | None = None,
+    ):
+        """Initialize BashTool with OS-specific shell detection.
+
+        Args:
+            max_output_bytes: In-memory cap per output stream of a foreground command;
+                beyond it only the first and last half are kept
+            spill_output: Save the full output of truncated streams to a temporary file
+            spill_dir: Directory for full-output files (default: <tmp>/mini-agent/bash)
+            background_max_lines: Output lines buffered per background shell; older lines are evicted
+            workspace_dir: Working directory for commands (default: current directory)
+            persistent_session: Run foreground commands in one long-lived bash process that keeps
+                cd/export state between commands (ignored on Windows)
+            limits: Resource limits applied to every command (ignored on Windows)
+        """
         self.is_windows = platform.system() == "Windows"
         self.shell_name = "PowerShell" if self.is_windows else "bash"
+        self.max_output_bytes = max_output_bytes
+        self.background_max_lines = background_max_lines
+        self.spill_dir = None
+        if spill_output:
+            self.spill_dir = Path(spill_dir) if spill_dir else Path(tempfile.gettempdir()) / "mini-agent" / "bash"
+        self.workspace_dir = workspace_dir
+        self.limits = limits
+        self.session = None
+        if persistent_session and not self.is_windows:
+            self.session = PersistentShell(cwd=workspace_dir, limits=limits)
+
+    def _spawn_kwargs(self) -> dict[str, Any]:
+        """Process options for spawned commands: own process group and resource limits (Unix)."""
+        if self.is_windows:
+            return {"cwd": self.workspace_dir}
+        return {
+            "cwd": self.workspace_dir,
+            "start_new_session": True,
+            "preexec_fn": self.limits.apply if self.limits and self.limits.enabled else None,
+        }
 
     @property
     def name(self) -> str:
@@ -273,7 +885,15 @@ Examples:
   - npm test
   - python3 -m http.server 8080 (with run_in_background=true)"""
         }
-        return shell_examples["Windows"] if self.is_windows else shell_examples["Unix"]
+        if self.is_windows:
+            return shell_examples["Windows"]
+        if self.session is not None:
+            return shell_examples["Unix"] + """
+
+Foreground commands share one persistent shell: the working directory, exported variables
+and activated virtualenvs carry over to the next command. Background commands start in the
+workspace directory."""
+        return shell_examples["Unix"]
 
     @property
     def parameters(self) -> dict[str, Any]:
@@ -341,16 +961,24 @@ Examples:
                         *shell_cmd,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.STDOUT,
+                        **self._spawn_kwargs(),
                     )
                 else:
                     process = await asyncio.create_subprocess_shell(
                         shell_cmd,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.STDOUT,
+                        **self._spawn_kwargs(),
                     )
 
                 # Create background shell and add to manager
-                bg_shell = BackgroundShell(bash_id=bash_id, command=command, process=process, start_time=time.time())
+                bg_shell = BackgroundShell(
+                    bash_id=bash_id,
+                    command=command,
+                    process=process,
+                    start_time=time.time(),
+                    max_lines=self.background_max_lines,
+                )
                 BackgroundShellManager.add(bg_shell)
 
                 # Start monitoring task
@@ -369,53 +997,54 @@ Examples:
                     bash_id=bash_id,
                 )
 
+            elif self.session is not None:
+                # Foreground execution in the persistent shell session
+                stdout_capture = OutputCapture(self.max_output_bytes, self.spill_dir, "stdout")
+                stderr_capture = OutputCapture(self.max_output_bytes, self.spill_dir, "stderr")
+                try:
+                    exit_code = await self.session.run(command, timeout, stdout_capture, stderr_capture)
+                finally:
+                    stdout_capture.close()
+                    stderr_capture.close()
+                if exit_code is None:
+                    return self._foreground_result(stdout_capture, stderr_capture, -1, timed_out_after=timeout)
+                return self._foreground_result(stdout_capture, stderr_capture, exit_code)
+
+            elif not self.is_windows:
+                # Foreground execution: isolated process group, reaped with resource usage
+                return await self._run_foreground(shell_cmd, timeout)
+
             else:
-                # Foreground execution: Create isolated process
-                if self.is_windows:
-                    process = await asyncio.create_subprocess_exec(
-                        *shell_cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
-                else:
-                    process = await asyncio.create_subprocess_shell(
-                        shell_cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
+                # Foreground execution on Windows: Create isolated process
+                process = await asyncio.create_subprocess_exec(
+                    *shell_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=self.workspace_dir,
+                )
 
+                # Stream both pipes into bounded head+tail buffers
+                stdout_capture = OutputCapture(self.max_output_bytes, self.spill_dir, "stdout")
+                stderr_capture = OutputCapture(self.max_output_bytes, self.spill_dir, "stderr")
                 try:
-                    stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+                    await asyncio.wait_for(
+                        asyncio.gather(
+                            _capture_stream(process.stdout, stdout_capture),
+                            _capture_stream(process.stderr, stderr_capture),
+                            process.wait(),
+                        ),
+                        timeout=timeout,
+                    )
                 except asyncio.TimeoutError:
                     process.kill()
-                    error_msg = f"Command timed out after {timeout} seconds"
-                    return BashOutputResult(
-                        success=False,
-                        error=error_msg,
-                        stdout="",
-                        stderr=error_msg,
-                        exit_code=-1,
-                    )
-
-                # Decode output
-                stdout_text = stdout.decode("utf-8", errors="replace")
-                stderr_text = stderr.decode("utf-8", errors="replace")
+                    await process.wait()
+                    # Keep whatever was printed before the timeout
+                    return self._foreground_result(stdout_capture, stderr_capture, -1, timed_out_after=timeout)
+                finally:
+                    stdout_capture.close()
+                    stderr_capture.close()
 
-                # Create result (content auto-formatted by model_validator)
-                is_success = process.returncode == 0
-                error_msg = None
-                if not is_success:
-                    error_msg = f"Command failed with exit code {process.returncode}"
-                    if stderr_text:
-                        error_msg += f"\n{stderr_text.strip()}"
-
-                return BashOutputResult(
-                    success=is_success,
-                    error=error_msg,
-                    stdout=stdout_text,
-                    stderr=stderr_text,
-                    exit_code=process.returncode or 0,
-                )
+                return self._foreground_result(stdout_capture, stderr_capture, process.returncode)
 
         except Exception as e:
             return BashOutputResult(
@@ -426,6 +1055,119 @@ Examples:
                 exit_code=-1,
             )
 
+    async def _run_foreground(self, command: str, timeout: int) -> BashOutputResult:
+        """Run a foreground command on Unix.
+
+        The command gets its own process group, so a timeout kills everything
+        it started, and is reaped with os.wait4 to report peak RSS and CPU time.
+        """
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **self._spawn_kwargs(),
+        )
+        exit_status = _wait4(process.pid)
+        stdout_capture = OutputCapture(self.max_output_bytes, self.spill_dir, "stdout")
+        stderr_capture = OutputCapture(self.max_output_bytes, self.spill_dir, "stderr")
+        transports = []
+        timed_out = False
+        try:
+            stdout_reader, stdout_transport = await _open_pipe_reader(process.stdout)
+            transports.append(stdout_transport)
+            stderr_reader, stderr_transport = await _open_pipe_reader(process.stderr)
+            transports.append(stderr_transport)
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        _capture_stream(stdout_reader, stdout_capture),
+                        _capture_stream(stderr_reader, stderr_capture),
+                        asyncio.shield(exit_status),
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                timed_out = True
+        finally:
+            if timed_out or not exit_status.done():
+                _kill_process_group(process)
+            exit_code, rusage = await exit_status
+            # Reaped by wait4; keep Popen from trying again
+            process.returncode = exit_code
+            for transport in transports:
+                transport.close()
+            stdout_capture.close()
+            stderr_capture.close()
+
+        return self._foreground_result(
+            stdout_capture,
+            stderr_capture,
+            -1 if timed_out else exit_code,
+            timed_out_after=timeout if timed_out else None,
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            peak_rss_bytes=rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+            cpu_seconds=round(rusage.ru_utime + rusage.ru_stime, 3),
+        )
+
+    def close(self) -> None:
+        """Kill the persistent shell session, if any."""
+        if self.session is not None:
+            self.session.close()
+
+    def _foreground_result(
+        self,
+        stdout_capture: OutputCapture,
+        stderr_capture: OutputCapture,
+        returncode: int,
+        timed_out_after: int | None = None,
+        **usage: Any,
+    ) -> BashOutputResult:
+        """Build the result of a foreground command from its captured output.
+
+        Content is auto-formatted by the BashOutputResult model_validator.
+        usage holds optional resource usage fields (peak_rss_bytes, cpu_seconds).
+        """
+        # Created, removed or renamed files show in directory mtimes; in-place
+        # edits are left to the indexes' periodic full scans
+        mark_indexes_stale(self.workspace_dir or os.getcwd(), directory=True)
+        # The byte caps bound memory; the token budget bounds what goes into the context
+        stderr_text = truncate_text_by_tokens(stderr_capture.text(), MAX_OUTPUT_TOKENS // 2)
+        stdout_budget = MAX_OUTPUT_TOKENS - (count_tokens(stderr_text) if stderr_text else 0)
+        stdout_text = truncate_text_by_tokens(stdout_capture.text(), stdout_budget)
+        error_msg = None
+        if timed_out_after is not None:
+            error_msg = f"Command timed out after {timed_out_after} seconds"
+            # Report the timeout after any stderr captured before it
+            stderr_text = f"{stderr_text.rstrip()}\n{error_msg}".lstrip()
+        elif returncode < 0 and -returncode in signal.valid_signals():
+            # Killed by a signal, e.g. SIGXCPU/SIGKILL from a resource limit
+            error_msg = f"Command terminated by signal {signal.Signals(-returncode).name}"
+            if stderr_text:
+                error_msg += f"\n{stderr_text.strip()}"
+        elif returncode > 128 and returncode - 128 in signal.valid_signals():
+            # The shell reports a child killed by signal N as exit code 128 + N
+            error_msg = f"Command terminated by signal {signal.Signals(returncode - 128).name} (exit code {returncode})"
+            if stderr_text:
+                error_msg += f"\n{stderr_text.strip()}"
+        elif returncode != 0:
+            error_msg = f"Command failed with exit code {returncode}"
+            if stderr_text:
+                error_msg += f"\n{stderr_text.strip()}"
+
+        return BashOutputResult(
+            success=error_msg is None,
+            error=error_msg,
+            stdout=stdout_text,
+            stderr=stderr_text,
+            exit_code=returncode or 0,
+            truncated_bytes=stdout_capture.truncated_bytes + stderr_capture.truncated_bytes,
+            truncated_lines=stdout_capture.truncated_lines + stderr_capture.truncated_lines,
+            stdout_file=stdout_capture.spill_path,
+            stderr_file=stderr_capture.spill_path,
+            **usage,
+        )
+
 
 class BashOutputTool(Tool):
     """Retrieve output from background bash shells."""
@@ -442,6 +1184,10 @@ class BashOutputTool(Tool):
         - Always returns only new output since the last check
         - Returns stdout and stderr output along with shell status
         - Supports optional regex filtering to show only lines matching a pattern
+        - Can wait for output instead of returning immediately: wait_seconds blocks until
+          new output arrives or the shell exits; with until_regex it blocks until a line
+          matching the regex appears (e.g. a server's "Listening on" line or a test summary)
+        - Prefer waiting over calling this tool repeatedly in a loop
         - Use this tool when you need to monitor or check the output of a long-running shell
         - Shell IDs can be found using the bash tool with run_in_background=true
 
@@ -452,7 +1198,9 @@ class BashOutputTool(Tool):
           - "terminated": Was terminated
           - "error": Error occurred
 
-        Example: bash_output(bash_id="abc12345")"""
+        Examples:
+          - bash_output(bash_id="abc12345")
+          - bash_output(bash_id="abc12345", until_regex="Listening on|Error", wait_seconds=60)"""
 
     @property
     def parameters(self) -> dict[str, Any]:
@@ -467,6 +1215,14 @@ class BashOutputTool(Tool):
                     "type": "string",
                     "description": "Optional regular expression to filter the output lines. Only lines matching this regex will be included in the result. Any lines that do not match will no longer be available to read.",
                 },
+                "wait_seconds": {
+                    "type": "number",
+                    "description": f"Optional: wait up to this many seconds (max {MAX_WAIT_SECONDS}) for new output, or for a line matching until_regex, before returning. Returns early when the shell exits. Default 0 (return immediately), or 30 when until_regex is given.",
+                },
+                "until_regex": {
+                    "type": "string",
+                    "description": "Optional: regular expression to wait for. Returns once a new output line matches it, the shell exits, or wait_seconds passes.",
+                },
             },
             "required": ["bash_id"],
         }
@@ -475,12 +1231,16 @@ class BashOutputTool(Tool):
         self,
         bash_id: str,
         filter_str: str | None = None,
+        wait_seconds: float | None = None,
+        until_regex: str | None = None,
     ) -> BashOutputResult:
         """Retrieve output from background shell.
 
         Args:
             bash_id: The unique identifier of the background shell
             filter_str: Optional regex pattern to filter output lines
+            wait_seconds: Seconds to wait for new output (or an until_regex match) before returning
+            until_regex: Optional regex; wait until a new output line matches it
 
         Returns:
             BashOutputResult with shell output including stdout, stderr, status, and success flag
@@ -499,9 +1259,28 @@ class BashOutputTool(Tool):
                     exit_code=-1,
                 )
 
+            # Optionally block until output (or a matching line) is available
+            if wait_seconds is None:
+                wait_seconds = 30 if until_regex else 0
+            wait_seconds = min(max(float(wait_seconds), 0), MAX_WAIT_SECONDS)
+            matched = None
+            if until_regex:
+                pattern = _compile_pattern(until_regex)
+                if pattern is None:
+                    return BashOutputResult(
+                        success=False,
+                        error=f"Invalid until_regex: {until_regex}",
+                        stdout="",
+                        stderr="",
+                        exit_code=-1,
+                    )
+                matched = await bg_shell.wait_for_match(pattern, wait_seconds)
+            elif wait_seconds > 0:
+                await bg_shell.wait_for_output(wait_seconds)
+
             # Get new output
             new_lines = bg_shell.get_new_output(filter_pattern=filter_str)
-            stdout = "\n".join(new_lines) if new_lines else ""
+            stdout = truncate_text_by_tokens("\n".join(new_lines), MAX_OUTPUT_TOKENS) if new_lines else ""
 
             return BashOutputResult(
                 success=True,
@@ -509,6 +1288,8 @@ class BashOutputTool(Tool):
                 stderr="",  # Background shells combine stdout/stderr
                 exit_code=bg_shell.exit_code if bg_shell.exit_code is not None else 0,
                 bash_id=bash_id,
+                status=bg_shell.status,
+                matched=matched,
             )
 
         except Exception as e:
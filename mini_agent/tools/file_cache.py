@@ -0,0 +1,155 @@
+"""Workspace file-content cache shared by the file tools.
+
+Agents read the same files many times per session (read, edit, read again).
+``FileCache`` keeps recently used file contents in memory, bounded by a byte
+budget with least-recently-used eviction. Entries are validated against the
+file's (mtime_ns, size) on every access, so changes made outside the tools
+(bash, editors, git) are picked up; tools that write a file store the new
+content directly (write-through).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class CachedFile:
+    """Cached content of one file."""
+
+    data: bytes
+    mtime_ns: int
+    size: int
+    _lines: list[str] | None = field(default=None, repr=False)
+
+    @property
+    def lines(self) -> list[str]:
+        """UTF-8 decoded lines with their line endings (split on newline only).
+
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        if self._lines is None:
+            text = self.data.decode("utf-8")
+            parts = text.split("\n")
+            lines = [part + "\n" for part in parts[:-1]]
+            if parts[-1]:
+                lines.append(parts[-1])
+            self._lines = lines
+        return self._lines
+
+
+class FileCache:
+    """LRU cache of file contents with a byte budget and hit-rate statistics."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_file_bytes: int = 4 * 1024 * 1024):
+        """Initialize cache.
+
+        Args:
+            max_bytes: Total size of cached file contents
+            max_file_bytes: Larger files are never cached (tools stream them instead)
+        """
+        self.max_bytes = max_bytes
+        self.max_file_bytes = min(max_file_bytes, max_bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> CachedFile | None:
+        """Get the current content of path, reading it on a miss.
+
+        Returns:
+            The cached file, or None if the file is larger than max_file_bytes
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = str(path)
+        stat = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        if stat.st_size > self.max_file_bytes:
+            self.invalidate(path)
+            return None
+
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+        return self._store(key, data, stat)
+
+    def put(self, path: Path, data: bytes) -> None:
+        """Store content just written to path (write-through)."""
+        if len(data) > self.max_file_bytes:
+            self.invalidate(path)
+            return
+        self._store(str(path), data, os.stat(path))
+
+    def invalidate(self, path: Path) -> None:
+        """Drop path from the cache."""
+        with self._lock:
+            entry = self._entries.pop(str(path), None)
+            if entry is not None:
+                self.total_bytes -= len(entry.data)
+
+    def stats(self) -> dict[str, float]:
+        """Hit/miss counters, hit rate, entry count and cached bytes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+            }
+
+    def _store(self, key: str, data: bytes, stat: os.stat_result) -> CachedFile:
+        entry = CachedFile(data=data, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old.data)
+            self._entries[key] = entry
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted.data)
+                self.evictions += 1
+        return entry
+
+
+_workspace_caches: dict[str, FileCache] = {}
+_workspace_caches_lock = threading.Lock()
+
+
+def get_workspace_file_cache(workspace_dir: str | Path, max_bytes: int = 64 * 1024 * 1024) -> FileCache:
+    """Get the file cache shared by all file tools of a workspace.
+
+    Args:
+        workspace_dir: Workspace directory
+        max_bytes: Byte budget, used when the cache is created
+    """
+    key = str(Path(workspace_dir).absolute())
+    with _workspace_caches_lock:
+        cache = _workspace_caches.get(key)
+        if cache is None:
+            cache = FileCache(max_bytes=max_bytes)
+            _workspace_caches[key] = cache
+        return cache
+
+
+def release_workspace_file_cache(workspace_dir: str | Path) -> None:
+    """Drop the shared cache of a workspace (when its last session closes)."""
+    with _workspace_caches_lock:
+        _workspace_caches.pop(str(Path(workspace_dir).absolute()), None)
@@ -1,75 +1,313 @@
 """File operation tools."""
 
+import asyncio
+import bisect
+import mmap
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
-import tiktoken
-
+from ..utils.token_utils import truncate_text_by_tokens
 from .base import Tool, ToolResult
+from .file_cache import FileCache
+from .search_index import WorkspaceIndex, get_workspace_index, mark_indexes_stale
 
 
-def truncate_text_by_tokens(
-    text: str,
-    max_tokens: int,
-) -> str:
-    """Truncate text by token count if it exceeds the limit.
+# Bytes per checkpoint of the line-offset index
+LINE_INDEX_BLOCK_SIZE = 1 << 20
 
-    When text exceeds the specified token limit, performs intelligent truncation
-    by keeping the front and back parts while truncating the middle.
+# Number of files whose line-offset index is kept
+LINE_INDEX_CACHE_SIZE = 64
 
-    Args:
-        text: Text to be truncated
-        max_tokens: Maximum token limit
 
-    Returns:
-        str: Truncated text if it exceeds the limit, otherwise the original text.
+class LineIndex:
+    """Sparse line-offset index of a file, built lazily with mmap.
+
+    Stores the number of newlines before each LINE_INDEX_BLOCK_SIZE block, so
+    finding where a line starts is a binary search plus a scan of at most one
+    block. Blocks are only counted up to the furthest line requested so far.
+    """
 
-    Example:
-        >>> text = "very long text..." * 10000
-        >>> truncated = truncate_text_by_tokens(text, 64000)
-        >>> print(truncated)
+    def __init__(self, size: int, block_size: int | None = None):
+        self.size = size
+        self.block_size = block_size or LINE_INDEX_BLOCK_SIZE
+        # block_lines[i] = newlines in file[: i * block_size]
+        self.block_lines = [0]
+        # ReadTool runs in worker threads; extending the index is serialized
+        self._lock = threading.Lock()
+
+    def line_offset(self, mm: mmap.mmap, line: int) -> int:
+        """Byte offset where the 0-based line starts (file size if there are fewer lines)."""
+        if line <= 0:
+            return 0
+        block_size = self.block_size
+        with self._lock:
+            while self.block_lines[-1] < line and (len(self.block_lines) - 1) * block_size < self.size:
+                start = (len(self.block_lines) - 1) * block_size
+                self.block_lines.append(self.block_lines[-1] + mm[start : start + block_size].count(b"\n"))
+
+            # Last block starting before the line's preceding newline, then scan within it
+            block = bisect.bisect_left(self.block_lines, line) - 1
+            block_start_line = self.block_lines[block]
+        position = block * block_size
+        for _ in range(line - block_start_line):
+            position = mm.find(b"\n", position)
+            if position == -1:
+                return self.size
+            position += 1
+        return position
+
+
+_line_indexes: "OrderedDict[str, tuple[int, int, LineIndex]]" = OrderedDict()
+_line_indexes_lock = threading.Lock()
+
+
+def _get_line_index(path: Path, stat: os.stat_result) -> LineIndex:
+    """Cached line index for path, rebuilt when its (mtime, size) changes."""
+    key = str(path)
+    with _line_indexes_lock:
+        cached = _line_indexes.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            _line_indexes.move_to_end(key)
+            return cached[2]
+        index = LineIndex(stat.st_size)
+        _line_indexes[key] = (stat.st_mtime_ns, stat.st_size, index)
+        if len(_line_indexes) > LINE_INDEX_CACHE_SIZE:
+            _line_indexes.popitem(last=False)
+        return index
+
+
+def read_line_range(path: Path, start: int, limit: int | None) -> list[str]:
+    """Read lines [start, start + limit) of a UTF-8 file (0-based; limit None = to the end).
+
+    Seeks directly to the first line through the cached line index, so the
+    cost is proportional to the lines read rather than the file size.
+    Returned lines keep their line endings.
     """
-    encoding = tiktoken.get_encoding("cl100k_base")
-    token_count = len(encoding.encode(text))
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if start > 0 and stat.st_size > 0:
+            index = _get_line_index(path, stat)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                f.seek(index.line_offset(mm, start))
+
+        lines = []
+        while limit is None or len(lines) < limit:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line.decode("utf-8"))
+        return lines
+
+
+# Read size for streaming edits
+EDIT_CHUNK_SIZE = 1 << 20
+
+
+
+def atomic_write(path: Path, data: bytes | Iterable[bytes]) -> None:
+    """Atomically replace path with data (bytes or an iterable of byte chunks).
+
+    Writes to a temporary file in the same directory, fsyncs it and moves it
+    over the target with os.replace, so readers (and a crash mid-write) see
+    either the old or the new file, never a partial one. Permissions of an
+    existing file are kept; symlinks are followed.
+    """
+    path = path.resolve() if path.is_symlink() else path
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+
+    fd, tmp_name = _create_temp_file(path, 0o600 if mode is not None else 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                for chunk in data:
+                    f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _create_temp_file(path: Path, mode: int) -> tuple[int, str]:
+    """Create a new temporary file next to path (open for writing); the kernel applies the umask to mode.
+
+    New files get 0o666 minus the umask like any created file. Reading the umask
+    instead (os.umask sets it) would briefly change it for every thread.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(100):
+        tmp_name = os.path.join(path.parent, f".{path.name}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(tmp_name, flags, mode), tmp_name
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary file name next to {path}")
 
-    # Return original text if under limit
-    if token_count <= max_tokens:
-        return text
 
-    # Calculate token/character ratio for approximation
-    char_count = len(text)
-    ratio = token_count / char_count
+def _find_matches(source: Path | bytes, needles: list[bytes], limit: int = 2) -> list[list[int]]:
+    """Byte offsets of up to limit occurrences of each needle.
 
-    # Keep head and tail mode: allocate half space for each (with 5% safety margin)
-    chars_per_half = int((max_tokens / 2) / ratio * 0.95)
+    source is either file content already in memory or a path, which is
+    scanned in chunks.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return _scan_chunks(iter([source]), needles, limit)
+    with open(source, "rb") as f:
+        return _scan_chunks(iter(lambda: f.read(EDIT_CHUNK_SIZE), b""), needles, limit)
+
+
+def _scan_chunks(chunks: Iterable[bytes], needles: list[bytes], limit: int) -> list[list[int]]:
+    found: list[list[int]] = [[] for _ in needles]
+    overlap = max(len(needle) for needle in needles) - 1
+    buffer = b""
+    base = 0  # offset of buffer[0]
+    for chunk in chunks:
+        buffer += chunk
+        for needle, positions in zip(needles, found):
+            index = buffer.find(needle)
+            while index != -1 and len(positions) < limit:
+                # Matches inside the overlap were already seen in the previous chunk
+                if not positions or base + index > positions[-1]:
+                    positions.append(base + index)
+                index = buffer.find(needle, index + 1)
+        if all(len(positions) >= limit for positions in found):
+            break
+        keep = min(overlap, len(buffer))
+        base += len(buffer) - keep
+        buffer = buffer[len(buffer) - keep :]
+    return found
+
+
+def _copy_range(f, start: int, end: int | None) -> Iterable[bytes]:
+    """Yield the bytes of f between start and end (None = EOF) in chunks."""
+    f.seek(start)
+    remaining = None if end is None else end - start
+    while remaining is None or remaining > 0:
+        chunk = f.read(EDIT_CHUNK_SIZE if remaining is None else min(EDIT_CHUNK_SIZE, remaining))
+        if not chunk:
+            return
+        if remaining is not None:
+            remaining -= len(chunk)
+        yield chunk
+
+
+def apply_edits(path: Path, edits: list[tuple[str, str]], original: bytes | None = None) -> bytes | None:
+    """Replace each old string with its new string in one streaming pass over the file.
+
+    Every old string must occur exactly once in the original file, and the
+    matches must not overlap; otherwise nothing is written. Matching is
+    done on UTF-8 bytes in chunks, and the result is written with
+    atomic_write, so memory use does not depend on the file size. If an old
+    string containing LF line breaks is not found, its CRLF form is tried.
 
-    # Truncate front part: find nearest newline
-    head_part = text[:chars_per_half]
-    last_newline_head = head_part.rfind("\n")
-    if last_newline_head > 0:
-        head_part = head_part[:last_newline_head]
+    Args:
+        path: File to edit
+        edits: (old_str, new_str) pairs
+        original: Current file content if already in memory (e.g. cached); the
+            edit is then done in memory instead of streaming from disk
 
-    # Truncate back part: find nearest newline
-    tail_part = text[-chars_per_half:]
-    first_newline_tail = tail_part.find("\n")
-    if first_newline_tail > 0:
-        tail_part = tail_part[first_newline_tail + 1 :]
+    Returns:
+        The new file content if original was given, otherwise None
 
-    # Combine result
-    truncation_note = f"\n\n... [Content truncated: {token_count} tokens -> ~{max_tokens} tokens limit] ...\n\n"
-    return head_part + truncation_note + tail_part
+    Raises:
+        ValueError: If an old string is empty, missing, not unique or overlaps another
+    """
+    olds, news = [], []
+    for old_str, new_str in edits:
+        if not old_str:
+            raise ValueError("old_str must not be empty")
+        olds.append(old_str.encode("utf-8"))
+        news.append(new_str.encode("utf-8"))
+    source = path if original is None else original
+    matches = _find_matches(source, olds)
+
+    # Files with Windows line endings: retry LF-only strings as CRLF
+    retry = [i for i, positions in enumerate(matches) if not positions and b"\n" in olds[i] and b"\r\n" not in olds[i]]
+    if retry:
+        crlf = _find_matches(source, [olds[i].replace(b"\n", b"\r\n") for i in retry])
+        for i, positions in zip(retry, crlf):
+            if positions:
+                matches[i] = positions
+                olds[i] = olds[i].replace(b"\n", b"\r\n")
+                news[i] = news[i].replace(b"\n", b"\r\n")
+
+    replacements = []
+    for (old_str, _), old, new, positions in zip(edits, olds, news, matches):
+        if not positions:
+            raise ValueError(f"Text not found in file: {old_str}")
+        if len(positions) > 1:
+            raise ValueError(f"Text appears multiple times in file (add surrounding context to make it unique): {old_str}")
+        replacements.append((positions[0], positions[0] + len(old), new))
+    replacements.sort()
+    for (_, prev_end, _), (start, _, _) in zip(replacements, replacements[1:]):
+        if start < prev_end:
+            raise ValueError("Edits overlap in the file; combine them into one edit")
+
+    if original is not None:
+        parts = []
+        position = 0
+        for start, end, new in replacements:
+            parts += [original[position:start], new]
+            position = end
+        parts.append(original[position:])
+        content = b"".join(parts)
+        atomic_write(path, content)
+        return content
+
+    def chunks(f) -> Iterable[bytes]:
+        position = 0
+        for start, end, new in replacements:
+            yield from _copy_range(f, position, start)
+            yield new
+            position = end
+        yield from _copy_range(f, position, None)
+
+    with open(path, "rb") as f:
+        atomic_write(path, chunks(f))
+    return None
+
+
+def _edit_file(file_path: Path, edits: list[tuple[str, str]], cache: FileCache | None) -> None:
+    """Apply edits, in memory from the cache when the file is cached, and update the cache."""
+    entry = cache.get(file_path) if cache is not None else None
+    content = apply_edits(file_path, edits, original=entry.data if entry is not None else None)
+    mark_indexes_stale(file_path)
+    if cache is not None:
+        if content is not None:
+            cache.put(file_path, content)
+        else:
+            cache.invalidate(file_path)
 
 
 class ReadTool(Tool):
     """Read file content."""
 
-    def __init__(self, workspace_dir: str = "."):
+    def __init__(self, workspace_dir: str = ".", cache: FileCache | None = None):
         """Initialize ReadTool with workspace directory.
 
         Args:
             workspace_dir: Base directory for resolving relative paths
+            cache: File content cache shared by the workspace's file tools (None disables caching)
         """
         self.workspace_dir = Path(workspace_dir).absolute()
+        self.cache = cache
 
     @property
     def name(self) -> str:
@@ -84,6 +322,10 @@ class ReadTool(Tool):
             "You can call this tool multiple times in parallel to read different files simultaneously."
         )
 
+    @property
+    def read_only(self) -> bool:
+        return True
+
     @property
     def parameters(self) -> dict[str, Any]:
         return {
@@ -106,7 +348,10 @@ class ReadTool(Tool):
         }
 
     async def execute(self, path: str, offset: int | None = None, limit: int | None = None) -> ToolResult:
-        """Execute read file."""
+        """Execute read file (in a worker thread, so concurrent reads overlap their file I/O)."""
+        return await asyncio.to_thread(self._read, path, offset, limit)
+
+    def _read(self, path: str, offset: int | None, limit: int | None) -> ToolResult:
         try:
             file_path = Path(path)
             # Resolve relative paths relative to workspace_dir
@@ -120,25 +365,20 @@ class ReadTool(Tool):
                     error=f"File not found: {path}",
                 )
 
-            # Read file content with line numbers
-            with open(file_path, encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # Apply offset and limit
-            start = (offset - 1) if offset else 0
-            end = (start + limit) if limit else len(lines)
-            if start < 0:
-                start = 0
-            if end > len(lines):
-                end = len(lines)
-
-            selected_lines = lines[start:end]
+            # Read only the requested line range (from the cache for files it holds)
+            start = max((offset - 1) if offset else 0, 0)
+            limit = limit if limit and limit > 0 else None
+            entry = self.cache.get(file_path) if self.cache is not None else None
+            if entry is not None:
+                selected_lines = entry.lines[start : start + limit if limit else None]
+            else:
+                selected_lines = read_line_range(file_path, start, limit)
 
             # Format with line numbers (1-indexed)
             numbered_lines = []
             for i, line in enumerate(selected_lines, start=start + 1):
                 # Remove trailing newline for formatting
-                line_content = line.rstrip("\n")
+                line_content = line.rstrip("\r\n")
                 numbered_lines.append(f"{i:6d}|{line_content}")
 
             content = "\n".join(numbered_lines)
@@ -155,13 +395,15 @@ class ReadTool(Tool):
 class WriteTool(Tool):
     """Write content to a file."""
 
-    def __init__(self, workspace_dir: str = "."):
+    def __init__(self, workspace_dir: str = ".", cache: FileCache | None = None):
         """Initialize WriteTool with workspace directory.
 
         Args:
             workspace_dir: Base directory for resolving relative paths
+            cache: File content cache shared by the workspace's file tools (None disables caching)
         """
         self.workspace_dir = Path(workspace_dir).absolute()
+        self.cache = cache
 
     @property
     def name(self) -> str:
@@ -203,7 +445,11 @@ class WriteTool(Tool):
             # Create parent directories if they don't exist
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            file_path.write_text(content, encoding="utf-8")
+            data = content.encode("utf-8")
+            atomic_write(file_path, data)
+            if self.cache is not None:
+                self.cache.put(file_path, data)
+            mark_indexes_stale(file_path)
             return ToolResult(success=True, content=f"Successfully wrote to {file_path}")
         except Exception as e:
             return ToolResult(success=False, content="", error=str(e))
@@ -212,13 +458,15 @@ class WriteTool(Tool):
 class EditTool(Tool):
     """Edit file by replacing text."""
 
-    def __init__(self, workspace_dir: str = "."):
+    def __init__(self, workspace_dir: str = ".", cache: FileCache | None = None):
         """Initialize EditTool with workspace directory.
 
         Args:
             workspace_dir: Base directory for resolving relative paths
+            cache: File content cache shared by the workspace's file tools (None disables caching)
         """
         self.workspace_dir = Path(workspace_dir).absolute()
+        self.cache = cache
 
     @property
     def name(self) -> str:
@@ -268,18 +516,319 @@ class EditTool(Tool):
                     error=f"File not found: {path}",
                 )
 
-            content = file_path.read_text(encoding="utf-8")
+            try:
+                _edit_file(file_path, [(old_str, new_str)], self.cache)
+            except ValueError as e:
+                return ToolResult(success=False, content="", error=str(e))
+
+            return ToolResult(success=True, content=f"Successfully edited {file_path}")
+        except Exception as e:
+            return ToolResult(success=False, content="", error=str(e))
+
+
+class MultiEditTool(Tool):
+    """Apply several replacements to one file at once."""
+
+    def __init__(self, workspace_dir: str = ".", cache: FileCache | None = None):
+        """Initialize MultiEditTool with workspace directory.
+
+        Args:
+            workspace_dir: Base directory for resolving relative paths
+            cache: File content cache shared by the workspace's file tools (None disables caching)
+        """
+        self.workspace_dir = Path(workspace_dir).absolute()
+        self.cache = cache
+
+    @property
+    def name(self) -> str:
+        return "multi_edit_file"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Apply several exact string replacements to one file in a single operation. "
+            "Each old_str must appear exactly once in the original file and edits must not overlap; "
+            "if any edit fails, the file is left unchanged. Prefer this over repeated edit_file calls "
+            "when changing several places in the same file. You must read the file first before editing."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute or relative path to the file",
+                },
+                "edits": {
+                    "type": "array",
+                    "description": "Replacements to apply, each matched against the original file content",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "old_str": {
+                                "type": "string",
+                                "description": "Exact string to find and replace (must be unique in file)",
+                            },
+                            "new_str": {
+                                "type": "string",
+                                "description": "Replacement string",
+                            },
+                        },
+                        "required": ["old_str", "new_str"],
+                    },
+                },
+            },
+            "required": ["path", "edits"],
+        }
+
+    async def execute(self, path: str, edits: list[dict[str, str]]) -> ToolResult:
+        """Execute multi edit."""
+        try:
+            file_path = Path(path)
+            # Resolve relative paths relative to workspace_dir
+            if not file_path.is_absolute():
+                file_path = self.workspace_dir / file_path
 
-            if old_str not in content:
+            if not file_path.exists():
                 return ToolResult(
                     success=False,
                     content="",
-                    error=f"Text not found in file: {old_str}",
+                    error=f"File not found: {path}",
                 )
+            if not edits:
+                return ToolResult(success=False, content="", error="No edits given")
+
+            try:
+                pairs = [(edit["old_str"], edit["new_str"]) for edit in edits]
+            except (KeyError, TypeError):
+                return ToolResult(success=False, content="", error="Each edit needs old_str and new_str")
+            try:
+                _edit_file(file_path, pairs, self.cache)
+            except ValueError as e:
+                return ToolResult(success=False, content="", error=f"No edits applied: {e}")
+
+            return ToolResult(success=True, content=f"Successfully applied {len(edits)} edits to {file_path}")
+        except Exception as e:
+            return ToolResult(success=False, content="", error=str(e))
 
-            new_content = content.replace(old_str, new_str)
-            file_path.write_text(new_content, encoding="utf-8")
 
-            return ToolResult(success=True, content=f"Successfully edited {file_path}")
+# Result caps of the search tools
+DEFAULT_SEARCH_RESULTS = 100
+MAX_SEARCH_RESULTS = 1000
+
+# Matching lines longer than this are cut in grep output
+MAX_GREP_LINE_CHARS = 300
+
+
+def _resolve_search_path(workspace_dir: Path, index: WorkspaceIndex, path: str | None) -> tuple[WorkspaceIndex, str]:
+    """Index and relative prefix for a search path (paths outside the index root get their own index).
+
+    Raises:
+        FileNotFoundError: If the path does not exist
+    """
+    target = Path(path) if path else workspace_dir
+    if not target.is_absolute():
+        target = workspace_dir / target
+    target = Path(os.path.normpath(target))
+    if not target.exists():
+        raise FileNotFoundError(f"Path not found: {path}")
+    try:
+        prefix = target.relative_to(index.root).as_posix()
+        return index, "" if prefix == "." else prefix
+    except ValueError:
+        if target.is_dir():
+            return get_workspace_index(target), ""
+        return get_workspace_index(target.parent), target.name
+
+
+def _display_path(workspace_dir: Path, index: WorkspaceIndex, path: str) -> str:
+    """Path relative to the workspace when inside it, absolute otherwise."""
+    full = index.root / path
+    try:
+        return full.relative_to(workspace_dir).as_posix()
+    except ValueError:
+        return str(full)
+
+
+class GrepTool(Tool):
+    """Search file contents with a regular expression."""
+
+    def __init__(self, workspace_dir: str = ".", index: WorkspaceIndex | None = None):
+        """Initialize GrepTool with workspace directory.
+
+        Args:
+            workspace_dir: Base directory for resolving relative paths
+            index: Search index of the workspace (defaults to the shared index of workspace_dir)
+        """
+        self.workspace_dir = Path(workspace_dir).absolute()
+        self.index = index if index is not None else get_workspace_index(self.workspace_dir)
+
+    @property
+    def name(self) -> str:
+        return "grep"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search file contents with a regular expression (Python syntax) across the workspace. "
+            "Files ignored by .gitignore and binary files are skipped. Returns matching lines as "
+            "'path:line_number:content' by default, or only file paths or per-file match counts. "
+            "Results are capped; narrow the search with path or glob. Prefer this over running grep through bash."
+        )
+
+    @property
+    def read_only(self) -> bool:
+        return True
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Regular expression to search for (matched per line)",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "File or directory to search (default: workspace)",
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Only search files matching this glob, e.g. '*.py' (file name) or 'src/**/*.ts' (path)",
+                },
+                "case_insensitive": {
+                    "type": "boolean",
+                    "description": "Ignore case (default: false)",
+                },
+                "output_mode": {
+                    "type": "string",
+                    "enum": ["content", "files_with_matches", "count"],
+                    "description": "content: matching lines (default); files_with_matches: file paths; count: matches per file",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": f"Maximum lines or files returned (default: {DEFAULT_SEARCH_RESULTS}, max: {MAX_SEARCH_RESULTS})",
+                },
+            },
+            "required": ["pattern"],
+        }
+
+    async def execute(
+        self,
+        pattern: str,
+        path: str | None = None,
+        glob: str | None = None,
+        case_insensitive: bool = False,
+        output_mode: str = "content",
+        max_results: int | None = None,
+    ) -> ToolResult:
+        """Execute grep."""
+        try:
+            if output_mode not in ("content", "files_with_matches", "count"):
+                return ToolResult(success=False, content="", error=f"Invalid output_mode: {output_mode}")
+            try:
+                regex = re.compile(pattern, re.MULTILINE | (re.IGNORECASE if case_insensitive else 0))
+            except re.error as e:
+                return ToolResult(success=False, content="", error=f"Invalid regex: {e}")
+            limit = min(max(max_results or DEFAULT_SEARCH_RESULTS, 1), MAX_SEARCH_RESULTS)
+            index, prefix = _resolve_search_path(self.workspace_dir, self.index, path)
+
+            # Ask for one more result than shown to know whether the output is truncated
+            if output_mode == "content":
+                matches = await asyncio.to_thread(index.grep, regex, prefix, glob, max_lines=limit + 1)
+            else:
+                matches = await asyncio.to_thread(
+                    index.grep, regex, prefix, glob, max_files=limit + 1, first_only=output_mode == "files_with_matches"
+                )
+            if not matches:
+                return ToolResult(success=True, content="No matches found")
+
+            output = []
+            for match in matches:
+                name = _display_path(self.workspace_dir, index, match.path)
+                if output_mode == "files_with_matches":
+                    output.append(name)
+                elif output_mode == "count":
+                    output.append(f"{name}:{match.count}")
+                else:
+                    for line_number, line in match.lines:
+                        if len(line) > MAX_GREP_LINE_CHARS:
+                            line = line[:MAX_GREP_LINE_CHARS] + "..."
+                        output.append(f"{name}:{line_number}:{line}")
+            if len(output) > limit:
+                output = output[:limit]
+                output.append(f"... [results truncated at {limit}; narrow the search with path or glob]")
+            return ToolResult(success=True, content="\n".join(output))
+        except Exception as e:
+            return ToolResult(success=False, content="", error=str(e))
+
+
+class GlobTool(Tool):
+    """Find files by glob pattern."""
+
+    def __init__(self, workspace_dir: str = ".", index: WorkspaceIndex | None = None):
+        """Initialize GlobTool with workspace directory.
+
+        Args:
+            workspace_dir: Base directory for resolving relative paths
+            index: Search index of the workspace (defaults to the shared index of workspace_dir)
+        """
+        self.workspace_dir = Path(workspace_dir).absolute()
+        self.index = index if index is not None else get_workspace_index(self.workspace_dir)
+
+    @property
+    def name(self) -> str:
+        return "glob"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Find files whose path matches a glob pattern such as '**/*.py' or 'src/**/*.{ts,tsx}', "
+            "relative to the search directory. Files ignored by .gitignore are skipped. "
+            "Returns paths sorted by modification time, most recent first (results are capped)."
+        )
+
+    @property
+    def read_only(self) -> bool:
+        return True
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Glob pattern: * and ? match within a path component, ** matches any directories",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Directory to search (default: workspace)",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": f"Maximum paths returned (default: {DEFAULT_SEARCH_RESULTS}, max: {MAX_SEARCH_RESULTS})",
+                },
+            },
+            "required": ["pattern"],
+        }
+
+    async def execute(self, pattern: str, path: str | None = None, max_results: int | None = None) -> ToolResult:
+        """Execute glob."""
+        try:
+            limit = min(max(max_results or DEFAULT_SEARCH_RESULTS, 1), MAX_SEARCH_RESULTS)
+            index, prefix = _resolve_search_path(self.workspace_dir, self.index, path)
+            entries = await asyncio.to_thread(index.glob, pattern, prefix)
+            if not entries:
+                return ToolResult(success=True, content="No files found")
+
+            entries.sort(key=lambda entry: entry.mtime_ns, reverse=True)
+            output = [_display_path(self.workspace_dir, index, entry.path) for entry in entries[:limit]]
+            if len(entries) > limit:
+                output.append(f"... [{len(entries) - limit} more files; narrow the pattern or path]")
+            return ToolResult(success=True, content="\n".join(output))
         except Exception as e:
             return ToolResult(success=False, content="", error=str(e))
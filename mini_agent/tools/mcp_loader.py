@@ -1,22 +1,43 @@
 """MCP tool loader with real MCP client integration and timeout handling."""
 
 import asyncio
+import hashlib
 import json
+import os
+import tempfile
+import time
 from contextlib import AsyncExitStack
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Literal
 
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
 
+from ..utils.token_utils import truncate_text_by_tokens
 from .base import Tool, ToolResult
 
 # Connection type aliases
 ConnectionType = Literal["stdio", "sse", "http", "streamable_http"]
 
+# Token budget for one MCP tool result (head and tail are kept)
+MAX_RESULT_TOKENS = 32000
+
+# Tool lists of the last successful connection to each server, keyed by a hash of its config
+MCP_TOOL_CACHE_DIR = Path.home() / ".mini-agent" / "mcp_cache"
+
+# Reconnect backoff after failed connects: base * 2^(failures - 1), capped (seconds)
+RECONNECT_BASE_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+
+# Error code of "Session terminated" responses from streamable HTTP servers (expired session)
+SESSION_TERMINATED = 32600
+
 
 @dataclass
 class MCPTimeoutConfig:
@@ -25,6 +46,8 @@ class MCPTimeoutConfig:
     connect_timeout: float = 10.0  # Connection timeout (seconds)
     execute_timeout: float = 60.0  # Tool execution timeout (seconds)
     sse_read_timeout: float = 120.0  # SSE read timeout (seconds)
+    startup_timeout: float = 30.0  # Deadline for connecting all servers at startup (seconds)
+    health_check_interval: float = 30.0  # Seconds between health pings of connected servers (0 = off)
 
 
 # Global default timeout config
@@ -35,6 +58,8 @@ def set_mcp_timeout_config(
     connect_timeout: float | None = None,
     execute_timeout: float | None = None,
     sse_read_timeout: float | None = None,
+    startup_timeout: float | None = None,
+    health_check_interval: float | None = None,
 ) -> None:
     """Set global MCP timeout configuration.
 
@@ -42,6 +67,8 @@ def set_mcp_timeout_config(
         connect_timeout: Connection timeout in seconds
         execute_timeout: Tool execution timeout in seconds
         sse_read_timeout: SSE read timeout in seconds
+        startup_timeout: Deadline for connecting all servers at startup in seconds
+        health_check_interval: Seconds between health pings of connected servers (0 disables)
     """
     global _default_timeout_config
     if connect_timeout is not None:
@@ -50,6 +77,10 @@ def set_mcp_timeout_config(
         _default_timeout_config.execute_timeout = execute_timeout
     if sse_read_timeout is not None:
         _default_timeout_config.sse_read_timeout = sse_read_timeout
+    if startup_timeout is not None:
+        _default_timeout_config.startup_timeout = startup_timeout
+    if health_check_interval is not None:
+        _default_timeout_config.health_check_interval = health_check_interval
 
 
 def get_mcp_timeout_config() -> MCPTimeoutConfig:
@@ -57,6 +88,36 @@ def get_mcp_timeout_config() -> MCPTimeoutConfig:
     return _default_timeout_config
 
 
+def _is_connection_error(error: BaseException) -> bool:
+    """Whether error means the session is gone (process exited, stream closed, HTTP session expired)."""
+    if isinstance(error, McpError):
+        return error.error.code in (CONNECTION_CLOSED, SESSION_TERMINATED)
+    return isinstance(error, (ConnectionError, anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream))
+
+
+@dataclass
+class MCPServerStats:
+    """Availability and latency counters of one MCP server."""
+
+    available: bool = False
+    connects: int = 0
+    reconnects: int = 0
+    connect_failures: int = 0
+    calls: int = 0
+    call_failures: int = 0
+    retries: int = 0
+    total_call_seconds: float = 0.0
+    last_connect_seconds: float | None = None
+    last_ping_ms: float | None = None
+    last_error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Counters plus the mean call latency in milliseconds."""
+        stats = asdict(self)
+        stats["mean_call_ms"] = self.total_call_seconds / self.calls * 1000 if self.calls else None
+        return stats
+
+
 class MCPTool(Tool):
     """Wrapper for MCP tools with timeout handling."""
 
@@ -65,14 +126,22 @@ class MCPTool(Tool):
         name: str,
         description: str,
         parameters: dict[str, Any],
-        session: ClientSession,
+        session: ClientSession | None = None,
         execute_timeout: float | None = None,
+        read_only: bool = False,
+        connection: "MCPServerConnection | None" = None,
+        idempotent: bool = False,
     ):
         self._name = name
         self._description = description
         self._parameters = parameters
         self._session = session
         self._execute_timeout = execute_timeout
+        self._read_only = read_only
+        # Calls go through the connection when given (it connects on first use in lazy mode)
+        self._connection = connection
+        # Calls of read-only or idempotent tools are retried once after a reconnect
+        self._retryable = read_only or idempotent
 
     @property
     def name(self) -> str:
@@ -86,14 +155,51 @@ class MCPTool(Tool):
     def parameters(self) -> dict[str, Any]:
         return self._parameters
 
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
     async def execute(self, **kwargs) -> ToolResult:
         """Execute MCP tool via the session with timeout protection."""
         timeout = self._execute_timeout or _default_timeout_config.execute_timeout
 
+        connection = None
+        started = time.perf_counter()
         try:
-            # Wrap call_tool with timeout
-            async with asyncio.timeout(timeout):
-                result = await self._session.call_tool(self._name, arguments=kwargs)
+            for attempt in range(2):
+                if self._connection is None:
+                    session = self._session
+                else:
+                    # Least-loaded member of the server's session pool
+                    connection = self._connection.pick()
+                    connection.in_flight += 1
+                    session = None
+                try:
+                    if connection is not None:
+                        session = await connection.get_session()
+                    # Wrap call_tool with timeout
+                    async with asyncio.timeout(timeout):
+                        result = await session.call_tool(self._name, arguments=kwargs)
+                    break
+                except Exception as e:
+                    # A failed (re)connect is not retried; the member is in backoff
+                    if connection is None or session is None or not _is_connection_error(e):
+                        raise
+                    await connection.mark_broken(session, e)
+                    if not self._retryable:
+                        raise ConnectionError(
+                            f"connection to '{connection.name}' was lost during the call ({e}); it may or may not have "
+                            "taken effect and was not retried because the tool is not marked idempotent"
+                        ) from e
+                    if attempt == 1:
+                        raise
+                    connection.stats.retries += 1
+                finally:
+                    if connection is not None:
+                        connection.in_flight -= 1
+
+            if connection is not None:
+                connection.record_call(time.perf_counter() - started, success=True)
 
             # MCP tool results are a list of content items
             content_parts = []
@@ -103,19 +209,23 @@ class MCPTool(Tool):
                 else:
                     content_parts.append(str(item))
 
-            content_str = "\n".join(content_parts)
+            content_str = truncate_text_by_tokens("\n".join(content_parts), MAX_RESULT_TOKENS)
 
             is_error = result.isError if hasattr(result, "isError") else False
 
             return ToolResult(success=not is_error, content=content_str, error=None if not is_error else "Tool returned error")
 
         except TimeoutError:
+            if connection is not None:
+                connection.record_call(time.perf_counter() - started, success=False)
             return ToolResult(
                 success=False,
                 content="",
                 error=f"MCP tool execution timed out after {timeout}s. The remote server may be slow or unresponsive.",
             )
         except Exception as e:
+            if connection is not None:
+                connection.record_call(time.perf_counter() - started, success=False)
             return ToolResult(success=False, content="", error=f"MCP tool execution failed: {str(e)}")
 
 
@@ -137,6 +247,11 @@ class MCPServerConnection:
         connect_timeout: float | None = None,
         execute_timeout: float | None = None,
         sse_read_timeout: float | None = None,
+        # Tool list cache (see MCP_TOOL_CACHE_DIR)
+        cache_key: str | None = None,
+        cache_dir: Path | None = None,
+        # Number of sessions (stdio processes / HTTP sessions) calls are spread over
+        pool_size: int = 1,
     ):
         self.name = name
         self.connection_type = connection_type
@@ -155,6 +270,45 @@ class MCPServerConnection:
         self.session: ClientSession | None = None
         self.exit_stack: AsyncExitStack | None = None
         self.tools: list[MCPTool] = []
+        self.connect_latency: float | None = None  # Seconds the last successful connect took
+        # The transport and session contexts are entered and exited by this task
+        # (anyio cancel scopes must be exited by the task that entered them)
+        self._lifecycle_task: asyncio.Task | None = None
+        self._ready: asyncio.Future | None = None
+        self._closing: asyncio.Event | None = None
+        self._connect_lock = asyncio.Lock()
+        # Tool list cache
+        self.cache_key = cache_key
+        self.cache_dir = cache_dir if cache_dir is not None else MCP_TOOL_CACHE_DIR
+        self._cached_specs: list[dict[str, Any]] | None = None
+        self._cache_write: asyncio.Future | None = None
+        self._cache_refresh: asyncio.Task | None = None
+        # Supervision: reconnect backoff, health pings and stats
+        self.stats = MCPServerStats()
+        self._failures = 0
+        self._retry_at = 0.0  # time.monotonic() before which no reconnect is attempted
+        self._supervisor: asyncio.Task | None = None
+        # Session pool: this connection plus pool_size - 1 members that connect when
+        # all connected sessions are busy; in_flight counts calls running on a session
+        self.in_flight = 0
+        self.pool: list[MCPServerConnection] = [self]
+        self.pool.extend(self._spawn() for _ in range(pool_size - 1))
+
+    def _spawn(self, **kwargs) -> "MCPServerConnection":
+        """A new, unconnected connection to the same server."""
+        return MCPServerConnection(
+            name=self.name,
+            connection_type=self.connection_type,
+            command=self.command,
+            args=self.args,
+            env=self.env,
+            url=self.url,
+            headers=self.headers,
+            connect_timeout=self.connect_timeout,
+            execute_timeout=self.execute_timeout,
+            sse_read_timeout=self.sse_read_timeout,
+            **kwargs,
+        )
 
     def _get_connect_timeout(self) -> float:
         """Get effective connect timeout."""
@@ -168,15 +322,248 @@ class MCPServerConnection:
         """Get effective execute timeout."""
         return self.execute_timeout or _default_timeout_config.execute_timeout
 
-    async def connect(self) -> bool:
-        """Connect to the MCP server with timeout protection."""
+    async def connect(self, verbose: bool = True) -> bool:
+        """Connect to the MCP server with timeout protection.
+
+        Args:
+            verbose: Print the connection result and tool list
+        """
         connect_timeout = self._get_connect_timeout()
+        started = time.perf_counter()
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._ready = ready
+        self._lifecycle_task = asyncio.create_task(self._run_session(ready), name=f"mcp-{self.name}")
 
         try:
-            self.exit_stack = AsyncExitStack()
-
             # Wrap connection with timeout
             async with asyncio.timeout(connect_timeout):
+                tools_list = await ready
+        except TimeoutError:
+            print(f"✗ Connection to MCP server '{self.name}' timed out after {connect_timeout}s")
+            self._record_connect_failure(f"connect timed out after {connect_timeout}s")
+            await self._stop_lifecycle()
+            return False
+        except asyncio.CancelledError:
+            await self._stop_lifecycle()
+            raise
+        except Exception as e:
+            print(f"✗ Failed to connect to MCP server '{self.name}': {e}")
+            self._record_connect_failure(str(e))
+            await self._stop_lifecycle()
+            return False
+        self.connect_latency = time.perf_counter() - started
+        self.stats.connects += 1
+        self.stats.available = True
+        self.stats.last_connect_seconds = self.connect_latency
+
+        specs = [_tool_spec(tool) for tool in tools_list.tools]
+        self.tools = self.tools_from_specs(specs)
+        if self.cache_key and specs != self._cached_specs:
+            # Refresh the on-disk tool list cache without delaying the caller
+            self._cached_specs = specs
+            self._cache_write = asyncio.get_running_loop().run_in_executor(
+                None, _save_cached_tools, self.cache_dir, self.cache_key, self.name, specs
+            )
+
+        if not verbose:
+            return True
+        conn_info = self.url if self.url else self.command
+        print(
+            f"✓ Connected to MCP server '{self.name}' ({self.connection_type}: {conn_info}) "
+            f"in {self.connect_latency:.2f}s - loaded {len(self.tools)} tools"
+        )
+        for tool in self.tools:
+            desc = tool.description[:60] if len(tool.description) > 60 else tool.description
+            print(f"  - {tool.name}: {desc}...")
+        return True
+
+    def tools_from_specs(self, specs: list[dict[str, Any]]) -> list[MCPTool]:
+        """Wrap tool specs (name, description, inputSchema, readOnlyHint) as tools calling through this connection."""
+        execute_timeout = self._get_execute_timeout()
+        return [
+            MCPTool(
+                name=spec["name"],
+                description=spec.get("description") or "",
+                parameters=spec.get("inputSchema") or {},
+                execute_timeout=execute_timeout,
+                read_only=bool(spec.get("readOnlyHint", False)),
+                connection=self,
+                idempotent=bool(spec.get("idempotentHint", False)),
+            )
+            for spec in specs
+        ]
+
+    def load_cached_tools(self) -> bool:
+        """Register tools from the tool list cache without connecting.
+
+        Returns:
+            True if the cache had an entry for this server config
+        """
+        if not self.cache_key:
+            return False
+        specs = _load_cached_tools(self.cache_dir, self.cache_key)
+        if specs is None:
+            return False
+        self._cached_specs = specs
+        self.tools = self.tools_from_specs(specs)
+        return True
+
+    async def refresh_tool_cache(self) -> bool:
+        """Update the cached tool list from the server through a throwaway session.
+
+        Lazy servers registered from the cache run this in the background
+        after startup, so tool list changes reach the cache (and the next
+        start) even if the server is never used in this session.
+
+        Returns:
+            True if the server was reached and the cache is up to date
+        """
+        probe = self._spawn(cache_key=self.cache_key, cache_dir=self.cache_dir)
+        probe._cached_specs = self._cached_specs
+        try:
+            if not await probe.connect(verbose=False):
+                return False
+            if probe._cache_write is not None:
+                await probe._cache_write
+            return True
+        finally:
+            await probe.disconnect()
+
+    def start_cache_refresh(self) -> None:
+        """Run refresh_tool_cache in the background (cancelled by disconnect)."""
+        if self._cache_refresh is None:
+            self._cache_refresh = asyncio.create_task(self.refresh_tool_cache(), name=f"mcp-cache-refresh-{self.name}")
+
+    def pick(self) -> "MCPServerConnection":
+        """The pool member to send the next call to.
+
+        Members in reconnect backoff come last, then by calls in flight;
+        connected members win ties, so new sessions only start when all
+        connected ones are busy.
+        """
+        now = time.monotonic()
+        return min(self.pool, key=lambda member: (member._retry_at > now, member.in_flight, member.session is None))
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Stats of all pool members combined (see MCPServerStats.as_dict)."""
+        if len(self.pool) == 1:
+            return {**self.stats.as_dict(), "pool_size": 1, "sessions": int(self.session is not None)}
+        members = [member.stats for member in self.pool]
+        combined = MCPServerStats(
+            available=any(stats.available for stats in members),
+            connects=sum(stats.connects for stats in members),
+            reconnects=sum(stats.reconnects for stats in members),
+            connect_failures=sum(stats.connect_failures for stats in members),
+            calls=sum(stats.calls for stats in members),
+            call_failures=sum(stats.call_failures for stats in members),
+            retries=sum(stats.retries for stats in members),
+            total_call_seconds=sum(stats.total_call_seconds for stats in members),
+            last_connect_seconds=self.stats.last_connect_seconds,
+            last_ping_ms=self.stats.last_ping_ms,
+            last_error=next((stats.last_error for stats in members if stats.last_error), None),
+        )
+        sessions = sum(member.session is not None for member in self.pool)
+        return {**combined.as_dict(), "pool_size": len(self.pool), "sessions": sessions}
+
+    def _record_connect_failure(self, error: str) -> None:
+        self.stats.connect_failures += 1
+        self.stats.available = False
+        self.stats.last_error = error
+
+    def record_call(self, seconds: float, success: bool) -> None:
+        """Count a tool call and its latency."""
+        self.stats.calls += 1
+        self.stats.total_call_seconds += seconds
+        if not success:
+            self.stats.call_failures += 1
+
+    async def get_session(self) -> ClientSession:
+        """Get the session, (re)connecting first if needed.
+
+        Used for the first call in lazy mode and after the session broke.
+        Failed connects back off exponentially; calls made during the
+        backoff fail immediately instead of waiting.
+
+        Raises:
+            ConnectionError: If the server cannot be connected
+        """
+        if self.session is not None:
+            return self.session
+        async with self._connect_lock:
+            if self.session is None:
+                wait = self._retry_at - time.monotonic()
+                if wait > 0:
+                    raise ConnectionError(
+                        f"MCP server '{self.name}' is unavailable ({self.stats.last_error}); next reconnect in {wait:.1f}s"
+                    )
+                reconnect = self.stats.connects > 0
+                await self._stop_lifecycle()
+                if not await self.connect(verbose=False):
+                    self._failures += 1
+                    delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** (self._failures - 1))
+                    self._retry_at = time.monotonic() + delay
+                    raise ConnectionError(f"MCP server '{self.name}' is not available ({self.stats.last_error})")
+                self._failures = 0
+                self._retry_at = 0.0
+                if reconnect:
+                    self.stats.reconnects += 1
+                    print(f"✓ Reconnected to MCP server '{self.name}' in {self.connect_latency:.2f}s")
+        return self.session
+
+    async def mark_broken(self, session: ClientSession | None, error: BaseException) -> None:
+        """Drop a session that failed with a connection error (the next call reconnects)."""
+        async with self._connect_lock:
+            if session is not None and self.session is not session:
+                return  # Already replaced by a reconnect
+            self.stats.available = False
+            self.stats.last_error = str(error) or type(error).__name__
+            await self._stop_lifecycle()
+            self.session = None
+
+    async def ping(self) -> bool:
+        """Send a health ping over the current session (a failure marks the session broken).
+
+        Returns:
+            True if the server answered
+        """
+        session = self.session
+        if session is None:
+            return False
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self._get_connect_timeout()):
+                await session.send_ping()
+        except Exception as e:
+            await self.mark_broken(session, e if str(e) else TimeoutError("health ping timed out"))
+            return False
+        self.stats.last_ping_ms = (time.perf_counter() - started) * 1000
+        self.stats.available = True
+        return True
+
+    def start_supervisor(self, interval: float) -> None:
+        """Ping the server every interval seconds and reconnect a broken session in the background."""
+        if interval > 0 and self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise(interval), name=f"mcp-supervisor-{self.name}")
+
+    async def _supervise(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            for member in self.pool:
+                if member.session is not None:
+                    await member.ping()
+                elif member.stats.connects > 0:
+                    # Sessions that never connected (lazy mode, idle pool members) are left alone
+                    try:
+                        await member.get_session()
+                    except ConnectionError:
+                        pass
+
+    async def _run_session(self, ready: asyncio.Future) -> None:
+        """Open the transport and session, report the tool list through ready, and hold them until disconnect."""
+        try:
+            async with AsyncExitStack() as exit_stack:
+                self.exit_stack = exit_stack
                 if self.connection_type == "stdio":
                     read_stream, write_stream = await self._connect_stdio()
                 elif self.connection_type == "sse":
@@ -185,51 +572,47 @@ class MCPServerConnection:
                     read_stream, write_stream = await self._connect_streamable_http()
 
                 # Enter client session context
-                session = await self.exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
-                self.session = session
+                session = await exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
 
-                # Initialize the session
+                # Initialize the session and list available tools
                 await session.initialize()
-
-                # List available tools
                 tools_list = await session.list_tools()
+                self.session = session
+                if not ready.done():
+                    ready.set_result(tools_list)
+                await self._closing.wait()
+        except BaseException as e:
+            # Transports may raise CancelledError from their own cancel scopes;
+            # only a cancellation of this task itself is propagated
+            if not ready.done():
+                ready.set_exception(e if isinstance(e, Exception) else ConnectionError(f"connection closed: {e!r}"))
+            if isinstance(e, asyncio.CancelledError) and asyncio.current_task().cancelling():
+                raise
+        finally:
+            self.session = None
+            self.exit_stack = None
 
-            # Wrap each tool with execute timeout
-            execute_timeout = self._get_execute_timeout()
-            for tool in tools_list.tools:
-                parameters = tool.inputSchema if hasattr(tool, "inputSchema") else {}
-                mcp_tool = MCPTool(
-                    name=tool.name,
-                    description=tool.description or "",
-                    parameters=parameters,
-                    session=session,
-                    execute_timeout=execute_timeout,
-                )
-                self.tools.append(mcp_tool)
-
-            conn_info = self.url if self.url else self.command
-            print(f"✓ Connected to MCP server '{self.name}' ({self.connection_type}: {conn_info}) - loaded {len(self.tools)} tools")
-            for tool in self.tools:
-                desc = tool.description[:60] if len(tool.description) > 60 else tool.description
-                print(f"  - {tool.name}: {desc}...")
-            return True
-
-        except TimeoutError:
-            print(f"✗ Connection to MCP server '{self.name}' timed out after {connect_timeout}s")
-            if self.exit_stack:
-                await self.exit_stack.aclose()
-                self.exit_stack = None
-            return False
-
-        except Exception as e:
-            print(f"✗ Failed to connect to MCP server '{self.name}': {e}")
-            if self.exit_stack:
-                await self.exit_stack.aclose()
-                self.exit_stack = None
-            import traceback
-
-            traceback.print_exc()
-            return False
+    async def _stop_lifecycle(self) -> None:
+        """Close the session contexts (in their own task) and wait for the task to finish."""
+        task = self._lifecycle_task
+        if task is None:
+            return
+        self._lifecycle_task = None
+        if self._closing is not None:
+            self._closing.set()
+        try:
+            # A connected session gets a moment to close cleanly; a pending connect is cancelled
+            connected = self._ready is not None and self._ready.done() and not self._ready.cancelled()
+            done, _ = await asyncio.wait([task], timeout=5.0 if connected else 0)
+            if not done:
+                task.cancel()
+                await asyncio.wait([task])
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            if task.done() and not task.cancelled():
+                task.exception()  # Retrieved so it is not reported as unhandled
 
     async def _connect_stdio(self):
         """Connect via STDIO transport."""
@@ -268,10 +651,64 @@ class MCPServerConnection:
 
     async def disconnect(self):
         """Properly disconnect from the MCP server."""
-        if self.exit_stack:
-            await self.exit_stack.aclose()
-            self.exit_stack = None
-            self.session = None
+        if self._cache_refresh is not None:
+            self._cache_refresh.cancel()
+            await asyncio.gather(self._cache_refresh, return_exceptions=True)
+            self._cache_refresh = None
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+        if len(self.pool) > 1:
+            await asyncio.gather(*(member.disconnect() for member in self.pool[1:]), return_exceptions=True)
+        await self._stop_lifecycle()
+        self.session = None
+        self.stats.available = False
+
+
+def _tool_spec(tool: Any) -> dict[str, Any]:
+    """JSON-serializable description of an MCP tool (what MCPTool needs)."""
+    # Servers may annotate side-effect free tools with readOnlyHint
+    annotations = getattr(tool, "annotations", None)
+    return {
+        "name": tool.name,
+        "description": tool.description or "",
+        "inputSchema": tool.inputSchema if hasattr(tool, "inputSchema") else {},
+        "readOnlyHint": bool(getattr(annotations, "readOnlyHint", False)),
+        "idempotentHint": bool(getattr(annotations, "idempotentHint", False)),
+    }
+
+
+def _server_cache_key(server_name: str, server_config: dict) -> str:
+    """Hash of a server's name and config; any config change invalidates its cached tool list."""
+    canonical = json.dumps({"name": server_name, "config": server_config}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def _load_cached_tools(cache_dir: Path, key: str) -> list[dict[str, Any]] | None:
+    """Cached tool specs for a cache key, or None if missing or unreadable."""
+    try:
+        with open(cache_dir / f"{key}.json", encoding="utf-8") as f:
+            tools = json.load(f)["tools"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return tools if isinstance(tools, list) else None
+
+
+def _save_cached_tools(cache_dir: Path, key: str, server_name: str, specs: list[dict[str, Any]]) -> None:
+    """Write tool specs to the cache atomically (failures only cost a connect on the next start)."""
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"server": server_name, "updated_at": time.time(), "tools": specs}, f)
+            os.replace(tmp_path, cache_dir / f"{key}.json")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"⚠ Could not write MCP tool cache for '{server_name}': {e}")
 
 
 # Global connections registry
@@ -320,15 +757,20 @@ def _resolve_mcp_config_path(config_path: str) -> Path | None:
     return None
 
 
-async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
+async def load_mcp_tools_async(
+    config_path: str = "mcp.json",
+    startup_timeout: float | None = None,
+    lazy: bool = False,
+    cache_dir: Path | None = None,
+) -> list[Tool]:
     """
     Load MCP tools from config file.
 
     This function:
     1. Reads the MCP config file (with fallback to mcp-example.json)
-    2. Connects to each server (STDIO or URL-based)
+    2. Connects to all servers (STDIO or URL-based) concurrently
     3. Fetches tool definitions
-    4. Wraps them as Tool objects
+    4. Wraps them as Tool objects, in config file order
 
     Supported config formats:
     - STDIO: {"command": "...", "args": [...], "env": {...}}
@@ -338,13 +780,25 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
     - "connect_timeout": float - Connection timeout in seconds
     - "execute_timeout": float - Tool execution timeout in seconds
     - "sse_read_timeout": float - SSE read timeout in seconds
+    - "lazy": bool - Override the lazy argument for this server
+    - "pool_size": int - Sessions (stdio processes / HTTP sessions) to spread concurrent calls over (default: 1)
+
+    Lazy mode: servers whose tool list is in the cache (written after every
+    successful connect) are registered from it without starting them; they
+    connect on the first tool call. Their cache entry is refreshed in the
+    background after startup, so tool list changes show up on the next
+    start. Servers without a cache entry connect at startup as usual.
 
     Note:
     - If mcp.json is not found, will automatically fallback to mcp-example.json
     - User-specific mcp.json should be created by copying mcp-example.json
+    - Servers still connecting when startup_timeout expires are skipped
 
     Args:
         config_path: Path to MCP configuration file (default: "mcp.json")
+        startup_timeout: Deadline for connecting all servers in seconds (default: global config)
+        lazy: Register servers from the tool list cache and connect on first use
+        cache_dir: Tool list cache directory (default: MCP_TOOL_CACHE_DIR)
 
     Returns:
         List of Tool objects representing MCP tools
@@ -368,8 +822,9 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
             return []
 
         all_tools = []
+        connections: list[MCPServerConnection] = []
 
-        # Connect to each enabled server
+        # Collect enabled servers
         for server_name, server_config in mcp_servers.items():
             if server_config.get("disabled", False):
                 print(f"Skipping disabled server: {server_name}")
@@ -399,14 +854,58 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
                 connect_timeout=server_config.get("connect_timeout"),
                 execute_timeout=server_config.get("execute_timeout"),
                 sse_read_timeout=server_config.get("sse_read_timeout"),
+                cache_key=_server_cache_key(server_name, server_config),
+                cache_dir=cache_dir,
+                pool_size=max(1, int(server_config.get("pool_size", 1))),
             )
-            success = await connection.connect()
-
-            if success:
+            connections.append(connection)
+
+        # Lazy servers with a cached tool list are registered without connecting
+        cached = set()
+        for connection in connections:
+            if mcp_servers[connection.name].get("lazy", lazy) and connection.load_cached_tools():
+                cached.add(connection.name)
+                print(f"✓ Registered MCP server '{connection.name}' from cache - {len(connection.tools)} tools (connects on first use)")
+
+        # Connect the others concurrently; each has its own connect timeout, startup has a global deadline
+        deadline = startup_timeout or _default_timeout_config.startup_timeout
+        started = time.perf_counter()
+        pending = [connection for connection in connections if connection.name not in cached]
+        tasks = {connection.name: asyncio.create_task(connection.connect()) for connection in pending}
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=deadline)
+        for connection in pending:
+            if not tasks[connection.name].done():
+                print(f"✗ MCP server '{connection.name}' did not connect within the {deadline}s startup deadline")
+                tasks[connection.name].cancel()
+        if tasks:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        # Register tools in config file order
+        latencies = []
+        for connection in connections:
+            task = tasks.get(connection.name)
+            if task is None:
                 _mcp_connections.append(connection)
                 all_tools.extend(connection.tools)
+                latencies.append(f"{connection.name}: cached")
+                continue
+            if task.cancelled() or task.exception() is not None or not task.result():
+                latencies.append(f"{connection.name}: failed")
+                continue
+            _mcp_connections.append(connection)
+            all_tools.extend(connection.tools)
+            latencies.append(f"{connection.name}: {connection.connect_latency:.2f}s")
+
+        health_check_interval = _default_timeout_config.health_check_interval
+        for connection in _mcp_connections:
+            connection.start_supervisor(health_check_interval)
+            if connection.name in cached:
+                connection.start_cache_refresh()
 
         print(f"\nTotal MCP tools loaded: {len(all_tools)}")
+        if latencies:
+            print(f"MCP startup took {time.perf_counter() - started:.2f}s ({', '.join(latencies)})")
 
         return all_tools
 
@@ -421,6 +920,10 @@ async def load_mcp_tools_async(config_path: str = "mcp.json") -> list[Tool]:
 async def cleanup_mcp_connections():
     """Clean up all MCP connections."""
     global _mcp_connections
-    for connection in _mcp_connections:
-        await connection.disconnect()
+    await asyncio.gather(*(connection.disconnect() for connection in _mcp_connections), return_exceptions=True)
     _mcp_connections.clear()
+
+
+def get_mcp_server_stats() -> dict[str, dict[str, Any]]:
+    """Availability, reconnect and latency stats of the loaded MCP servers, by server name."""
+    return {connection.name: connection.pool_stats() for connection in _mcp_connections}
@@ -6,6 +6,7 @@ This tool allows the agent to:
 - Maintain context across agent execution chains
 """
 
+import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
@@ -148,6 +149,10 @@ class RecallNoteTool(Tool):
             "from earlier in the session or previous agent execution chains."
         )
 
+    @property
+    def read_only(self) -> bool:
+        return True
+
     @property
     def parameters(self) -> dict[str, Any]:
         return {
@@ -169,6 +174,9 @@ class RecallNoteTool(Tool):
         Returns:
             ToolResult with notes content
         """
+        return await asyncio.to_thread(self._recall, category)
+
+    def _recall(self, category: str | None) -> ToolResult:
         try:
             if not self.memory_file.exists():
                 return ToolResult(
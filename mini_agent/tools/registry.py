@@ -0,0 +1,78 @@
+"""Versioned tool registry with cached provider schemas."""
+
+from collections.abc import Iterable, Iterator, MutableMapping
+from typing import Any
+
+from .base import Tool
+
+
+class ToolRegistry(MutableMapping[str, Tool]):
+    """Name -> Tool mapping that caches provider-specific schema lists.
+
+    Behaves like the plain ``dict`` previously used for ``Agent.tools``. Every
+    add or remove bumps ``version``, which invalidates the cached schema lists;
+    as long as the tool set is unchanged, ``to_schemas()`` and
+    ``to_openai_schemas()`` return the same list without rebuilding any dicts.
+
+    The returned lists are shared and must be treated as read-only.
+    """
+
+    def __init__(self, tools: Iterable[Tool] = ()):
+        """Initialize registry.
+
+        Args:
+            tools: Initial tools (later tools replace earlier ones with the same name)
+        """
+        self._tools: dict[str, Tool] = {tool.name: tool for tool in tools}
+        self.version = 0
+        # format -> (version, schema list)
+        self._schema_cache: dict[str, tuple[int, list[dict[str, Any]]]] = {}
+
+    def __getitem__(self, name: str) -> Tool:
+        return self._tools[name]
+
+    def __setitem__(self, name: str, tool: Tool) -> None:
+        self._tools[name] = tool
+        self.version += 1
+
+    def __delitem__(self, name: str) -> None:
+        del self._tools[name]
+        self.version += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tools)
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def __repr__(self) -> str:
+        return f"ToolRegistry(version={self.version}, tools={list(self._tools)})"
+
+    def add(self, tool: Tool) -> None:
+        """Register a tool (replacing any tool with the same name)."""
+        self[tool.name] = tool
+
+    def remove(self, name: str) -> Tool | None:
+        """Unregister a tool by name.
+
+        Returns:
+            The removed tool, or None if no tool had that name
+        """
+        return self.pop(name, None)
+
+    def to_schemas(self) -> list[dict[str, Any]]:
+        """Get Anthropic tool schemas for all tools (cached until tools change)."""
+        return self._cached_schemas("anthropic", lambda tool: tool.to_schema())
+
+    def to_openai_schemas(self) -> list[dict[str, Any]]:
+        """Get OpenAI tool schemas for all tools (cached until tools change)."""
+        return self._cached_schemas("openai", lambda tool: tool.to_openai_schema())
+
+    def _cached_schemas(self, schema_format: str, convert) -> list[dict[str, Any]]:
+        cached = self._schema_cache.get(schema_format)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        schemas = [convert(tool) for tool in self._tools.values()]
+        self._schema_cache[schema_format] = (self.version, schemas)
+        return schemas
@@ -0,0 +1,783 @@
+"""Incrementally maintained file list and trigram index of a workspace.
+
+GrepTool and GlobTool search through a ``WorkspaceIndex`` instead of walking
+the tree on every call:
+
+- The file list is refreshed incrementally: a refresh stats directories
+  only. Files are stat'ed (and re-indexed if their (mtime_ns, size) changed)
+  when their directory's mtime changed, when the file tools wrote them, and
+  in a full rescan every ``full_scan_interval`` (for in-place edits by other
+  programs, which leave directory mtimes alone). Search candidates are also
+  re-indexed when the opened file's (mtime_ns, size) changed. Refreshes are
+  throttled to one per ``refresh_interval``, except after
+  ``mark_indexes_stale`` (file tool writes and bash commands).
+- Paths ignored by ``.gitignore`` files (and ``.git`` itself) are skipped.
+- Each text file gets a trigram signature: a bitset with one hashed bit per
+  distinct (ASCII-lowercased) byte trigram of its content. A regex search only
+  opens files whose signature has the bits of every trigram in the literals
+  the pattern requires, so repeated searches read a small fraction of the
+  tree. Signatures are built lazily by the first search, in the same pass
+  that searches the file, on worker threads.
+- Shared indexes persist their file list and signatures under
+  ``~/.mini-agent/search_index/`` (``save_workspace_indexes`` at shutdown).
+  The next process reuses a saved signature when the file's (mtime_ns, size)
+  is unchanged at its first scan, so it does not rebuild it by reading the
+  file again.
+"""
+
+import bisect
+import hashlib
+import marshal
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+# Files larger than this get no trigram signature (they are always searched)
+MAX_SIGNATURE_FILE_BYTES = 1 << 20
+
+# Files larger than this are skipped by content search
+MAX_SEARCH_FILE_BYTES = 16 << 20
+
+# Signature widths in bits (about two bits per distinct trigram, within these bounds)
+MIN_SIGNATURE_BITS = 256
+MAX_SIGNATURE_BITS = 16384
+
+# Files searched per batch of worker-thread tasks
+SEARCH_BATCH_SIZE = 64
+
+# Seconds between refreshes that stat every file
+FULL_SCAN_INTERVAL = 30.0
+
+# Saved file lists and signatures of shared indexes, keyed by a hash of the workspace root
+SEARCH_INDEX_CACHE_DIR = Path.home() / ".mini-agent" / "search_index"
+
+# Bump when the saved format or the signature layout changes
+INDEX_CACHE_VERSION = 1
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="mini-agent-search")
+        return _executor
+
+
+def glob_to_regex(pattern: str, braces: bool = False) -> str:
+    """Translate a glob to a regex matching "/"-separated relative paths.
+
+    Supports ``*`` and ``?`` (within one path component), ``[...]``,
+    ``**`` (any number of directories) and, with braces, ``{a,b}``.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1 : i + 2] in ("!", "^", "]") else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body[:1] == "!":
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+                continue
+        elif c == "{" and braces and "}" in pattern[i:]:
+            end = pattern.index("}", i)
+            alternatives = pattern[i + 1 : end].split(",")
+            out.append("(?:" + "|".join(glob_to_regex(alt, braces) for alt in alternatives) + ")")
+            i = end + 1
+            continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+@lru_cache(maxsize=128)
+def compile_glob(pattern: str) -> re.Pattern:
+    """Compiled glob_to_regex(pattern, braces=True), for fullmatch against relative paths."""
+    return re.compile(glob_to_regex(pattern, braces=True), re.S)
+
+
+@dataclass
+class IgnoreRule:
+    """One pattern line of a .gitignore file."""
+
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+
+def parse_gitignore(text: str) -> list[IgnoreRule]:
+    """Parse .gitignore content into rules matching paths relative to its directory."""
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # Patterns with a slash are relative to the .gitignore directory, others match at any depth
+        anchored = "/" in line
+        body = glob_to_regex(line.lstrip("/"))
+        rules.append(IgnoreRule(re.compile(body if anchored else f"(?:.*/)?{body}", re.S), negate, dir_only))
+    return rules
+
+
+# .gitignore rule sets that apply in a directory: (directory relative to the root, rules), outermost first
+IgnoreChain = tuple[tuple[str, list[IgnoreRule]], ...]
+
+
+def is_ignored(chain: IgnoreChain, path: str, is_dir: bool) -> bool:
+    """Whether path (relative to the index root) is ignored; the last matching rule wins."""
+    ignored = False
+    for base, rules in chain:
+        relative = path[len(base) + 1 :] if base else path
+        for rule in rules:
+            if (is_dir or not rule.dir_only) and rule.regex.fullmatch(relative):
+                ignored = not rule.negate
+    return ignored
+
+
+def required_literals(pattern: str) -> list[str]:
+    """Literal strings that every match of a regex must contain.
+
+    Conservative: groups, character classes and optional characters are
+    skipped, and patterns with top-level alternation yield nothing.
+    """
+    try:
+        if re.compile(pattern).flags & re.VERBOSE:
+            return []
+    except re.error:
+        return []
+
+    literals: list[str] = []
+    current: list[str] = []
+
+    def flush() -> None:
+        if current:
+            literals.append("".join(current))
+            current.clear()
+
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "|":
+            return []
+        if c == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            i += 2
+            if escaped in ("n", "t"):
+                char = "\n" if escaped == "n" else "\t"
+            elif escaped and escaped in "xuUN0123456789":
+                # Numeric escapes and back references span several characters
+                return []
+            elif escaped and not escaped.isalnum():
+                char = escaped
+            else:
+                # Character classes (\d, \w, ...), anchors and back references
+                flush()
+                continue
+        elif c in "([":
+            flush()
+            i = _skip_group(pattern, i) if c == "(" else _skip_class(pattern, i)
+            continue
+        elif c in ".^$":
+            flush()
+            i += 1
+            continue
+        elif c in "*+?{":
+            # Quantifier of a group or class, or a lazy/possessive suffix
+            flush()
+            i = _skip_quantifier(pattern, i)
+            continue
+        else:
+            char = c
+            i += 1
+
+        quantifier = pattern[i : i + 1]
+        if quantifier in ("*", "?", "{"):
+            # The character may be absent
+            flush()
+            i = _skip_quantifier(pattern, i)
+        elif quantifier == "+":
+            current.append(char)
+            flush()
+            i += 1
+        else:
+            current.append(char)
+    flush()
+    return literals
+
+
+def _skip_quantifier(pattern: str, i: int) -> int:
+    if pattern[i] == "{":
+        end = pattern.find("}", i)
+        return end + 1 if end != -1 else i + 1
+    return i + 1
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    i += 1
+    if pattern[i : i + 1] == "^":
+        i += 1
+    if pattern[i : i + 1] == "]":
+        i += 1
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_group(pattern: str, i: int) -> int:
+    depth = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            i = _skip_class(pattern, i)
+            continue
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _trigrams(data: bytes) -> set[tuple[int, int, int]]:
+    return set(zip(data, data[1:], data[2:]))
+
+
+def query_trigrams(pattern: str, ignore_case: bool = False) -> set[tuple[int, int, int]]:
+    """Lowercased byte trigrams that every file matching pattern contains."""
+    trigrams = set()
+    for literal in required_literals(pattern):
+        data = literal.encode("utf-8").lower()
+        for i in range(len(data) - 2):
+            trigram = data[i : i + 3]
+            # Case-insensitive Unicode matching also maps non-ASCII characters
+            # to "k" and "s" (KELVIN SIGN, LONG S), which the index cannot see
+            if ignore_case and (not trigram.isascii() or b"k" in trigram or b"s" in trigram):
+                continue
+            trigrams.update(_trigrams(trigram))
+    return trigrams
+
+
+def _signature_mask(trigrams: set[tuple[int, int, int]], width: int) -> int:
+    mask = 0
+    for trigram in trigrams:
+        mask |= 1 << (hash(trigram) & (width - 1))
+    return mask
+
+
+@dataclass(eq=False)
+class IndexedFile:
+    """A file of the index."""
+
+    path: str  # relative to the index root, "/"-separated
+    mtime_ns: int
+    size: int
+    indexed: bool = False  # signature and binary flag are up to date
+    binary: bool = False
+    signature: int = 0
+    width: int = 0  # signature width in bits (0: no signature, always searched)
+
+    def index(self, data: bytes) -> None:
+        """Compute the binary flag and trigram signature from the file content."""
+        self.binary = b"\0" in data[:8192]
+        self.signature = self.width = 0
+        if not self.binary and len(data) <= MAX_SIGNATURE_FILE_BYTES:
+            trigrams = _trigrams(data.lower())
+            width = MIN_SIGNATURE_BITS
+            while width < 2 * len(trigrams) and width < MAX_SIGNATURE_BITS:
+                width *= 2
+            bitmap = bytearray(width // 8)
+            for bit in {hash(trigram) & (width - 1) for trigram in trigrams}:
+                bitmap[bit >> 3] |= 1 << (bit & 7)
+            self.signature = int.from_bytes(bitmap, "little")
+            self.width = width
+        self.indexed = True
+
+
+@dataclass
+class GrepMatch:
+    """Matching lines of one file."""
+
+    path: str
+    count: int
+    lines: list[tuple[int, str]] = field(default_factory=list)  # (1-indexed line number, line)
+
+
+@dataclass
+class _DirState:
+    mtime_ns: int
+    gitignore_mtime_ns: int | None
+    parent_chain: IgnoreChain
+    chain: IgnoreChain
+    subdirs: list[str]
+    files: list[str]
+
+
+class WorkspaceIndex:
+    """File list and trigram signatures of a directory tree."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        refresh_interval: float = 1.0,
+        full_scan_interval: float = FULL_SCAN_INTERVAL,
+        cache_dir: Path | None = None,
+    ):
+        """Initialize index (nothing is scanned until the first refresh).
+
+        Args:
+            root: Directory to index
+            refresh_interval: Minimum seconds between two refreshes of the file list
+            full_scan_interval: Seconds between refreshes that stat every file, not just directories
+            cache_dir: Directory to load saved signatures from and save() them to (None: not persisted)
+        """
+        self.root = Path(root).absolute()
+        self.refresh_interval = refresh_interval
+        self.full_scan_interval = full_scan_interval
+        self.cache_dir = cache_dir
+        self._scanned = False  # The first scan restores saved signatures
+        self._unsaved = False  # Signatures built or files changed since the last load or save
+        self._dirs: dict[str, _DirState] = {}
+        self._files: dict[str, IndexedFile] = {}
+        self._sorted: list[IndexedFile] = []
+        self._refreshed_at: float | None = None
+        self._full_scan_at: float | None = None
+        self._dirty: set[str] = set()  # Relative paths to stat on the next refresh
+        self._lock = threading.RLock()
+
+    def refresh(self, force: bool = False) -> None:
+        """Bring the file list up to date (at most once per refresh_interval unless forced; forced refreshes are full)."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+                return
+            full = force or self._full_scan_at is None or now - self._full_scan_at >= self.full_scan_interval
+            self._scan(full)
+            self._refreshed_at = time.monotonic()
+            if full:
+                self._full_scan_at = self._refreshed_at
+
+    def mark_stale(self, path: str | Path | None = None) -> None:
+        """Refresh on the next search regardless of refresh_interval.
+
+        Args:
+            path: File that changed (it is stat'ed again); None to just re-check directory mtimes
+        """
+        with self._lock:
+            if path is not None:
+                self._dirty.add(Path(os.path.relpath(path, self.root)).as_posix())
+            self._refreshed_at = None
+
+    def save(self) -> bool:
+        """Save the file list and signatures to cache_dir (if anything changed since loading).
+
+        Returns:
+            True if the index was written
+        """
+        with self._lock:
+            if self.cache_dir is None or not self._unsaved:
+                return False
+            files = [
+                (entry.path, entry.mtime_ns, entry.size, entry.binary, entry.width, entry.signature.to_bytes(entry.width // 8, "little"))
+                for entry in self._sorted
+                if entry.indexed
+            ]
+            self._unsaved = False
+        data = {"version": INDEX_CACHE_VERSION, "hash": _hash_check(), "root": str(self.root), "files": files}
+        key = _index_cache_key(self.root)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    marshal.dump(data, f)
+                os.replace(tmp_path, self.cache_dir / f"{key}.idx")
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # Only costs rebuilding the signatures in the next process
+            return False
+        return True
+
+    def _load(self) -> dict[str, tuple]:
+        """Saved entries by path, or {} if there are none or they belong to another format or Python."""
+        if self.cache_dir is None:
+            return {}
+        try:
+            with open(self.cache_dir / f"{_index_cache_key(self.root)}.idx", "rb") as f:
+                data = marshal.load(f)
+            if (data["version"], data["hash"], data["root"]) != (INDEX_CACHE_VERSION, _hash_check(), str(self.root)):
+                return {}
+            return {record[0]: record for record in data["files"]}
+        except (OSError, EOFError, ValueError, TypeError, KeyError, IndexError):
+            return {}
+
+    def _scan(self, full: bool) -> None:
+        first = not self._scanned
+        saved = self._load() if first else {}
+        self._scanned = True
+        restored = 0
+        dirty, self._dirty = self._dirty, set()
+        dirs: dict[str, _DirState] = {}
+        files: dict[str, IndexedFile] = {}
+        listed = False
+        stack: list[tuple[str, IgnoreChain]] = [("", ())]
+        while stack:
+            rel_dir, chain = stack.pop()
+            abs_dir = os.path.join(self.root, rel_dir)
+            try:
+                mtime_ns = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+
+            state = self._dirs.get(rel_dir)
+            gitignore = f"{rel_dir}/.gitignore" if rel_dir else ".gitignore"
+            unchanged = (
+                state is not None
+                and state.mtime_ns == mtime_ns
+                and state.parent_chain is chain
+                and not full
+                and gitignore not in dirty
+            )
+            if not unchanged:
+                # Edits of an existing .gitignore leave the directory mtime alone
+                try:
+                    gitignore_mtime_ns = os.stat(os.path.join(abs_dir, ".gitignore")).st_mtime_ns
+                except OSError:
+                    gitignore_mtime_ns = None
+                if (
+                    state is None
+                    or state.mtime_ns != mtime_ns
+                    or state.gitignore_mtime_ns != gitignore_mtime_ns
+                    or state.parent_chain is not chain
+                ):
+                    state = self._list_dir(rel_dir, abs_dir, mtime_ns, gitignore_mtime_ns, chain)
+                    listed = True
+            dirs[rel_dir] = state
+
+            for name in state.files:
+                path = f"{rel_dir}/{name}" if rel_dir else name
+                entry = self._files.get(path)
+                if unchanged and entry is not None and path not in dirty:
+                    # Same directory listing: the file was not replaced, created or removed
+                    files[path] = entry
+                    continue
+                try:
+                    stat = os.stat(os.path.join(abs_dir, name))
+                except OSError:
+                    continue
+                if entry is None:
+                    entry = IndexedFile(path, stat.st_mtime_ns, stat.st_size)
+                    record = saved.get(path)
+                    if record is not None and record[1:3] == (stat.st_mtime_ns, stat.st_size):
+                        entry.binary, entry.width = record[3], record[4]
+                        entry.signature = int.from_bytes(record[5], "little")
+                        entry.indexed = True
+                        restored += 1
+                elif (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                    # Updated in place, so the sorted list stays valid
+                    entry.mtime_ns, entry.size, entry.indexed = stat.st_mtime_ns, stat.st_size, False
+                    self._unsaved = True
+                files[path] = entry
+            for name in state.subdirs:
+                stack.append((f"{rel_dir}/{name}" if rel_dir else name, state.chain))
+
+        if listed or len(files) != len(self._files):
+            self._sorted = sorted(files.values(), key=lambda entry: entry.path)
+            # Files were added or removed; on the first scan only if saved files are gone or changed
+            self._unsaved = self._unsaved or not first or restored != len(saved)
+        self._dirs = dirs
+        self._files = files
+
+    def _list_dir(
+        self, rel_dir: str, abs_dir: str, mtime_ns: int, gitignore_mtime_ns: int | None, parent_chain: IgnoreChain
+    ) -> _DirState:
+        chain = parent_chain
+        if gitignore_mtime_ns is not None:
+            try:
+                with open(os.path.join(abs_dir, ".gitignore"), encoding="utf-8", errors="replace") as f:
+                    rules = parse_gitignore(f.read())
+            except OSError:
+                rules = []
+            if rules:
+                chain = parent_chain + ((rel_dir, rules),)
+
+        subdirs, files = [], []
+        try:
+            with os.scandir(abs_dir) as entries:
+                for entry in entries:
+                    if entry.name == ".git":
+                        continue
+                    path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        # Symlinked directories are not followed (they may form cycles)
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if not is_dir and not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    if is_ignored(chain, path, is_dir):
+                        continue
+                    (subdirs if is_dir else files).append(entry.name)
+        except OSError:
+            pass
+        return _DirState(mtime_ns, gitignore_mtime_ns, parent_chain, chain, subdirs, files)
+
+    def files(self, prefix: str = "") -> list[IndexedFile]:
+        """Indexed files under prefix (a relative directory or file path), sorted by path."""
+        self.refresh()
+        with self._lock:
+            if not prefix:
+                return list(self._sorted)
+            if prefix in self._files:
+                return [self._files[prefix]]
+            # Paths under prefix/ are contiguous in the sorted list ("0" follows "/")
+            key = _path_key
+            start = bisect.bisect_left(self._sorted, prefix + "/", key=key)
+            end = bisect.bisect_left(self._sorted, prefix + "0", lo=start, key=key)
+            return self._sorted[start:end]
+
+    def glob(self, pattern: str, prefix: str = "") -> list[IndexedFile]:
+        """Files under prefix whose path relative to prefix matches a glob."""
+        regex = compile_glob(pattern)
+        skip = len(prefix) + 1 if prefix else 0
+        # Leading components without wildcards narrow the range of candidate paths
+        literal = []
+        for part in pattern.split("/")[:-1]:
+            if any(c in part for c in "*?[{\\"):
+                break
+            literal.append(part)
+        base = "/".join(([prefix] if prefix else []) + literal)
+        return [entry for entry in self.files(base) if regex.fullmatch(entry.path[skip:])]
+
+    def grep(
+        self,
+        regex: re.Pattern,
+        prefix: str = "",
+        include: str | None = None,
+        max_lines: int | None = None,
+        max_files: int | None = None,
+        first_only: bool = False,
+    ) -> list[GrepMatch]:
+        """Search file contents line by line.
+
+        Args:
+            regex: Compiled pattern (compile with re.MULTILINE for per-line ^ and $)
+            prefix: Relative directory or file to search
+            include: Glob on file paths relative to prefix; without "/" it matches file names
+            max_lines: Stop after collecting this many matching lines
+            max_files: Stop after this many matching files
+            first_only: Only find the first matching line of each file
+
+        Returns:
+            Matching files in path order (count is the number of matching lines)
+        """
+        with self._lock:
+            return self._grep(regex, prefix, include, max_lines, max_files, first_only)
+
+    def _grep(
+        self,
+        regex: re.Pattern,
+        prefix: str,
+        include: str | None,
+        max_lines: int | None,
+        max_files: int | None,
+        first_only: bool,
+    ) -> list[GrepMatch]:
+        # Runs under the lock, so refreshes cannot update entries while workers index them
+        entries = self.files(prefix)
+        if include:
+            include_regex = compile_glob(include)
+            skip = len(prefix) + 1 if prefix else 0
+            if "/" in include:
+                entries = [entry for entry in entries if include_regex.fullmatch(entry.path[skip:])]
+            else:
+                entries = [entry for entry in entries if include_regex.fullmatch(entry.path.rsplit("/", 1)[-1])]
+
+        trigrams = query_trigrams(regex.pattern, bool(regex.flags & re.IGNORECASE)) if isinstance(regex.pattern, str) else set()
+        # Signature bits every candidate must have, per signature width (width 0: no signature)
+        masks = {0: 0}
+        width = MIN_SIGNATURE_BITS
+        while width <= MAX_SIGNATURE_BITS:
+            masks[width] = _signature_mask(trigrams, width)
+            width *= 2
+
+        def candidate(entry: IndexedFile) -> bool:
+            mask = masks[entry.width]
+            return entry.signature & mask == mask
+
+        entries = [
+            entry
+            for entry in entries
+            if entry.size <= MAX_SEARCH_FILE_BYTES
+            and (not entry.indexed or (not entry.binary and entry.signature & (mask := masks[entry.width]) == mask))
+        ]
+
+        def search(entry: IndexedFile) -> GrepMatch | None:
+            try:
+                with open(os.path.join(self.root, entry.path), "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    data = f.read()
+            except OSError:
+                return None
+            if (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                # Edited in place since the last full scan: the signature is stale
+                entry.mtime_ns, entry.size, entry.indexed = stat.st_mtime_ns, stat.st_size, False
+            if not entry.indexed:
+                entry.index(data)
+                self._unsaved = True
+                if entry.binary or not candidate(entry):
+                    return None
+            return _search_text(entry.path, data.decode("utf-8", errors="replace"), regex, max_lines, first_only)
+
+        results: list[GrepMatch] = []
+        line_count = 0
+        executor = _get_executor()
+        for start in range(0, len(entries), SEARCH_BATCH_SIZE):
+            for match in executor.map(search, entries[start : start + SEARCH_BATCH_SIZE]):
+                if match is None:
+                    continue
+                if max_lines is not None:
+                    match.lines = match.lines[: max_lines - line_count]
+                    line_count += len(match.lines)
+                results.append(match)
+                if (max_files is not None and len(results) >= max_files) or (max_lines is not None and line_count >= max_lines):
+                    return results
+        return results
+
+
+def _path_key(entry: IndexedFile) -> str:
+    return entry.path
+
+
+def _index_cache_key(root: Path) -> str:
+    return hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:32]
+
+
+def _hash_check() -> tuple:
+    """Signature bit positions come from hash() of int tuples, which may change between Python versions."""
+    return (sys.version_info[:2], hash((1, 2, 3)) & 0xFFFFFFFF)
+
+
+def _search_text(path: str, text: str, regex: re.Pattern, max_lines: int | None, first_only: bool) -> GrepMatch | None:
+    count = 0
+    lines = []
+    line_number = 1
+    counted_to = 0  # text offset up to which newlines are counted
+    position = 0
+    while position <= len(text):
+        match = regex.search(text, position)
+        if match is None:
+            break
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        line_end = text.find("\n", match.start())
+        if line_end == -1:
+            line_end = len(text)
+        line_number += text.count("\n", counted_to, line_start)
+        counted_to = line_start
+        count += 1
+        if max_lines is None or len(lines) < max_lines:
+            lines.append((line_number, text[line_start:line_end].rstrip("\r")))
+        if first_only:
+            break
+        # One result per line: continue on the next line
+        position = line_end + 1
+    if not count:
+        return None
+    return GrepMatch(path, count, lines)
+
+
+_workspace_indexes: dict[str, WorkspaceIndex] = {}
+_workspace_indexes_lock = threading.Lock()
+
+
+def get_workspace_index(root: str | Path) -> WorkspaceIndex:
+    """Get the search index shared by all search tools of a directory tree."""
+    key = str(Path(root).absolute())
+    with _workspace_indexes_lock:
+        index = _workspace_indexes.get(key)
+        if index is None:
+            index = WorkspaceIndex(key, cache_dir=SEARCH_INDEX_CACHE_DIR)
+            _workspace_indexes[key] = index
+        return index
+
+
+def release_workspace_indexes(workspace_dir: str | Path) -> None:
+    """Save and drop the shared indexes of a workspace and its subdirectories (blocking; when its last session closes)."""
+    workspace_dir = Path(workspace_dir).absolute()
+    with _workspace_indexes_lock:
+        keys = [key for key, index in _workspace_indexes.items() if index.root.is_relative_to(workspace_dir)]
+        indexes = [_workspace_indexes.pop(key) for key in keys]
+    for index in indexes:
+        index.save()
+
+
+def save_workspace_indexes() -> None:
+    """Save the shared indexes for the next process (blocking; call at shutdown)."""
+    with _workspace_indexes_lock:
+        indexes = list(_workspace_indexes.values())
+    for index in indexes:
+        index.save()
+
+
+def mark_indexes_stale(path: str | Path, directory: bool = False) -> None:
+    """Make indexes refresh on their next search.
+
+    Args:
+        path: File written by the file tools (indexes containing it re-check that file)
+        directory: path is the working directory of a bash command instead; indexes
+            containing it, or contained in it, re-check their directory mtimes
+    """
+    path = Path(path).absolute()
+    with _workspace_indexes_lock:
+        indexes = list(_workspace_indexes.values())
+    for index in indexes:
+        if not path.is_relative_to(index.root):
+            if directory and index.root.is_relative_to(path):
+                index.mark_stale()
+        else:
+            index.mark_stale(None if directory else path)
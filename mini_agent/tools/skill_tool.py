@@ -4,6 +4,7 @@ Skill Tool - Tool for Agent to load Skills on-demand
 Implements Progressive Disclosure (Level 2): Load full skill content when needed
 """
 
+import asyncio
 from typing import Any, Dict, List, Optional
 
 from .base import Tool, ToolResult
@@ -24,6 +25,10 @@ class GetSkillTool(Tool):
     def description(self) -> str:
         return "Get complete content and guidance for a specified skill, used for executing specific types of tasks"
 
+    @property
+    def read_only(self) -> bool:
+        return True
+
     @property
     def parameters(self) -> Dict[str, Any]:
         return {
@@ -39,6 +44,9 @@ class GetSkillTool(Tool):
 
     async def execute(self, skill_name: str) -> ToolResult:
         """Get detailed information about specified skill"""
+        return await asyncio.to_thread(self._get_skill, skill_name)
+
+    def _get_skill(self, skill_name: str) -> ToolResult:
         skill = self.skill_loader.get_skill(skill_name)
 
         if not skill:
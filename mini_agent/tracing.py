@@ -0,0 +1,289 @@
+"""Lightweight tracing for the agent hot path.
+
+Components record timing spans and counters through a ``Tracer``:
+
+    with tracer.span("llm.request", model="MiniMax-M2.1"):
+        ...
+    tracer.count("llm.input_tokens", 1200)
+
+The process-wide default is a no-op tracer, so instrumentation costs almost
+nothing unless tracing is enabled with ``set_tracer(RecordingTracer([...]))``
+(or by passing a tracer to ``Agent``). Finished spans and counter updates are
+handed to exporters:
+
+- ``RingBufferExporter``: keeps the most recent spans in memory, plus counter totals
+- ``ChromeTraceExporter``: writes the most recent events as Chrome trace-event
+  JSON, viewable in chrome://tracing or https://ui.perfetto.dev
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class Span:
+    """A finished (or running) timed operation."""
+
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    span_id: int = 0
+    parent_id: int | None = None
+    thread_id: int = 0
+    task_id: int | None = None  # id() of the asyncio task that ran the span, if any
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration in milliseconds."""
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """Context manager returned by the no-op tracer."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """No-op tracer (the default). Subclasses record spans and counters."""
+
+    enabled = False
+
+    def span(self, name: str, **attributes: Any):
+        """Time a block: ``with tracer.span("name", key=value): ...``"""
+        return _NOOP_SPAN
+
+    def count(self, name: str, value: float = 1, **attributes: Any) -> None:
+        """Add value to a named counter."""
+
+
+class SpanExporter:
+    """Receives finished spans and counter updates from a RecordingTracer."""
+
+    def export_span(self, span: Span) -> None:
+        pass
+
+    def export_counter(self, name: str, value: float, total: float, timestamp_ns: int, attributes: dict[str, Any]) -> None:
+        pass
+
+
+_current_span: ContextVar["Span | None"] = ContextVar("mini_agent_current_span", default=None)
+
+
+class _ActiveSpan:
+    """Context manager for a span recorded by RecordingTracer."""
+
+    __slots__ = ("_tracer", "_span", "_token")
+
+    def __init__(self, tracer: "RecordingTracer", span: Span):
+        self._tracer = tracer
+        self._span = span
+        self._token = None
+
+    def __enter__(self):
+        span = self._span
+        parent = _current_span.get()
+        span.parent_id = parent.span_id if parent is not None else None
+        span.thread_id = threading.get_ident()
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        span.task_id = id(task) if task is not None else None
+        self._token = _current_span.set(span)
+        span.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self._span
+        span.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        self._tracer._finish(span)
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span (e.g. a result size known only at the end)."""
+        self._span.attributes[key] = value
+
+
+class RecordingTracer(Tracer):
+    """Tracer that records spans and counters and forwards them to exporters."""
+
+    enabled = True
+
+    def __init__(self, exporters: list[SpanExporter] | None = None):
+        """Initialize tracer.
+
+        Args:
+            exporters: Exporters receiving finished spans and counter updates
+        """
+        self.exporters = list(exporters or [])
+        self.counters: dict[str, float] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes: Any) -> _ActiveSpan:
+        with self._lock:
+            self._next_id += 1
+            span_id = self._next_id
+        return _ActiveSpan(self, Span(name=name, start_ns=0, attributes=attributes, span_id=span_id))
+
+    def count(self, name: str, value: float = 1, **attributes: Any) -> None:
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+        timestamp_ns = time.perf_counter_ns()
+        for exporter in self.exporters:
+            exporter.export_counter(name, value, total, timestamp_ns, attributes)
+
+    def _finish(self, span: Span) -> None:
+        for exporter in self.exporters:
+            exporter.export_span(span)
+
+
+class RingBufferExporter(SpanExporter):
+    """Keeps the most recent spans in memory, plus counter totals."""
+
+    def __init__(self, max_spans: int = 10000):
+        """Initialize exporter.
+
+        Args:
+            max_spans: Number of most recent spans kept (older spans are dropped)
+        """
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+        self.counters: dict[str, float] = {}
+
+    def export_span(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def export_counter(self, name: str, value: float, total: float, timestamp_ns: int, attributes: dict[str, Any]) -> None:
+        self.counters[name] = total
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Aggregate buffered spans by name: count, total, mean and max milliseconds."""
+        stats: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            entry = stats.setdefault(span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms
+            entry["max_ms"] = max(entry["max_ms"], span.duration_ms)
+        for entry in stats.values():
+            entry["mean_ms"] = entry["total_ms"] / entry["count"]
+        return stats
+
+
+class ChromeTraceExporter(SpanExporter):
+    """Collects spans as Chrome trace events and writes them to a JSON file.
+
+    Each asyncio task (or thread, outside of tasks) gets its own track, so
+    concurrently running tool calls show up side by side. Only the most recent
+    max_events events are kept, so long sessions have bounded memory.
+    """
+
+    def __init__(self, path: str | Path, max_events: int = 200000):
+        """Initialize exporter.
+
+        Args:
+            path: Output file, written by write() (e.g. at shutdown)
+            max_events: Number of most recent events kept (older events are dropped)
+        """
+        self.path = Path(path)
+        self.events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        self.dropped = 0
+        self._pid = os.getpid()
+        self._tracks: dict[tuple[int, int | None], int] = {}
+        self._lock = threading.Lock()
+
+    def _track(self, thread_id: int, task_id: int | None) -> int:
+        key = (thread_id, task_id)
+        track = self._tracks.get(key)
+        if track is None:
+            track = len(self._tracks) + 1
+            self._tracks[key] = track
+        return track
+
+    def export_span(self, span: Span) -> None:
+        with self._lock:
+            self._append(
+                {
+                    "name": span.name,
+                    "cat": span.name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": span.start_ns / 1000,
+                    "dur": (span.end_ns - span.start_ns) / 1000,
+                    "pid": self._pid,
+                    "tid": self._track(span.thread_id, span.task_id),
+                    "args": {key: _json_safe(value) for key, value in span.attributes.items()},
+                }
+            )
+
+    def export_counter(self, name: str, value: float, total: float, timestamp_ns: int, attributes: dict[str, Any]) -> None:
+        with self._lock:
+            self._append({"name": name, "ph": "C", "ts": timestamp_ns / 1000, "pid": self._pid, "args": {"value": total}})
+
+    def _append(self, event: dict[str, Any]) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append(event)
+
+    def write(self) -> Path:
+        """Write the kept events to the output file (otherData.dropped_events counts older ones).
+
+        Returns:
+            The output file path
+        """
+        with self._lock:
+            events = list(self.events)
+            dropped = self.dropped
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        trace = {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_events": dropped}}
+        self.path.write_text(json.dumps(trace), encoding="utf-8")
+        return self.path
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+_tracer: Tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer (a no-op Tracer unless set_tracer() was called)."""
+    return _tracer
+
+
+def resolve_tracer(tracer: Tracer | None) -> Tracer:
+    """Return tracer, or the process-wide tracer if it is None."""
+    return tracer if tracer is not None else _tracer
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """Install the process-wide tracer (None restores the no-op tracer)."""
+    global _tracer
+    _tracer = tracer if tracer is not None else Tracer()
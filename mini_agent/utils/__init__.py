@@ -5,10 +5,14 @@ from .terminal_utils import (
     pad_to_width,
     truncate_with_ellipsis,
 )
+from .token_utils import count_tokens, get_encoding, truncate_text_by_tokens
 
 __all__ = [
     "calculate_display_width",
     "pad_to_width",
     "truncate_with_ellipsis",
+    "count_tokens",
+    "get_encoding",
+    "truncate_text_by_tokens",
 ]
 
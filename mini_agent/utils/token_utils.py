@@ -0,0 +1,145 @@
+"""Token counting utilities.
+
+The tiktoken encoder is loaded once per process and shared by every caller,
+instead of being looked up again for each message or tool result.
+"""
+
+import threading
+
+import tiktoken
+
+# cl100k_base encoder (used by GPT-4 and most modern models, Claude/M2 compatible)
+ENCODING_NAME = "cl100k_base"
+
+# Rough estimation used when tiktoken is unavailable: average 2.5 characters = 1 token
+FALLBACK_CHARS_PER_TOKEN = 2.5
+
+_encoding: "tiktoken.Encoding | None" = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def get_encoding() -> "tiktoken.Encoding | None":
+    """Get the shared tiktoken encoder.
+
+    The encoder is loaded on first use. If loading fails (e.g. the BPE file
+    cannot be downloaded), the failure is remembered and None is returned from
+    then on, so callers fall back to character-based estimation instead of
+    retrying the download on every call.
+
+    Returns:
+        The cl100k_base encoder, or None if it could not be loaded
+    """
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                _encoding = tiktoken.get_encoding(ENCODING_NAME)
+            except Exception:
+                _encoding = None
+            _encoding_loaded = True
+
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text using the shared encoder.
+
+    Special-token markers (e.g. "<|endoftext|>") are counted as plain text.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Token count (character-based estimate if tiktoken is unavailable)
+    """
+    if not text:
+        return 0
+
+    encoding = get_encoding()
+    if encoding is None:
+        return int(len(text) / FALLBACK_CHARS_PER_TOKEN)
+
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+# Characters of text encoded per token of budget when only head/tail windows are
+# encoded. Generous for code and prose (~3-4 chars/token); highly compressible
+# text that needs more falls back to a full encode.
+WINDOW_CHARS_PER_TOKEN = 8
+
+
+def truncate_text_by_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to about max_tokens tokens, keeping the head and tail.
+
+    Tiered so that large inputs are never encoded as a whole:
+
+    1. Cheap upper bound: a token covers at least one UTF-8 byte, so text
+       whose byte length fits the budget is returned without encoding.
+    2. Over the bound, only a head and a tail window are encoded and cut at
+       max_tokens / 2 tokens each; the middle is never tokenized.
+    3. Texts short enough that the windows would overlap (or so compressible
+       that a window holds too few tokens) are encoded once in full.
+
+    Cut points are moved to the nearest newline. Without tiktoken, a
+    character-based estimate is used.
+
+    Args:
+        text: Text to be truncated
+        max_tokens: Maximum token limit
+
+    Returns:
+        str: Truncated text if it exceeds the limit, otherwise the original text.
+    """
+    # Tier 1: tokens <= UTF-8 bytes <= 4 * characters
+    if len(text) * 4 <= max_tokens:
+        return text
+    byte_count = len(text) if text.isascii() else len(text.encode("utf-8"))
+    if byte_count <= max_tokens:
+        return text
+
+    half = max_tokens // 2
+    encoding = get_encoding()
+    if encoding is None:
+        token_count = int(len(text) / FALLBACK_CHARS_PER_TOKEN)
+        if token_count <= max_tokens:
+            return text
+        chars_per_half = int(half * FALLBACK_CHARS_PER_TOKEN * 0.95)
+        return _join_head_tail(text[:chars_per_half], text[-chars_per_half:], token_count, max_tokens, estimated=True)
+
+    # Tier 2: encode only the head and tail windows
+    window = half * WINDOW_CHARS_PER_TOKEN
+    if len(text) > 2 * window:
+        head_tokens = encoding.encode(text[:window], disallowed_special=())
+        tail_tokens = encoding.encode(text[-window:], disallowed_special=())
+        if len(head_tokens) > half and len(tail_tokens) > half:
+            # Extrapolate the total from the windows' density
+            estimate = int(len(text) * (len(head_tokens) + len(tail_tokens)) / (2 * window))
+            head = encoding.decode(head_tokens[:half])
+            tail = encoding.decode(tail_tokens[-half:])
+            return _join_head_tail(head, tail, estimate, max_tokens, estimated=True)
+
+    # Tier 3: exact count
+    token_count = len(encoding.encode(text, disallowed_special=()))
+    if token_count <= max_tokens:
+        return text
+    # Approximate cut positions from the average token/character ratio (with 5% safety margin)
+    chars_per_half = int(half * len(text) / token_count * 0.95)
+    return _join_head_tail(text[:chars_per_half], text[-chars_per_half:], token_count, max_tokens)
+
+
+def _join_head_tail(head: str, tail: str, token_count: int, max_tokens: int, estimated: bool = False) -> str:
+    """Join head and tail cut at line boundaries, with a truncation note in between."""
+    last_newline_head = head.rfind("\n")
+    if last_newline_head > 0:
+        head = head[:last_newline_head]
+    first_newline_tail = tail.find("\n")
+    if first_newline_tail > 0:
+        tail = tail[first_newline_tail + 1 :]
+
+    approx = "~" if estimated else ""
+    truncation_note = f"\n\n... [Content truncated: {approx}{token_count} tokens -> ~{max_tokens} tokens limit] ...\n\n"
+    return head + truncation_note + tail
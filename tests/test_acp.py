@@ -1,12 +1,13 @@
 """Integration tests for the MiniMax ACP adapter."""
 
+import asyncio
 from types import SimpleNamespace
 
 import pytest
 
 from mini_agent.acp import MiniMaxACPAgent
 from mini_agent.config import AgentConfig, Config, LLMConfig, ToolsConfig
-from mini_agent.schema import FunctionCall, LLMResponse, ToolCall
+from mini_agent.schema import FunctionCall, LLMResponse, LLMStreamEvent, ToolCall
 from mini_agent.tools.base import Tool, ToolResult
 
 
@@ -39,6 +40,14 @@ class DummyLLM:
             )
         return LLMResponse(content="done", thinking=None, tool_calls=None, finish_reason="stop")
 
+    async def generate_stream(self, messages, tools):
+        response = await self.generate(messages, tools)
+        if response.thinking:
+            yield LLMStreamEvent(type="thinking", delta=response.thinking)
+        for word in response.content.split(" ") if response.content else []:
+            yield LLMStreamEvent(type="text", delta=word)
+        yield LLMStreamEvent(type="done", response=response)
+
 
 class EchoTool(Tool):
     @property
@@ -58,7 +67,7 @@ class EchoTool(Tool):
 
 
 @pytest.fixture
-def acp_agent(tmp_path):
+async def acp_agent(tmp_path):
     config = Config(
         llm=LLMConfig(api_key="test-key"),
         agent=AgentConfig(max_steps=3, workspace_dir=str(tmp_path)),
@@ -66,7 +75,8 @@ def acp_agent(tmp_path):
     )
     conn = DummyConn()
     agent = MiniMaxACPAgent(conn, config, DummyLLM(), [EchoTool()], "system")
-    return agent, conn
+    yield agent, conn
+    await agent.close()
 
 
 @pytest.mark.asyncio
@@ -83,7 +93,93 @@ async def test_acp_turn_executes_tool(acp_agent):
 
 @pytest.mark.asyncio
 async def test_acp_invalid_session(acp_agent):
-    agent, _ = acp_agent
+    agent, conn = acp_agent
     prompt = SimpleNamespace(sessionId="missing", prompt=[{"text": "?"}])
     response = await agent.prompt(prompt)
     assert response.stopReason == "refusal"
+    assert "does not exist" in str(conn.updates[-1])
+    assert agent._sessions == {}
+
+
+@pytest.mark.asyncio
+async def test_acp_streams_deltas(acp_agent):
+    agent, conn = acp_agent
+    # Streaming is opt-in, like Agent(stream=False)
+    assert AgentConfig().stream is False
+    agent._config.agent.stream = True
+    session = await agent.newSession(SimpleNamespace(cwd=None))
+    agent._sessions[session.sessionId].agent.llm = _MultiWordLLM()
+    prompt = SimpleNamespace(sessionId=session.sessionId, prompt=[{"text": "hello"}])
+    response = await agent.prompt(prompt)
+    assert response.stopReason == "end_turn"
+    message_chunks = [str(u) for u in conn.updates if "agent_message_chunk" in str(u)]
+    assert len(message_chunks) == 3
+    assert agent._sessions[session.sessionId].agent.messages[-1].content == "one two three"
+
+
+@pytest.mark.asyncio
+async def test_acp_evicts_idle_sessions(acp_agent):
+    agent, _ = acp_agent
+    agent._config.acp.session_idle_timeout = 60
+    agent._config.acp.max_sessions = 2
+    first = await agent.newSession(SimpleNamespace(cwd=None))
+    second = await agent.newSession(SimpleNamespace(cwd=None))
+
+    # Idle timeout: the first session has been idle for too long
+    agent._sessions[first.sessionId].last_active -= 120
+    third = await agent.newSession(SimpleNamespace(cwd=None))
+    assert set(agent._sessions) == {second.sessionId, third.sessionId}
+
+    # Session cap: the least recently active idle session makes room, busy sessions stay
+    agent._sessions[second.sessionId].busy = True
+    agent._sessions[third.sessionId].last_active -= 10
+    fourth = await agent.newSession(SimpleNamespace(cwd=None))
+    assert set(agent._sessions) == {second.sessionId, fourth.sessionId}
+    assert agent.scheduler_stats().evicted_sessions == 2
+
+
+@pytest.mark.asyncio
+async def test_acp_last_session_releases_workspace_caches(acp_agent, tmp_path):
+    from mini_agent.tools import file_cache, search_index
+
+    agent, _ = acp_agent
+    workspace = tmp_path / "ws"
+    first = await agent.newSession(SimpleNamespace(cwd=str(workspace)))
+    second = await agent.newSession(SimpleNamespace(cwd=str(workspace)))
+    assert str(workspace) in file_cache._workspace_caches
+    assert str(workspace) in search_index._workspace_indexes
+
+    # Still used by the second session
+    agent._sessions[first.sessionId].last_active -= 3600
+    agent._config.acp.session_idle_timeout = 60
+    await agent._evict_idle_sessions()
+    assert str(workspace) in file_cache._workspace_caches
+
+    agent._sessions[second.sessionId].last_active -= 3600
+    await agent._evict_idle_sessions()
+    assert str(workspace) not in file_cache._workspace_caches
+    assert str(workspace) not in search_index._workspace_indexes
+
+
+@pytest.mark.asyncio
+async def test_acp_idle_sessions_swept_without_new_sessions(acp_agent):
+    agent, conn = acp_agent
+    agent._config.acp.session_idle_timeout = 0.2
+    session = await agent.newSession(SimpleNamespace(cwd=None))
+    stats = await agent.extMethod("mini-agent/stats", {})
+    assert stats["sessions"] == 1 and stats["evicted_sessions"] == 0
+
+    await asyncio.sleep(0.5)
+    assert agent._sessions == {}
+    stats = await agent.extMethod("mini-agent/stats", {})
+    assert stats["sessions"] == 0 and stats["evicted_sessions"] == 1
+
+    # Prompts for the evicted session are refused instead of starting over in another workspace
+    response = await agent.prompt(SimpleNamespace(sessionId=session.sessionId, prompt=[{"text": "hello"}]))
+    assert response.stopReason == "refusal"
+    assert "expired" in str(conn.updates[-1])
+
+
+class _MultiWordLLM(DummyLLM):
+    async def generate(self, messages, tools):
+        return LLMResponse(content="one two three", finish_reason="stop")
@@ -0,0 +1,92 @@
+"""Test cases for ACP session admission control."""
+
+import asyncio
+
+import pytest
+
+from mini_agent.acp.scheduler import SessionScheduler
+
+
+@pytest.mark.asyncio
+async def test_llm_slots_are_bounded_and_fair():
+    """At most N LLM requests run at once; waiting sessions are served round-robin."""
+    scheduler = SessionScheduler(max_concurrent_llm_requests=1)
+    order = []
+    release = asyncio.Event()
+
+    async def request(session_id: str, tag: str):
+        async with scheduler.llm_slot(session_id):
+            order.append(tag)
+            await release.wait()
+
+    holder = asyncio.create_task(request("busy", "busy-0"))
+    await asyncio.sleep(0)
+    # The busy session queues three more requests before the quiet session queues one
+    tasks = [asyncio.create_task(request("busy", f"busy-{i}")) for i in range(1, 4)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("quiet", "quiet-1")))
+    await asyncio.sleep(0)
+
+    stats = scheduler.stats()
+    assert stats.llm_inflight == 1
+    assert stats.llm_queued == 4
+    assert stats.llm_peak_queued == 4
+
+    release.set()
+    await asyncio.gather(holder, *tasks)
+
+    # quiet-1 is served right after the busy session's next request, not after all of them
+    assert order == ["busy-0", "busy-1", "quiet-1", "busy-2", "busy-3"]
+    stats = scheduler.stats()
+    assert stats.llm_inflight == 0
+    assert stats.llm_queued == 0
+    assert stats.llm_requests == 5
+    assert stats.llm_wait_max >= stats.llm_wait_avg >= 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    """Cancelling a queued request frees its place without consuming a slot."""
+    scheduler = SessionScheduler(max_concurrent_llm_requests=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with scheduler.llm_slot("a"):
+            await release.wait()
+
+    async def wait_only():
+        async with scheduler.llm_slot("b"):
+            pass
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(wait_only())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    release.set()
+    await holder
+    assert scheduler.stats().llm_inflight == 0
+    async with scheduler.llm_slot("c"):
+        assert scheduler.stats().llm_inflight == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_slots_are_bounded():
+    """Tool calls across sessions never exceed the global limit."""
+    scheduler = SessionScheduler(max_concurrent_tools=2)
+    running = peak = 0
+
+    async def tool_call():
+        nonlocal running, peak
+        async with scheduler.tool_slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(tool_call() for _ in range(6)))
+    assert peak == 2
+    assert scheduler.stats().tools_inflight == 0
@@ -0,0 +1,92 @@
+"""Test cases for Agent's incremental token accounting."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from mini_agent import LLMClient
+from mini_agent import agent as agent_module
+from mini_agent.agent import Agent
+from mini_agent.schema import FunctionCall, Message, ToolCall
+from mini_agent.utils import get_encoding
+
+
+@pytest.fixture
+def agent(tmp_path):
+    return Agent(llm_client=MagicMock(spec=LLMClient), system_prompt="System", tools=[], workspace_dir=str(tmp_path))
+
+
+@pytest.fixture
+def encode_calls(monkeypatch):
+    """Count how many texts the agent encodes."""
+    calls = []
+    original = agent_module.count_tokens
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(agent_module, "count_tokens", counting)
+    return calls
+
+
+def _full_count(agent: Agent) -> int:
+    fresh = Agent(llm_client=agent.llm, system_prompt=agent.system_prompt, tools=[], workspace_dir=str(agent.workspace_dir))
+    fresh.messages = list(agent.messages)
+    return fresh._estimate_tokens()
+
+
+def _tool_round(i: int) -> list[Message]:
+    call = ToolCall(id=f"c{i}", type="function", function=FunctionCall(name="bash", arguments={"command": f"echo {i}"}))
+    return [
+        Message(role="assistant", content=f"step {i}", thinking="thinking", tool_calls=[call]),
+        Message(role="tool", content=f"output {i}" * 20, tool_call_id=f"c{i}", name="bash"),
+    ]
+
+
+def test_encoder_loaded_once():
+    assert get_encoding() is get_encoding()
+
+
+def test_only_new_messages_are_encoded(agent, encode_calls):
+    agent.add_user_message("hello")
+    first = agent._estimate_tokens()
+    assert first == _full_count(agent)
+
+    encode_calls.clear()
+    assert agent._estimate_tokens() == first
+    assert encode_calls == []
+
+    agent.messages.extend(_tool_round(1))
+    total = agent._estimate_tokens()
+    # assistant: content + thinking + tool_calls, tool: content
+    assert len(encode_calls) == 4
+    assert total == _full_count(agent)
+
+
+def test_cleanup_updates_running_total(agent):
+    agent.add_user_message("hello")
+    agent.messages.extend(_tool_round(1))
+    agent._estimate_tokens()
+    agent.messages.extend(_tool_round(2))
+
+    agent._cleanup_incomplete_messages()
+
+    assert agent._estimate_tokens() == _full_count(agent)
+    assert len(agent.messages) == 4
+
+
+def test_rewritten_history_is_recounted_from_cache(agent, encode_calls):
+    agent.add_user_message("hello")
+    agent.messages.extend(_tool_round(1))
+    agent._estimate_tokens()
+
+    encode_calls.clear()
+    summary = Message(role="user", content="[Assistant Execution Summary]\n\nsummary")
+    agent.messages = agent.messages[:2] + [summary]
+
+    total = agent._estimate_tokens()
+    assert encode_calls == [summary.content]
+    assert total == _full_count(agent)
+    # Dropped messages are evicted from the per-message cache
+    assert len(agent._message_tokens) == 3
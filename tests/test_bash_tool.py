@@ -1,10 +1,14 @@
 """Test cases for Bash Tool."""
 
 import asyncio
+from collections import deque
+from pathlib import Path
 
 import pytest
 
-from mini_agent.tools.bash_tool import BackgroundShellManager, BashKillTool, BashOutputTool, BashTool
+from mini_agent.tools import bash_tool as bash_tool_module
+from mini_agent.tools.bash_tool import BackgroundShellManager, BashKillTool, BashOutputTool, BashTool, ResourceLimits
+from mini_agent.utils.token_utils import count_tokens
 
 
 @pytest.mark.asyncio
@@ -270,3 +274,269 @@ async def test_timeout_validation():
     result = await bash_tool.execute(command="echo 'test'", timeout=0)
     assert result.success
     print("Timeout < 1 handled correctly")
+
+
+@pytest.mark.asyncio
+async def test_large_output_truncated(tmp_path):
+    """Test large foreground output keeps head and tail with exact truncation counts."""
+    print("\n=== Testing Large Output Truncation ===")
+
+    bash_tool = BashTool(max_output_bytes=1000, spill_dir=str(tmp_path))
+    # 5000 lines of "line NNNNN\n" (11 bytes each)
+    result = await bash_tool.execute(command="for i in $(seq 10000 14999); do echo line $i; done")
+
+    assert result.success
+    assert result.stdout.startswith("line 10000\n")
+    assert result.stdout.endswith("line 14999\n")
+    assert result.truncated_bytes == 5000 * 11 - 1000
+    assert result.truncated_lines == result.truncated_bytes // 11
+    assert f"[{result.truncated_bytes} bytes" in result.stdout
+    assert "[truncated]" in result.content
+
+    # Full output is spilled to a file that can be paged later
+    assert result.stdout_file is not None and result.stderr_file is None
+    with open(result.stdout_file, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 5000 and lines[-1] == "line 14999"
+    print(f"Truncated {result.truncated_bytes} bytes, full output in {result.stdout_file}")
+
+
+@pytest.mark.asyncio
+async def test_small_output_not_spilled(tmp_path):
+    """Test output under the cap is returned whole without a spill file."""
+    bash_tool = BashTool(max_output_bytes=1000, spill_dir=str(tmp_path))
+    result = await bash_tool.execute(command="echo 'short'")
+
+    assert result.stdout.strip() == "short"
+    assert result.truncated_bytes == 0 and result.stdout_file is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_spill_files_retention_and_token_cap(tmp_path, monkeypatch):
+    """Old spill files are deleted beyond the retention limit; results stay within the token budget."""
+    monkeypatch.setattr(bash_tool_module, "MAX_SPILL_FILES", 2)
+    monkeypatch.setattr(bash_tool_module, "_spill_files", deque())
+    bash_tool = BashTool(max_output_bytes=1000, spill_dir=str(tmp_path))
+    files = []
+    for _ in range(3):
+        result = await bash_tool.execute(command="seq 1 1000")
+        files.append(result.stdout_file)
+    assert [Path(f).exists() for f in files] == [False, True, True]
+
+    bash_tool_module.remove_spill_files()
+    assert list(tmp_path.iterdir()) == []
+
+    # 1 MB per stream in memory is far above the token budget of the result
+    bash_tool = BashTool(max_output_bytes=1024 * 1024, spill_output=False)
+    result = await bash_tool.execute(command="seq 1 200000; seq 1 200000 >&2")
+    assert count_tokens(result.content) <= bash_tool_module.MAX_OUTPUT_TOKENS + 200
+
+
+@pytest.mark.asyncio
+async def test_timeout_keeps_partial_output():
+    """Test a timed out command still returns output printed before the timeout."""
+    bash_tool = BashTool(spill_output=False)
+    result = await bash_tool.execute(command="echo 'before timeout'; sleep 10", timeout=1)
+
+    assert not result.success
+    assert "timed out" in result.error.lower()
+    assert "before timeout" in result.stdout
+    assert result.exit_code == -1
+
+
+@pytest.mark.asyncio
+async def test_background_output_wakes_waiter():
+    """Test waiting for background output is woken by new output, not polling."""
+    bash_tool = BashTool()
+    result = await bash_tool.execute(command="sleep 0.3; echo 'ready'; exec sleep 5", run_in_background=True)
+    shell = BackgroundShellManager.get(result.bash_id)
+
+    try:
+        assert not await shell.wait_for_output(timeout=0.05)
+        assert await shell.wait_for_output(timeout=5)
+        assert shell.get_new_output() == ["ready"]
+        assert not shell.has_new_output()
+    finally:
+        await BackgroundShellManager.terminate(result.bash_id)
+
+
+@pytest.mark.asyncio
+async def test_background_output_line_cap():
+    """Test background shells keep at most max_lines lines and report evictions."""
+    bash_tool = BashTool(background_max_lines=100)
+    result = await bash_tool.execute(command="seq 1 1000; printf 'no newline'", run_in_background=True)
+    shell = BackgroundShellManager.get(result.bash_id)
+
+    try:
+        while shell.status == "running":
+            assert await shell.wait_for_output(timeout=5)
+            if shell.status == "running":
+                await asyncio.sleep(0.01)
+        assert len(shell.output_lines) == 100
+        assert shell.total_lines == 1001
+
+        lines = shell.get_new_output()
+        assert lines[0] == "... [901 lines evicted before they were read] ..."
+        assert lines[1] == "902" and lines[-1] == "no newline"
+    finally:
+        await BackgroundShellManager.terminate(result.bash_id)
+
+
+@pytest.mark.asyncio
+async def test_bash_output_until_regex():
+    """Test bash_output blocks until a matching line appears."""
+    bash_tool = BashTool()
+    result = await bash_tool.execute(
+        command="echo 'booting'; sleep 0.5; echo 'Listening on 8080'; exec sleep 10", run_in_background=True
+    )
+    bash_id = result.bash_id
+
+    try:
+        bash_output_tool = BashOutputTool()
+        output_result = await bash_output_tool.execute(bash_id=bash_id, until_regex="Listening on", wait_seconds=5)
+        assert output_result.success
+        assert output_result.matched is True
+        assert output_result.status == "running"
+        assert output_result.stdout == "booting\nListening on 8080"
+
+        # Nothing new arrives: the deadline passes without a match
+        output_result = await bash_output_tool.execute(bash_id=bash_id, until_regex="never", wait_seconds=0.2)
+        assert output_result.matched is False
+        assert output_result.stdout == ""
+    finally:
+        await BackgroundShellManager.terminate(bash_id)
+
+
+@pytest.mark.asyncio
+async def test_bash_output_wait_returns_on_exit():
+    """Test waiting returns as soon as the shell exits, with its exit code."""
+    bash_tool = BashTool()
+    result = await bash_tool.execute(command="sleep 0.3; exit 3", run_in_background=True)
+
+    bash_output_tool = BashOutputTool()
+    output_result = await bash_output_tool.execute(bash_id=result.bash_id, wait_seconds=10)
+    assert output_result.status == "failed"
+    assert output_result.exit_code == 3
+
+    invalid = await bash_output_tool.execute(bash_id=result.bash_id, until_regex="(")
+    assert not invalid.success
+    await BackgroundShellManager.terminate(result.bash_id)
+
+
+@pytest.mark.asyncio
+async def test_persistent_session_keeps_state(tmp_path):
+    """Test persistent sessions keep cd/export state and frame exit codes per command."""
+    bash_tool = BashTool(workspace_dir=str(tmp_path), persistent_session=True)
+    (tmp_path / "sub").mkdir()
+
+    try:
+        result = await bash_tool.execute(command="cd sub && export GREETING=hello")
+        assert result.success and result.stdout == ""
+
+        result = await bash_tool.execute(command="pwd; echo $GREETING; printf 'no newline'")
+        assert result.stdout == f"{tmp_path / 'sub'}\nhello\nno newline"
+
+        result = await bash_tool.execute(command="echo oops >&2; exit_code_is() { return 4; }; exit_code_is")
+        assert not result.success
+        assert result.exit_code == 4
+        assert result.stderr == "oops\n"
+        assert bash_tool.session.commands_run == 3
+    finally:
+        bash_tool.close()
+
+
+@pytest.mark.asyncio
+async def test_persistent_session_restarts_after_exit_and_timeout(tmp_path):
+    """Test a session killed by `exit` or a timeout is replaced by a fresh one."""
+    bash_tool = BashTool(workspace_dir=str(tmp_path), persistent_session=True)
+
+    try:
+        await bash_tool.execute(command="export MARK=1")
+        result = await bash_tool.execute(command="exit 3")
+        assert result.exit_code == 3
+        result = await bash_tool.execute(command="echo ${MARK:-unset}")
+        assert result.stdout == "unset\n"
+
+        result = await bash_tool.execute(command="echo started; sleep 10", timeout=1)
+        assert "timed out" in result.error.lower()
+        assert result.stdout == "started\n"
+        result = await bash_tool.execute(command="echo alive")
+        assert result.success and result.stdout == "alive\n"
+    finally:
+        bash_tool.close()
+
+
+@pytest.mark.asyncio
+async def test_resource_usage_reported():
+    """Test foreground commands report peak RSS and CPU time."""
+    bash_tool = BashTool()
+    result = await bash_tool.execute(command="python3 -c 'x = bytearray(64 * 1024 * 1024); print(len(x))'")
+
+    assert result.success
+    assert result.peak_rss_bytes >= 64 * 1024 * 1024
+    assert result.cpu_seconds >= 0
+
+
+@pytest.mark.asyncio
+async def test_resource_limits_enforced():
+    """Test memory and CPU limits stop runaway commands."""
+    bash_tool = BashTool(limits=ResourceLimits(cpu_seconds=1, memory_bytes=256 * 1024 * 1024))
+
+    result = await bash_tool.execute(command="python3 -c 'x = bytearray(1024 * 1024 * 1024)'")
+    assert not result.success
+    assert "MemoryError" in result.stderr
+
+    result = await bash_tool.execute(command="while :; do :; done", timeout=30)
+    assert not result.success
+    assert "SIGXCPU" in result.error
+
+    # A child killed by the limit is reported by the shell as exit code 128 + signal
+    result = await bash_tool.execute(command="python3 -c 'while True: pass'", timeout=30)
+    assert not result.success
+    assert "terminated by signal SIGXCPU" in result.error
+
+
+@pytest.mark.asyncio
+async def test_persistent_session_limits_are_per_command():
+    """CPU time of a persistent shell does not add up across commands; each gets its own budget."""
+    bash_tool = BashTool(persistent_session=True, limits=ResourceLimits(cpu_seconds=1))
+    try:
+        await bash_tool.execute(command="cd /tmp && export KEEP=1")
+        for _ in range(3):
+            # ~0.6s of CPU in the shell itself (builtins)
+            result = await bash_tool.execute(command="n=0; while (( n < 300000 )); do ((n++)); done; echo ok")
+            assert result.success, result.error
+        result = await bash_tool.execute(command="python3 -c 'while True: pass'", timeout=30)
+        assert "SIGXCPU" in result.error
+
+        # The shell itself is not limited: its state survives
+        result = await bash_tool.execute(command="echo $PWD $KEEP")
+        assert result.stdout.split() == ["/tmp", "1"]
+        assert bash_tool.session.commands_run == 6
+    finally:
+        bash_tool.close()
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_process_group(tmp_path):
+    """Test a timeout kills processes started by the command, not just the shell."""
+    marker = tmp_path / "survived"
+    bash_tool = BashTool()
+    result = await bash_tool.execute(command=f"(sleep 2; touch {marker}) & wait", timeout=1)
+    assert "timed out" in result.error.lower()
+
+    await asyncio.sleep(1.5)
+    assert not marker.exists()
+
+
+@pytest.mark.asyncio
+async def test_kill_background_process_group(tmp_path):
+    """Test bash_kill stops the background command's child processes too."""
+    marker = tmp_path / "survived"
+    bash_tool = BashTool()
+    result = await bash_tool.execute(command=f"(sleep 1; touch {marker}) & sleep 10", run_in_background=True)
+
+    await BashKillTool().execute(bash_id=result.bash_id)
+    await asyncio.sleep(1.5)
+    assert not marker.exists()
@@ -0,0 +1,25 @@
+"""Smoke test for the benchmark suite (keeps benchmarks/ in sync with the agent)."""
+
+import json
+
+import pytest
+
+from benchmarks.compare import compare
+from benchmarks.run import run_benchmarks
+
+
+@pytest.mark.asyncio
+async def test_quick_benchmarks_produce_comparable_results():
+    report = await run_benchmarks(["step_overhead", "summarization", "tool_dispatch"], quick=True)
+
+    # Results are JSON-serializable and carry run metadata
+    report = json.loads(json.dumps(report))
+    assert report["meta"]["quick"] is True
+    results = report["results"]
+    assert results["step_overhead"]["steps"] == 50
+    assert results["step_overhead"]["p95_us"] >= results["step_overhead"]["p50_us"] > 0
+    # Re-compacting after one new round only summarizes that round
+    assert results["summarization"]["rounds_10"]["recompact_llm_calls"] == 1
+
+    rows, regressions = compare(report, report, threshold=0.1)
+    assert rows and not regressions
@@ -0,0 +1,203 @@
+"""Test cases for file tool internals."""
+
+import mmap
+import os
+import stat
+
+import pytest
+
+from mini_agent.tools import EditTool, MultiEditTool, ReadTool, WriteTool, file_tools
+from mini_agent.tools.file_cache import FileCache
+from mini_agent.tools.file_tools import LineIndex, apply_edits, atomic_write, read_line_range
+
+
+def _write_lines(path, count: int) -> list[str]:
+    lines = [f"line {i} " + "x" * (i % 37) + "\n" for i in range(count)]
+    path.write_text("".join(lines), encoding="utf-8")
+    return lines
+
+
+def test_read_line_range_matches_readlines(tmp_path):
+    path = tmp_path / "big.log"
+    lines = _write_lines(path, 20000)
+
+    for start, limit in [(0, 5), (1, 1), (999, 50), (12345, 10), (19990, 50), (25000, 5), (19995, None)]:
+        expected = lines[start : start + limit] if limit else lines[start:]
+        assert read_line_range(path, start, limit) == expected, (start, limit)
+
+
+def test_line_index_small_blocks(tmp_path):
+    # Tiny blocks exercise block boundaries, lines spanning blocks and the missing final newline
+    path = tmp_path / "small.txt"
+    path.write_bytes(b"a\nbb\n\nccc\ndddd")
+    index = LineIndex(path.stat().st_size, block_size=3)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offsets = [index.line_offset(mm, line) for line in range(6)]
+    assert offsets == [0, 2, 5, 6, 10, 14]
+
+
+def test_line_index_is_lazy_and_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_tools, "LINE_INDEX_BLOCK_SIZE", 4096)
+    path = tmp_path / "cached.log"
+    lines = _write_lines(path, 5000)
+
+    assert read_line_range(path, 10, 2) == lines[10:12]
+    index = file_tools._line_indexes[str(path)][2]
+    # Only the blocks up to the requested line were counted
+    assert len(index.block_lines) == 2
+
+    assert read_line_range(path, 4000, 2) == lines[4000:4002]
+    assert file_tools._line_indexes[str(path)][2] is index
+    assert len(index.block_lines) > 2
+
+    # Changing the file invalidates the cached index
+    lines = _write_lines(path, 100)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert read_line_range(path, 50, 1) == lines[50:51]
+    assert file_tools._line_indexes[str(path)][2] is not index
+
+
+def test_atomic_write_keeps_mode_and_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "script.sh"
+    path.write_text("old")
+    path.chmod(0o750)
+
+    atomic_write(path, [b"#!/bin/sh\n", b"echo new\n"])
+
+    assert path.read_bytes() == b"#!/bin/sh\necho new\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o750
+    assert os.listdir(tmp_path) == ["script.sh"]
+
+
+def test_atomic_write_new_file_gets_umask_mode(tmp_path, monkeypatch):
+    old_umask = os.umask(0o027)
+    try:
+        # The umask is applied by the kernel, never read by changing it
+        monkeypatch.setattr(os, "umask", lambda mask: pytest.fail("os.umask called"))
+        atomic_write(tmp_path / "new.txt", b"data")
+    finally:
+        monkeypatch.undo()
+        os.umask(old_umask)
+    assert stat.S_IMODE((tmp_path / "new.txt").stat().st_mode) == 0o640
+    assert os.listdir(tmp_path) == ["new.txt"]
+
+
+def test_atomic_write_failure_keeps_original(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("original")
+
+    def chunks():
+        yield b"partial"
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        atomic_write(path, chunks())
+    assert path.read_text() == "original"
+    assert os.listdir(tmp_path) == ["data.txt"]
+
+
+def test_apply_edits_streams_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_tools, "EDIT_CHUNK_SIZE", 64)
+    path = tmp_path / "big.txt"
+    lines = [f"value_{i} = {i}\n" for i in range(1000)]
+    path.write_text("".join(lines))
+
+    # Matches straddle chunk boundaries at this chunk size
+    apply_edits(path, [("value_500 = 500\n", "value_500 = 'five hundred'\n"), ("value_3 = 3\n", "")])
+
+    lines[500] = "value_500 = 'five hundred'\n"
+    del lines[3]
+    assert path.read_text() == "".join(lines)
+
+
+def test_apply_edits_rejects_ambiguous_and_overlapping(tmp_path):
+    path = tmp_path / "code.py"
+    path.write_text("x = 1\ny = 1\n")
+
+    with pytest.raises(ValueError, match="multiple times"):
+        apply_edits(path, [(" = 1", " = 2")])
+    with pytest.raises(ValueError, match="not found"):
+        apply_edits(path, [("z = 1", "z = 2")])
+    with pytest.raises(ValueError, match="overlap"):
+        apply_edits(path, [("x = 1\ny", "a"), ("y = 1", "b")])
+    assert path.read_text() == "x = 1\ny = 1\n"
+
+
+def test_apply_edits_crlf_file(tmp_path):
+    path = tmp_path / "win.txt"
+    path.write_bytes(b"first\r\nsecond\r\nthird\r\n")
+
+    apply_edits(path, [("first\nsecond", "one\ntwo")])
+    assert path.read_bytes() == b"one\r\ntwo\r\nthird\r\n"
+
+
+async def test_write_and_edit_tools(tmp_path):
+    assert (await WriteTool(workspace_dir=str(tmp_path)).execute(path="a/b.txt", content="hello world\n")).success
+    result = await EditTool(workspace_dir=str(tmp_path)).execute(path="a/b.txt", old_str="o", new_str="0")
+    assert not result.success and "multiple times" in result.error
+
+    result = await MultiEditTool(workspace_dir=str(tmp_path)).execute(
+        path="a/b.txt", edits=[{"old_str": "hello", "new_str": "goodbye"}, {"old_str": "world", "new_str": "moon"}]
+    )
+    assert result.success
+    assert (tmp_path / "a" / "b.txt").read_text() == "goodbye moon\n"
+
+    result = await MultiEditTool(workspace_dir=str(tmp_path)).execute(
+        path="a/b.txt", edits=[{"old_str": "moon", "new_str": "sun"}, {"old_str": "missing", "new_str": ""}]
+    )
+    assert not result.success and result.error.startswith("No edits applied")
+    assert (tmp_path / "a" / "b.txt").read_text() == "goodbye moon\n"
+
+
+async def test_file_cache_shared_by_tools(tmp_path):
+    cache = FileCache()
+    path = tmp_path / "code.py"
+    path.write_text("a = 1\nb = 2\n")
+    read = ReadTool(workspace_dir=str(tmp_path), cache=cache)
+
+    assert "a = 1" in (await read.execute(path="code.py")).content
+    assert "b = 2" in (await read.execute(path="code.py", offset=2)).content
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Edits are applied to the cached content and written through
+    assert (await EditTool(workspace_dir=str(tmp_path), cache=cache).execute(path="code.py", old_str="b = 2", new_str="b = 3")).success
+    assert path.read_text() == "a = 1\nb = 3\n"
+    assert "b = 3" in (await read.execute(path="code.py")).content
+    assert cache.misses == 1
+
+    assert (await WriteTool(workspace_dir=str(tmp_path), cache=cache).execute(path="code.py", content="c = 4\n")).success
+    assert "c = 4" in (await read.execute(path="code.py")).content
+    assert cache.misses == 1
+
+    # Changes made outside the tools are detected by size/mtime
+    path.write_text("changed outside\n")
+    assert "changed outside" in (await read.execute(path="code.py")).content
+    assert cache.misses == 2
+    assert cache.stats()["hit_rate"] == cache.hits / (cache.hits + cache.misses)
+
+
+def test_file_cache_byte_budget(tmp_path):
+    cache = FileCache(max_bytes=250, max_file_bytes=100)
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"f{i}.txt"
+        path.write_bytes(bytes([65 + i]) * 100)
+        paths.append(path)
+
+    for path in paths[:3]:
+        cache.get(path)
+    # Oldest entry is evicted to stay within 250 bytes
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 200, 1)
+
+    cache.get(paths[1])  # refresh f1, so f2 is the next eviction
+    cache.get(paths[3])
+    assert cache.get(paths[1]).data == b"B" * 100
+    assert cache.stats()["hits"] == 2
+
+    big = tmp_path / "big.txt"
+    big.write_bytes(b"x" * 101)
+    assert cache.get(big) is None
+    assert cache.stats()["entries"] == 2
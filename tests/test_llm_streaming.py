@@ -0,0 +1,154 @@
+"""Test cases for streaming LLM responses (no network required)."""
+
+from contextlib import aclosing
+from types import SimpleNamespace as NS
+from unittest.mock import MagicMock
+
+import pytest
+
+from mini_agent import LLMClient
+from mini_agent.agent import Agent
+from mini_agent.llm import AnthropicClient, OpenAIClient
+from mini_agent.retry import RetryConfig
+from mini_agent.schema import LLMResponse, LLMStreamEvent, Message
+
+
+class _FakeStream:
+    """Stands in for the SDK's AsyncStream: iterates items and records close()."""
+
+    def __init__(self, items):
+        self._items = list(items)
+        self.closed = False
+
+    async def __aiter__(self):
+        for item in self._items:
+            yield item
+
+    async def close(self):
+        self.closed = True
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+@pytest.mark.asyncio
+async def test_anthropic_stream_assembles_response():
+    """Raw Anthropic stream events are turned into deltas and a final LLMResponse."""
+    client = AnthropicClient(api_key="test-key", retry_config=RetryConfig(enabled=False))
+    events = [
+        NS(type="message_start", message=NS(usage=NS(input_tokens=10, output_tokens=1))),
+        NS(type="content_block_start", index=0, content_block=NS(type="thinking")),
+        NS(type="content_block_delta", index=0, delta=NS(type="thinking_delta", thinking="plan ")),
+        NS(type="content_block_delta", index=0, delta=NS(type="thinking_delta", thinking="it")),
+        NS(type="content_block_start", index=1, content_block=NS(type="text")),
+        NS(type="content_block_delta", index=1, delta=NS(type="text_delta", text="Hel")),
+        NS(type="content_block_delta", index=1, delta=NS(type="text_delta", text="lo")),
+        NS(type="content_block_start", index=2, content_block=NS(type="tool_use", id="tu_1", name="read_file")),
+        NS(type="content_block_delta", index=2, delta=NS(type="input_json_delta", partial_json='{"path": ')),
+        NS(type="content_block_delta", index=2, delta=NS(type="input_json_delta", partial_json='"a.txt"}')),
+        NS(type="content_block_stop", index=2),
+        NS(type="message_delta", delta=NS(stop_reason="tool_use"), usage=NS(output_tokens=7)),
+        NS(type="message_stop"),
+    ]
+
+    async def fake_stream_request(*args, **kwargs):
+        return _FakeStream(events)
+
+    client._make_stream_request = fake_stream_request
+    result = await _collect(client.generate_stream([Message(role="user", content="hi")]))
+
+    assert [e.delta for e in result if e.type == "thinking"] == ["plan ", "it"]
+    assert [e.delta for e in result if e.type == "text"] == ["Hel", "lo"]
+    assert result[-1].type == "done"
+    response = result[-1].response
+    assert response.content == "Hello"
+    assert response.thinking == "plan it"
+    assert response.finish_reason == "tool_use"
+    assert response.tool_calls[0].id == "tu_1"
+    assert response.tool_calls[0].function.arguments == {"path": "a.txt"}
+    assert response.usage.prompt_tokens == 10
+    assert response.usage.completion_tokens == 7
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_assembles_response():
+    """OpenAI chunks (including split tool call arguments) build a final LLMResponse."""
+    client = OpenAIClient(api_key="test-key", retry_config=RetryConfig(enabled=False))
+
+    def chunk(delta, finish_reason=None):
+        return NS(usage=None, choices=[NS(delta=delta, finish_reason=finish_reason)])
+
+    def delta(content=None, reasoning=None, tool_calls=None):
+        return NS(content=content, reasoning_details=reasoning, tool_calls=tool_calls)
+
+    chunks = [
+        chunk(delta(reasoning=[{"text": "think"}])),
+        chunk(delta(content="Hi")),
+        chunk(delta(tool_calls=[NS(index=0, id="call_1", function=NS(name="bash", arguments='{"comm'))])),
+        chunk(delta(tool_calls=[NS(index=0, id=None, function=NS(name=None, arguments='and": "ls"}'))])),
+        chunk(delta(), finish_reason="tool_calls"),
+        NS(usage=NS(prompt_tokens=5, completion_tokens=3, total_tokens=8), choices=[]),
+    ]
+
+    async def fake_stream_request(*args, **kwargs):
+        return _FakeStream(chunks)
+
+    client._make_stream_request = fake_stream_request
+    result = await _collect(client.generate_stream([Message(role="user", content="hi")]))
+
+    response = result[-1].response
+    assert response.thinking == "think"
+    assert response.content == "Hi"
+    assert response.finish_reason == "tool_calls"
+    assert response.tool_calls[0].function.name == "bash"
+    assert response.tool_calls[0].function.arguments == {"command": "ls"}
+    assert response.usage.total_tokens == 8
+    assert [e.tool_call_id for e in result if e.type == "tool_use"] == ["call_1", "call_1"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_class", [AnthropicClient, OpenAIClient])
+async def test_stream_closed_when_consumer_stops_early(client_class):
+    """Breaking out of generate_stream closes the SDK stream (returning the connection to the pool)."""
+    client = client_class(api_key="test-key", retry_config=RetryConfig(enabled=False))
+    if client_class is AnthropicClient:
+        item = NS(type="content_block_delta", index=0, delta=NS(type="text_delta", text="x"))
+    else:
+        item = NS(usage=None, choices=[NS(delta=NS(content="x", reasoning_details=None, tool_calls=None), finish_reason=None)])
+    stream = _FakeStream([item] * 5)
+
+    async def fake_stream_request(*args, **kwargs):
+        return stream
+
+    client._make_stream_request = fake_stream_request
+    async with aclosing(client.generate_stream([Message(role="user", content="hi")])) as events:
+        async for event in events:
+            assert event.delta == "x"
+            break
+        assert not stream.closed
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_agent_consumes_stream(tmp_path, capsys):
+    """Agent.run in streaming mode prints deltas and records the final message."""
+    final = LLMResponse(content="streamed answer", thinking="hmm", finish_reason="stop")
+
+    async def fake_stream(messages, tools):
+        yield LLMStreamEvent(type="thinking", delta="hmm")
+        yield LLMStreamEvent(type="text", delta="streamed ")
+        yield LLMStreamEvent(type="text", delta="answer")
+        yield LLMStreamEvent(type="done", response=final)
+
+    llm = MagicMock(spec=LLMClient)
+    llm.generate_stream = fake_stream
+    agent = Agent(llm_client=llm, system_prompt="System", tools=[], workspace_dir=str(tmp_path), stream=True)
+    agent.add_user_message("hello")
+
+    result = await agent.run()
+
+    assert result == "streamed answer"
+    assert agent.messages[-1].thinking == "hmm"
+    assert "streamed answer" in capsys.readouterr().out
+    llm.generate.assert_not_called()
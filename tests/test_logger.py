@@ -0,0 +1,160 @@
+"""Test cases for the buffered AgentLogger."""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from mini_agent.logger import AgentLogger
+from mini_agent.schema import FunctionCall, Message, ToolCall
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """Point ~/.mini-agent/log/ at a temporary directory."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    return tmp_path
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_text_log_format(home):
+    """Text logs keep the readable block layout with the full request history."""
+    logger = AgentLogger()
+    logger.start_new_run()
+    messages = [Message(role="system", content="System"), Message(role="user", content="Hello")]
+    logger.log_request(messages, tools=[])
+    call = ToolCall(id="c1", type="function", function=FunctionCall(name="read_file", arguments={"path": "a"}))
+    logger.log_response(content="", tool_calls=[call], finish_reason="tool_use")
+    logger.log_tool_result("read_file", {"path": "a"}, True, result_content="data")
+    assert logger.flush()
+
+    log_file = logger.get_log_file_path()
+    assert log_file.parent == home / ".mini-agent" / "log"
+    text = log_file.read_text(encoding="utf-8")
+    assert text.startswith("=" * 80 + "\nAgent Run Log - ")
+    assert "[1] REQUEST" in text and "LLM Request:" in text
+    assert '"content": "Hello"' in text
+    assert "[2] RESPONSE" in text and '"read_file"' in text
+    assert "[3] TOOL_RESULT" in text and '"result": "data"' in text
+    logger.close()
+
+
+def test_jsonl_logs_only_message_deltas(home):
+    """JSONL requests contain only new messages, and the full history after a rewrite."""
+    logger = AgentLogger(log_format="jsonl")
+    logger.start_new_run()
+
+    messages = [Message(role="system", content="System"), Message(role="user", content="Task")]
+    logger.log_request(messages)
+    messages.append(Message(role="assistant", content="Working"))
+    messages.append(Message(role="user", content="More"))
+    logger.log_request(messages)
+    # Summarization replaces the history with new message objects
+    messages = [messages[0], Message(role="user", content="[Summary]")]
+    logger.log_request(messages)
+    logger.log_response(content="Done", finish_reason="stop")
+    logger.close()
+
+    log_file = logger.get_log_file_path()
+    assert log_file.suffix == ".jsonl"
+    header, first, second, third, response = _read_jsonl(log_file)
+
+    assert header["type"] == "RUN_START"
+    assert first["offset"] == 0 and [m["content"] for m in first["messages"]] == ["System", "Task"]
+    assert "reset" not in first
+    assert second["offset"] == 2 and [m["content"] for m in second["messages"]] == ["Working", "More"]
+    assert third["reset"] is True and [m["content"] for m in third["messages"]] == ["System", "[Summary]"]
+    assert response == {
+        "index": 4,
+        "type": "RESPONSE",
+        "timestamp": response["timestamp"],
+        "content": "Done",
+        "finish_reason": "stop",
+    }
+
+
+def test_writes_happen_off_the_caller_thread(home, monkeypatch):
+    """Entries are serialized and written by the background writer thread."""
+    import mini_agent.logger as logger_module
+
+    writer_threads = set()
+    original = logger_module._format_entry
+
+    def recording_format(*args):
+        writer_threads.add(threading.current_thread().name)
+        return original(*args)
+
+    monkeypatch.setattr(logger_module, "_format_entry", recording_format)
+
+    logger = AgentLogger(log_format="jsonl")
+    logger.start_new_run()
+    for i in range(100):
+        logger.log_tool_result("bash", {"command": f"echo {i}"}, True, result_content=str(i))
+    logger.close()
+
+    assert writer_threads == {"mini-agent-logger"}
+    records = _read_jsonl(logger.get_log_file_path())
+    assert [r["result"] for r in records[1:]] == [str(i) for i in range(100)]
+
+
+def test_invalid_log_format(home):
+    """Unknown formats are rejected."""
+    with pytest.raises(ValueError):
+        AgentLogger(log_format="xml")
+
+
+async def test_aclose_does_not_block_event_loop(home, monkeypatch):
+    """aclose() waits for the writer thread without stalling other tasks."""
+    import asyncio
+    import time
+
+    import mini_agent.logger as logger_module
+
+    original = logger_module._format_entry
+
+    def slow_format(*args):
+        time.sleep(0.3)
+        return original(*args)
+
+    monkeypatch.setattr(logger_module, "_format_entry", slow_format)
+
+    logger = AgentLogger(log_format="jsonl")
+    logger.start_new_run()
+    logger.log_response(content="Done")
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await logger.aclose()
+    task.cancel()
+
+    assert ticks >= 5
+    assert _read_jsonl(logger.get_log_file_path())[-1]["content"] == "Done"
+
+
+def test_log_command_lists_both_formats(home, capsys):
+    """'mini-agent log' lists text and JSONL run logs."""
+    from mini_agent.cli import show_log_directory
+
+    for log_format in ("text", "jsonl"):
+        logger = AgentLogger(log_format=log_format)
+        logger.start_new_run()
+        logger.close()
+
+    show_log_directory(open_file_manager=False)
+
+    output = capsys.readouterr().out
+    names = {path.name for path in (home / ".mini-agent" / "log").iterdir()}
+    assert {Path(name).suffix for name in names} == {".log", ".jsonl"}
+    for name in names:
+        assert name in output
@@ -2,7 +2,9 @@
 
 import asyncio
 import json
+import sys
 import tempfile
+import time
 from pathlib import Path
 
 import pytest
@@ -12,6 +14,7 @@ from mini_agent.tools.mcp_loader import (
     MCPTimeoutConfig,
     _determine_connection_type,
     cleanup_mcp_connections,
+    get_mcp_server_stats,
     get_mcp_timeout_config,
     load_mcp_tools_async,
     set_mcp_timeout_config,
@@ -558,6 +561,279 @@ async def test_per_server_timeout_override_in_config():
             Path(f.name).unlink()
 
 
+# =============================================================================
+# Concurrent Startup Tests
+# =============================================================================
+
+ECHO_SERVER = """
+import sys
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP(sys.argv[1])
+
+
+@mcp.tool()
+def echo(text: str) -> str:
+    \"\"\"Echo text back.\"\"\"
+    return sys.argv[1] + ":" + text
+
+
+mcp.run()
+"""
+
+
+@pytest.mark.asyncio
+async def test_concurrent_startup_order_and_deadline(tmp_path, monkeypatch):
+    """Servers connect concurrently, register in config order, and a global deadline skips stragglers."""
+    delays = {"slow": 0.3, "fast": 0.0, "hang": 30.0, "broken": 0.0}
+
+    async def fake_connect(self):
+        await asyncio.sleep(delays[self.name])
+        if self.name == "broken":
+            return False
+        self.connect_latency = delays[self.name]
+        self.tools = [f"{self.name}-tool"]
+        return True
+
+    monkeypatch.setattr(MCPServerConnection, "connect", fake_connect)
+    config_file = tmp_path / "mcp.json"
+    config_file.write_text(json.dumps({"mcpServers": {name: {"command": "unused"} for name in delays}}))
+
+    try:
+        start = asyncio.get_running_loop().time()
+        tools = await load_mcp_tools_async(str(config_file), startup_timeout=1.0)
+        elapsed = asyncio.get_running_loop().time() - start
+        assert tools == ["slow-tool", "fast-tool"]
+        assert elapsed < 2.0
+    finally:
+        await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_stdio_connection_lifecycle(tmp_path):
+    """Transport contexts are entered and exited by the connection's own task."""
+    script = tmp_path / "echo_server.py"
+    script.write_text(ECHO_SERVER)
+    conn = MCPServerConnection(name="echo", command=sys.executable, args=[str(script), "echo"], connect_timeout=30.0)
+
+    try:
+        assert await conn.connect()
+        assert conn.connect_latency > 0
+        result = await conn.tools[0].execute(text="hi")
+        assert result.success and result.content == "echo:hi"
+    finally:
+        await conn.disconnect()
+    assert conn.session is None
+
+
+@pytest.mark.asyncio
+async def test_lazy_connect_from_tool_cache(tmp_path):
+    """Lazy mode registers tools from the cache and connects on the first call."""
+    script = tmp_path / "echo_server.py"
+    script.write_text(ECHO_SERVER)
+    cache_dir = tmp_path / "cache"
+    config_file = tmp_path / "mcp.json"
+    config_file.write_text(json.dumps({"mcpServers": {"echo": {"command": sys.executable, "args": [str(script), "echo"]}}}))
+
+    try:
+        # No cache entry yet: connects at startup and writes the tool list
+        tools = await load_mcp_tools_async(str(config_file), lazy=True, cache_dir=cache_dir)
+        assert [tool.name for tool in tools] == ["echo"]
+        await tools[0]._connection._cache_write
+        assert len(list(cache_dir.glob("*.json"))) == 1
+    finally:
+        await cleanup_mcp_connections()
+
+    try:
+        tools = await load_mcp_tools_async(str(config_file), lazy=True, cache_dir=cache_dir)
+        connection = tools[0]._connection
+        assert [tool.name for tool in tools] == ["echo"]
+        assert tools[0].parameters["properties"]["text"]["type"] == "string"
+        assert connection.session is None
+        result = await tools[0].execute(text="hi")
+        assert result.success and result.content == "echo:hi"
+        assert connection.session is not None
+    finally:
+        await cleanup_mcp_connections()
+
+
+@pytest.mark.asyncio
+async def test_lazy_tool_cache_refreshed_in_background(tmp_path):
+    """A changed tool list of an unused lazy server reaches the cache and shows up on the next load."""
+    script = tmp_path / "echo_server.py"
+    script.write_text(ECHO_SERVER)
+    cache_dir = tmp_path / "cache"
+    config_file = tmp_path / "mcp.json"
+    config_file.write_text(json.dumps({"mcpServers": {"echo": {"command": sys.executable, "args": [str(script), "echo"]}}}))
+
+    try:
+        tools = await load_mcp_tools_async(str(config_file), lazy=True, cache_dir=cache_dir)
+        await tools[0]._connection._cache_write
+    finally:
+        await cleanup_mcp_connections()
+
+    # The server gains a tool; this session registers the old list and never calls a tool
+    script.write_text(ECHO_SERVER.replace("mcp.run()", "@mcp.tool()\ndef shout(text: str) -> str:\n    return text.upper()\n\n\nmcp.run()"))
+    try:
+        tools = await load_mcp_tools_async(str(config_file), lazy=True, cache_dir=cache_dir)
+        connection = tools[0]._connection
+        assert [tool.name for tool in tools] == ["echo"]
+        assert await connection._cache_refresh
+        assert connection.session is None
+    finally:
+        await cleanup_mcp_connections()
+
+    try:
+        tools = await load_mcp_tools_async(str(config_file), lazy=True, cache_dir=cache_dir)
+        assert [tool.name for tool in tools] == ["echo", "shout"]
+        assert tools[0]._connection.session is None
+    finally:
+        await cleanup_mcp_connections()
+
+
+FLAKY_SERVER = """
+import os
+import threading
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+
+mcp = FastMCP("flaky")
+
+
+@mcp.tool(annotations=ToolAnnotations(idempotentHint=True))
+def echo(text: str) -> str:
+    \"\"\"Echo text back.\"\"\"
+    return str(os.getpid()) + ":" + text
+
+
+@mcp.tool()
+def crash() -> str:
+    \"\"\"Exit while handling the call.\"\"\"
+    os._exit(1)
+
+
+@mcp.tool()
+def crash_later() -> str:
+    \"\"\"Exit shortly after answering.\"\"\"
+    threading.Timer(0.2, os._exit, args=(1,)).start()
+    return "ok"
+
+
+mcp.run()
+"""
+
+
+@pytest.mark.asyncio
+async def test_reconnect_and_idempotent_retry(tmp_path):
+    """A dead server is reconnected on the next call; only idempotent calls are retried."""
+    script = tmp_path / "flaky_server.py"
+    script.write_text(FLAKY_SERVER)
+    conn = MCPServerConnection(name="flaky", command=sys.executable, args=[str(script)], connect_timeout=30.0)
+
+    try:
+        assert await conn.connect()
+        tools = {tool.name: tool for tool in conn.tools}
+        assert tools["echo"]._retryable and not tools["crash"]._retryable
+        assert await conn.ping() and conn.stats.last_ping_ms is not None
+
+        # The server dies between calls: the idempotent call reconnects and is retried
+        first = await tools["echo"].execute(text="a")
+        assert (await tools["crash_later"].execute()).success
+        await asyncio.sleep(0.5)
+        second = await tools["echo"].execute(text="b")
+        assert second.success and second.content.endswith(":b")
+        assert second.content.split(":")[0] != first.content.split(":")[0]
+        assert conn.stats.retries == 1 and conn.stats.reconnects == 1
+
+        # The server dies during a non-idempotent call: reported, not retried
+        result = await tools["crash"].execute()
+        assert not result.success and "not retried" in result.error
+        assert conn.session is None and not conn.stats.available
+
+        # The next call reconnects
+        assert (await tools["echo"].execute(text="c")).success
+        stats = conn.stats.as_dict()
+        assert stats["available"] and stats["connects"] == 3 and stats["reconnects"] == 2
+        assert stats["calls"] == 5 and stats["call_failures"] == 1 and stats["mean_call_ms"] > 0
+    finally:
+        await conn.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_backoff():
+    """Failed reconnects back off exponentially; calls during the backoff fail fast."""
+    conn = MCPServerConnection(name="missing", command="nonexistent_command_xyz", connect_timeout=5.0)
+    conn.stats.connects = 1  # Was connected before
+
+    with pytest.raises(ConnectionError, match="not available"):
+        await conn.get_session()
+    assert conn._failures == 1 and conn.stats.connect_failures == 1
+    with pytest.raises(ConnectionError, match="next reconnect in"):
+        await conn.get_session()
+    assert conn.stats.connect_failures == 1
+
+    conn._retry_at = 0.0
+    with pytest.raises(ConnectionError, match="not available"):
+        await conn.get_session()
+    assert conn._failures == 2
+    assert conn._retry_at - time.monotonic() > 0.5
+    await conn.disconnect()
+
+
+SLOW_SERVER = """
+import asyncio
+import os
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("slow")
+
+
+@mcp.tool()
+async def slow(text: str) -> str:
+    \"\"\"Answer after a delay.\"\"\"
+    await asyncio.sleep(0.5 if text == "slow" else 0)
+    return str(os.getpid())
+
+
+mcp.run()
+"""
+
+
+@pytest.mark.asyncio
+async def test_session_pool_least_loaded_dispatch(tmp_path):
+    """Concurrent calls are spread over pool_size sessions; extra sessions start only when all are busy."""
+    script = tmp_path / "slow_server.py"
+    script.write_text(SLOW_SERVER)
+    config_file = tmp_path / "mcp.json"
+    config_file.write_text(
+        json.dumps({"mcpServers": {"slow": {"command": sys.executable, "args": [str(script)], "pool_size": 2}}})
+    )
+
+    try:
+        tools = await load_mcp_tools_async(str(config_file), cache_dir=tmp_path / "cache")
+        connection = tools[0]._connection
+        assert len(connection.pool) == 2 and connection.pool[1].session is None
+
+        # Sequential calls reuse the connected session
+        pids = {(await tools[0].execute(text="fast")).content for _ in range(3)}
+        assert len(pids) == 1 and connection.pool[1].session is None
+
+        # A call issued while another is running goes to the second session
+        slow_call = asyncio.create_task(tools[0].execute(text="slow"))
+        await asyncio.sleep(0.1)
+        fast = await tools[0].execute(text="fast")
+        slow = await slow_call
+        assert fast.success and slow.success and fast.content != slow.content
+        assert connection.pool[1].session is not None
+
+        stats = get_mcp_server_stats()["slow"]
+        assert stats["pool_size"] == 2 and stats["sessions"] == 2
+        assert stats["calls"] == 5 and stats["connects"] == 2
+    finally:
+        await cleanup_mcp_connections()
+    assert all(member.session is None for member in connection.pool)
+
+
 async def main():
     """Run all MCP tests."""
     print("=" * 80)
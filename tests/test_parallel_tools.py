@@ -0,0 +1,153 @@
+"""Test cases for concurrent dispatch of read-only tool calls in Agent.run."""
+
+import asyncio
+import time
+from time import perf_counter
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mini_agent import LLMClient
+from mini_agent.agent import Agent
+from mini_agent.schema import FunctionCall, LLMResponse, ToolCall
+from mini_agent.tools import file_tools
+from mini_agent.tools.base import Tool, ToolResult
+from mini_agent.tools.file_tools import ReadTool
+
+
+class SlowTool(Tool):
+    """Tool that sleeps before answering, recording execution order."""
+
+    def __init__(self, name: str, read_only: bool, delay: float, events: list):
+        self._name = name
+        self._read_only = read_only
+        self._delay = delay
+        self._events = events
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return f"Slow tool {self._name}"
+
+    @property
+    def parameters(self) -> dict:
+        return {"type": "object", "properties": {"key": {"type": "string"}}}
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    async def execute(self, key: str) -> ToolResult:
+        self._events.append(("start", self._name, key))
+        await asyncio.sleep(self._delay)
+        self._events.append(("end", self._name, key))
+        return ToolResult(success=True, content=f"{self._name}:{key}")
+
+
+def _call(call_id: str, name: str, key: str) -> ToolCall:
+    return ToolCall(id=call_id, type="function", function=FunctionCall(name=name, arguments={"key": key}))
+
+
+def _make_agent(tmp_path, tools, tool_calls, **kwargs) -> Agent:
+    llm = MagicMock(spec=LLMClient)
+    llm.generate = AsyncMock(
+        side_effect=[
+            LLMResponse(content="", tool_calls=tool_calls, finish_reason="tool_use"),
+            LLMResponse(content="done", finish_reason="stop"),
+        ]
+    )
+    agent = Agent(llm_client=llm, system_prompt="System", tools=tools, workspace_dir=str(tmp_path), **kwargs)
+    agent.add_user_message("go")
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_read_file_calls_run_concurrently_in_order(tmp_path, monkeypatch):
+    """ReadTool calls overlap their (blocking) file I/O, but tool messages keep the tool_call_id order."""
+    read_line_range = file_tools.read_line_range
+
+    def slow_read_line_range(path, start, limit):
+        time.sleep(0.3)  # Slow disk / network filesystem
+        return read_line_range(path, start, limit)
+
+    monkeypatch.setattr(file_tools, "read_line_range", slow_read_line_range)
+    for i in range(5):
+        (tmp_path / f"file_{i}.txt").write_text(f"content {i}\n")
+    calls = [
+        ToolCall(id=f"call_{i}", type="function", function=FunctionCall(name="read_file", arguments={"path": f"file_{i}.txt"}))
+        for i in range(5)
+    ]
+    agent = _make_agent(tmp_path, [ReadTool(workspace_dir=str(tmp_path))], calls)
+
+    start = perf_counter()
+    result = await agent.run()
+    elapsed = perf_counter() - start
+
+    assert result == "done"
+    assert elapsed < 1.0, f"Read-only calls were not parallel: {elapsed:.2f}s"
+    tool_msgs = [m for m in agent.messages if m.role == "tool"]
+    assert [m.tool_call_id for m in tool_msgs] == [c.id for c in calls]
+    assert [m.content for m in tool_msgs] == [f"     1|content {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_side_effecting_call_is_a_barrier(tmp_path):
+    """A side-effecting call waits for earlier reads and blocks later ones."""
+    events = []
+    reader = SlowTool("reader", read_only=True, delay=0.05, events=events)
+    writer = SlowTool("writer", read_only=False, delay=0.05, events=events)
+    calls = [
+        _call("c1", "reader", "a"),
+        _call("c2", "reader", "b"),
+        _call("c3", "writer", "w"),
+        _call("c4", "reader", "c"),
+    ]
+    agent = _make_agent(tmp_path, [reader, writer], calls)
+
+    batches = agent._group_tool_calls(calls)
+    assert [[c.id for c in batch] for batch in batches] == [["c1", "c2"], ["c3"], ["c4"]]
+
+    await agent.run()
+
+    writer_start = events.index(("start", "writer", "w"))
+    writer_end = events.index(("end", "writer", "w"))
+    assert events.index(("end", "reader", "a")) < writer_start
+    assert events.index(("end", "reader", "b")) < writer_start
+    assert events.index(("start", "reader", "c")) > writer_end
+
+
+@pytest.mark.asyncio
+async def test_parallel_dispatch_respects_cap_and_toggle(tmp_path):
+    """max_parallel_tools bounds concurrency; parallel_tool_calls=False runs sequentially."""
+    events = []
+    reader = SlowTool("reader", read_only=True, delay=0.05, events=events)
+    calls = [_call(f"call_{i}", "reader", str(i)) for i in range(6)]
+
+    agent = _make_agent(tmp_path, [reader], calls, max_parallel_tools=2)
+    await agent.run()
+    running = max_running = 0
+    for kind, _, _ in events:
+        running += 1 if kind == "start" else -1
+        max_running = max(max_running, running)
+    assert max_running == 2
+
+    sequential = _make_agent(tmp_path, [reader], calls, parallel_tool_calls=False)
+    assert len(sequential._group_tool_calls(calls)) == len(calls)
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_in_batch_reports_error(tmp_path):
+    """Unknown tools never join a parallel batch and still produce a tool message."""
+    events = []
+    reader = SlowTool("reader", read_only=True, delay=0.01, events=events)
+    calls = [_call("c1", "reader", "a"), _call("c2", "missing", "b"), _call("c3", "reader", "c")]
+    agent = _make_agent(tmp_path, [reader], calls)
+
+    await agent.run()
+
+    tool_msgs = [m for m in agent.messages if m.role == "tool"]
+    assert [m.tool_call_id for m in tool_msgs] == ["c1", "c2", "c3"]
+    assert "Unknown tool: missing" in tool_msgs[1].content
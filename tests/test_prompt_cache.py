@@ -0,0 +1,91 @@
+"""Test cases for Anthropic prompt caching breakpoints and cache usage reporting."""
+
+from types import SimpleNamespace as NS
+
+from mini_agent.llm import AnthropicClient, OpenAIClient
+from mini_agent.llm.anthropic_client import CACHE_CONTROL
+from mini_agent.schema import FunctionCall, Message, ToolCall
+from mini_agent.tools.base import Tool
+
+
+class NoopTool(Tool):
+    def __init__(self, name: str):
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def description(self):
+        return "noop"
+
+    @property
+    def parameters(self):
+        return {"type": "object", "properties": {}}
+
+
+def _history():
+    call = ToolCall(id="t1", type="function", function=FunctionCall(name="a", arguments={}))
+    return [
+        Message(role="system", content="system prompt"),
+        Message(role="user", content="hello"),
+        Message(role="assistant", content="", thinking="hmm", tool_calls=[call]),
+        Message(role="tool", content="result", tool_call_id="t1", name="a"),
+    ]
+
+
+def test_breakpoints_on_system_tools_and_history():
+    client = AnthropicClient(api_key="test-key")
+    request = client._prepare_request(_history(), [NoopTool("a"), NoopTool("b")])
+    original_messages = [dict(m) for m in request["api_messages"]]
+
+    params = client._build_params(request["system_message"], request["api_messages"], request["tools"])
+
+    assert params["system"] == [{"type": "text", "text": "system prompt", "cache_control": CACHE_CONTROL}]
+    assert "cache_control" not in params["tools"][0]
+    assert params["tools"][-1]["cache_control"] == CACHE_CONTROL
+    last_block = params["messages"][-1]["content"][-1]
+    assert last_block["type"] == "tool_result"
+    assert last_block["cache_control"] == CACHE_CONTROL
+    # Caller's request messages are not mutated
+    assert request["api_messages"] == original_messages
+    assert "cache_control" not in request["api_messages"][-1]["content"][-1]
+
+
+def test_history_breakpoint_skips_thinking_and_empty_text():
+    messages = [{"role": "assistant", "content": [{"type": "text", "text": "hi"}, {"type": "thinking", "thinking": "x"}]}]
+    result = AnthropicClient._add_history_breakpoint(messages)
+    assert result[-1]["content"][0]["cache_control"] == CACHE_CONTROL
+    assert "cache_control" not in result[-1]["content"][1]
+
+    plain = [{"role": "user", "content": "question"}]
+    assert AnthropicClient._add_history_breakpoint(plain)[-1]["content"] == [
+        {"type": "text", "text": "question", "cache_control": CACHE_CONTROL}
+    ]
+    assert AnthropicClient._add_history_breakpoint([{"role": "user", "content": ""}])[-1]["content"] == ""
+
+
+def test_prompt_cache_disabled_keeps_plain_request():
+    client = AnthropicClient(api_key="test-key", prompt_cache=False)
+    request = client._prepare_request(_history(), [NoopTool("a")])
+    params = client._build_params(request["system_message"], request["api_messages"], request["tools"])
+    assert params["system"] == "system prompt"
+    assert "cache_control" not in params["tools"][0]
+    assert params["messages"] is request["api_messages"]
+
+
+def test_cache_usage_is_reported():
+    usage = AnthropicClient._build_usage(
+        NS(input_tokens=10, output_tokens=5, cache_read_input_tokens=900, cache_creation_input_tokens=100)
+    )
+    assert usage.prompt_tokens == 1010
+    assert usage.cache_read_tokens == 900
+    assert usage.cache_creation_tokens == 100
+    assert usage.cache_hit
+
+    openai_usage = OpenAIClient._build_usage(
+        NS(prompt_tokens=50, completion_tokens=5, total_tokens=55, prompt_tokens_details=NS(cached_tokens=32))
+    )
+    assert openai_usage.cache_read_tokens == 32
+    assert not OpenAIClient._build_usage(NS(prompt_tokens=1, completion_tokens=1, total_tokens=2)).cache_hit
@@ -0,0 +1,220 @@
+"""Test cases for the grep/glob tools and the workspace search index."""
+
+import os
+import re
+
+from mini_agent.tools import BashTool, EditTool, GlobTool, GrepTool
+from mini_agent.tools.search_index import (
+    WorkspaceIndex,
+    get_workspace_index,
+    is_ignored,
+    parse_gitignore,
+    query_trigrams,
+    required_literals,
+)
+
+
+def _tree(root, files: dict[str, str]) -> None:
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+def test_required_literals():
+    assert required_literals(r"def foo_bar\(") == ["def foo_bar("]
+    assert required_literals(r"class\s+Foo") == ["class", "Foo"]
+    assert required_literals("colou?r") == ["colo", "r"]
+    assert required_literals("(foo|bar)_handler") == ["_handler"]
+    assert required_literals("[abc]def") == ["def"]
+    # Alternation and numeric escapes give no usable literals
+    assert required_literals("foo|bar") == []
+    assert required_literals(r"\x41bc") == []
+    assert required_literals("(?x) foo bar") == []
+    # Case-insensitive matching skips trigrams with non-ASCII, "k" or "s"
+    assert query_trigrams("Kelvin", ignore_case=True) == {tuple(b"elv"), tuple(b"lvi"), tuple(b"vin")}
+
+
+def test_gitignore_rules():
+    chain = (("", parse_gitignore("*.log\n/build/\n!keep.log\ndocs/**/*.tmp\n")), ("sub", parse_gitignore("local.txt\n")))
+    assert is_ignored(chain, "a/b/debug.log", False)
+    assert not is_ignored(chain, "a/keep.log", False)
+    assert is_ignored(chain, "build", True)
+    assert not is_ignored(chain, "build", False)  # directory-only rule
+    assert not is_ignored(chain, "src/build", True)  # anchored rule
+    assert is_ignored(chain, "docs/x/y/z.tmp", False)
+    assert is_ignored(chain, "sub/deeper/local.txt", False)
+    assert not is_ignored(chain, "local.txt", False)
+
+
+async def test_grep_tool(tmp_path):
+    _tree(
+        tmp_path,
+        {
+            ".gitignore": "ignored/\n*.min.js\n",
+            "src/app.py": "import os\n\ndef handle_request(req):\n    return req\n",
+            "src/util.py": "def helper():\n    return 'HANDLE_REQUEST'\n",
+            "src/app.min.js": "function handle_request(){}\n",
+            "ignored/copy.py": "def handle_request(): pass\n",
+            "docs/notes.md": "handle_request is the entry point\n",
+        },
+    )
+    (tmp_path / "data.bin").write_bytes(b"\0handle_request\0")
+    grep = GrepTool(workspace_dir=str(tmp_path), index=WorkspaceIndex(tmp_path, refresh_interval=0))
+
+    result = await grep.execute(pattern=r"def handle_request\(")
+    assert result.success
+    assert result.content == "src/app.py:3:def handle_request(req):"
+
+    result = await grep.execute(pattern="handle_request", case_insensitive=True, output_mode="files_with_matches")
+    assert result.content.splitlines() == ["docs/notes.md", "src/app.py", "src/util.py"]
+
+    result = await grep.execute(pattern="return", path="src", glob="*.py", output_mode="count")
+    assert result.content.splitlines() == ["src/app.py:1", "src/util.py:1"]
+
+    result = await grep.execute(pattern="^", path="src/app.py", max_results=2)
+    assert result.content.splitlines() == ["src/app.py:1:import os", "src/app.py:2:", "... [results truncated at 2; narrow the search with path or glob]"]
+
+    assert (await grep.execute(pattern="no_such_text")).content == "No matches found"
+    result = await grep.execute(pattern="(")
+    assert not result.success and "Invalid regex" in result.error
+    assert not (await grep.execute(pattern="x", path="missing")).success
+
+
+async def test_grep_sees_changes(tmp_path):
+    _tree(tmp_path, {"a.py": "alpha = 1\n", "pkg/b.py": "beta = 2\n"})
+    index = WorkspaceIndex(tmp_path, refresh_interval=0)
+    grep = GrepTool(workspace_dir=str(tmp_path), index=index)
+    assert (await grep.execute(pattern="beta")).content == "pkg/b.py:1:beta = 2"
+
+    # Modified content (new size/mtime), new files and deleted files are picked up
+    (tmp_path / "pkg" / "b.py").write_text("gamma = 22\n")
+    _tree(tmp_path, {"pkg/c.py": "gamma = 3\n"})
+    (tmp_path / "a.py").unlink()
+    assert (await grep.execute(pattern="gamma", output_mode="files_with_matches")).content.splitlines() == ["pkg/b.py", "pkg/c.py"]
+    assert (await grep.execute(pattern="alpha")).content == "No matches found"
+
+    # A new .gitignore applies to already listed directories
+    _tree(tmp_path, {".gitignore": "c.py\n"})
+    assert (await grep.execute(pattern="gamma", output_mode="files_with_matches")).content == "pkg/b.py"
+
+
+async def test_refresh_stats_only_changed_directories(tmp_path, monkeypatch):
+    _tree(tmp_path, {f"pkg{i}/f{j}.py": f"value_{i}_{j} = 1\n" for i in range(5) for j in range(20)})
+    index = get_workspace_index(tmp_path)
+    index.refresh_interval = 0
+    grep = GrepTool(workspace_dir=str(tmp_path))
+    assert (await grep.execute(pattern="value_3_7 ")).success
+
+    # Only pkg2 changed: its files are stat'ed, the other directories just once each
+    _tree(tmp_path, {"pkg2/new.py": "value_new = 1\n"})
+    stats = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda path, *args, **kwargs: stats.append(str(path)) or real_stat(path, *args, **kwargs))
+    assert (await grep.execute(pattern="value_new")).content == "pkg2/new.py:1:value_new = 1"
+    monkeypatch.undo()
+    assert sum(path.endswith(".py") for path in stats) == 21
+
+    # Bash commands make the next search re-check directory mtimes, not stat every file
+    index.refresh_interval = 3600
+    await BashTool(workspace_dir=str(tmp_path)).execute(command="touch pkg4/created.py")
+    stats.clear()
+    monkeypatch.setattr(os, "stat", lambda path, *args, **kwargs: stats.append(str(path)) or real_stat(path, *args, **kwargs))
+    assert (await grep.execute(pattern="value_new")).success
+    monkeypatch.undo()
+    stated_files = [path for path in stats if path.endswith(".py")]
+    assert len(stated_files) == 21 and all(os.path.basename(os.path.dirname(path)) == "pkg4" for path in stated_files)
+    assert [entry.path for entry in index.files("pkg4")][0] == "pkg4/created.py"
+
+    # In-place edits leave directory mtimes alone; the periodic full scan finds them
+    (tmp_path / "pkg0" / "f0.py").write_text("value_edited_in_place = 1\n")
+    index.refresh_interval = index.full_scan_interval = 0
+    assert (await grep.execute(pattern="value_edited_in_place")).content == "pkg0/f0.py:1:value_edited_in_place = 1"
+
+
+async def test_grep_reindexes_candidates_edited_in_place(tmp_path):
+    _tree(tmp_path, {"a.py": "value_a = 1\n"})
+    index = WorkspaceIndex(tmp_path, refresh_interval=3600)
+    assert [match.path for match in index.grep(re.compile("value_a"))] == ["a.py"]
+
+    # Still a candidate for "value_a", so the stale signature is rebuilt when it is opened
+    (tmp_path / "a.py").write_text("value_a = 1\nvalue_b = 2\n")
+    assert index.grep(re.compile("value_a"))[0].count == 1
+    assert [match.path for match in index.grep(re.compile("value_b"))] == ["a.py"]
+
+
+async def test_file_tool_writes_refresh_the_index(tmp_path):
+    _tree(tmp_path, {"a.py": "old_name = 1\n"})
+    index = get_workspace_index(tmp_path)
+    index.refresh_interval = 3600
+    grep = GrepTool(workspace_dir=str(tmp_path))
+    assert grep.index is index
+    assert (await grep.execute(pattern="old_name")).success
+
+    await EditTool(workspace_dir=str(tmp_path)).execute(path="a.py", old_str="old_name", new_str="new_name")
+    assert (await grep.execute(pattern="new_name")).content == "a.py:1:new_name = 1"
+
+
+async def test_grep_skips_files_by_signature(tmp_path, monkeypatch):
+    _tree(tmp_path, {f"f{i}.txt": f"value_{i} = {i}\n" for i in range(50)})
+    index = WorkspaceIndex(tmp_path, refresh_interval=0)
+    grep = GrepTool(workspace_dir=str(tmp_path), index=index)
+    assert (await grep.execute(pattern="value_7 ")).content == "f7.txt:1:value_7 = 7"
+
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(os.path.basename(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    matches = index.grep(re.compile("value_42 ", re.MULTILINE))
+    assert [match.path for match in matches] == ["f42.txt"]
+    assert len(opened) < 10
+
+
+async def test_saved_signatures_reused_by_next_index(tmp_path, monkeypatch):
+    root = tmp_path / "ws"
+    _tree(root, {f"f{i}.txt": f"value_{i} = {i}\n" for i in range(50)})
+    cache_dir = tmp_path / "cache"
+    index = WorkspaceIndex(root, refresh_interval=0, cache_dir=cache_dir)
+    assert [match.path for match in index.grep(re.compile("value_7 "))] == ["f7.txt"]
+    assert index.save()
+    assert not index.save()  # Nothing changed since
+
+    # A new process: unchanged files keep their signatures, the edited one is re-indexed
+    (root / "f3.txt").write_text("value_3 = 3\nvalue_42 = 0\n")
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(os.path.basename(path))
+        return real_open(path, *args, **kwargs)
+
+    restored = WorkspaceIndex(root, refresh_interval=0, cache_dir=cache_dir)
+    monkeypatch.setattr("builtins.open", tracking_open)
+    matches = restored.grep(re.compile("value_42 ", re.MULTILINE))
+    monkeypatch.undo()
+    assert [match.path for match in matches] == ["f3.txt", "f42.txt"]
+    assert len([name for name in opened if name.endswith(".txt")]) < 10
+    assert restored.save()
+
+    # A corrupt saved index is ignored
+    next(cache_dir.glob("*.idx")).write_bytes(b"garbage")
+    assert len(WorkspaceIndex(root, cache_dir=cache_dir).files()) == 50
+
+
+async def test_glob_tool(tmp_path):
+    _tree(tmp_path, {"src/a.py": "", "src/sub/b.py": "", "src/c.ts": "", "build/out.py": "", ".gitignore": "build/\n"})
+    os.utime(tmp_path / "src" / "a.py", ns=(1, 1))
+    glob = GlobTool(workspace_dir=str(tmp_path), index=WorkspaceIndex(tmp_path, refresh_interval=0))
+
+    # Most recently modified first
+    assert (await glob.execute(pattern="**/*.py")).content.splitlines() == ["src/sub/b.py", "src/a.py"]
+    assert (await glob.execute(pattern="*.py", path="src")).content == "src/a.py"
+    assert sorted((await glob.execute(pattern="src/*.{py,ts}")).content.splitlines()) == ["src/a.py", "src/c.ts"]
+    assert (await glob.execute(pattern="*.rs")).content == "No files found"
+
+    result = await glob.execute(pattern="**/*", max_results=2)
+    assert result.content.splitlines()[-1] == "... [2 more files; narrow the pattern or path]"
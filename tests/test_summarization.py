@@ -0,0 +1,85 @@
+"""Test cases for Agent message history summarization."""
+
+import asyncio
+from time import perf_counter
+from unittest.mock import MagicMock
+
+import pytest
+
+from mini_agent import LLMClient
+from mini_agent.agent import Agent
+from mini_agent.schema import LLMResponse, Message
+
+
+class SlowSummaryLLM:
+    """Records summary requests and tracks how many run at the same time."""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def generate(self, messages, tools=None):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        return LLMResponse(content=f"summary #{self.calls}", finish_reason="stop")
+
+
+def _make_agent(tmp_path, llm, rounds: int, **kwargs) -> Agent:
+    agent = Agent(
+        llm_client=MagicMock(spec=LLMClient),
+        system_prompt="System",
+        tools=[],
+        workspace_dir=str(tmp_path),
+        token_limit=10,
+        **kwargs,
+    )
+    agent.llm = llm
+    for i in range(rounds):
+        agent.add_user_message(f"task {i}")
+        agent.messages.append(Message(role="assistant", content=f"working on {i}"))
+        agent.messages.append(Message(role="tool", content=f"result {i}", tool_call_id=f"c{i}", name="bash"))
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_rounds_are_summarized_concurrently(tmp_path):
+    llm = SlowSummaryLLM(delay=0.2)
+    agent = _make_agent(tmp_path, llm, rounds=6, summary_concurrency=3)
+
+    start = perf_counter()
+    await agent._summarize_messages()
+    elapsed = perf_counter() - start
+
+    assert llm.calls == 6
+    assert llm.max_running == 3
+    assert elapsed < 0.8, f"Summaries were not concurrent: {elapsed:.2f}s"
+    # system + (user, summary) per round, in original order
+    assert len(agent.messages) == 13
+    assert [m.content for m in agent.messages[1::2]] == [f"task {i}" for i in range(6)]
+    assert all(m.content.startswith("[Assistant Execution Summary]") for m in agent.messages[2::2])
+
+
+@pytest.mark.asyncio
+async def test_unchanged_rounds_reuse_previous_summaries(tmp_path):
+    llm = SlowSummaryLLM(delay=0)
+    agent = _make_agent(tmp_path, llm, rounds=3)
+    await agent._summarize_messages()
+    assert llm.calls == 3
+    old_summaries = agent.messages[2::2]
+
+    # Only the last round continues after compaction
+    agent.messages.append(Message(role="assistant", content="more work"))
+    agent._skip_next_token_check = False
+    await agent._summarize_messages()
+
+    assert llm.calls == 4
+    assert agent.messages[2] is old_summaries[0]
+    assert agent.messages[4] is old_summaries[1]
+    assert agent.messages[6] is not old_summaries[2]
+    # Summaries are not mistaken for user turns
+    assert len(agent.messages) == 7
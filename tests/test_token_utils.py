@@ -0,0 +1,75 @@
+"""Test cases for the tiered token truncation engine."""
+
+import pytest
+
+from mini_agent.utils import token_utils
+from mini_agent.utils.token_utils import truncate_text_by_tokens
+
+
+class CharEncoding:
+    """Stand-in encoder: one token per character; records encoded lengths."""
+
+    def __init__(self):
+        self.encoded_lengths: list[int] = []
+
+    def encode(self, text: str, disallowed_special=()):
+        self.encoded_lengths.append(len(text))
+        return [ord(ch) for ch in text]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(token) for token in tokens)
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    fake = CharEncoding()
+    monkeypatch.setattr(token_utils, "_encoding", fake)
+    monkeypatch.setattr(token_utils, "_encoding_loaded", True)
+    return fake
+
+
+def _lines(count: int) -> str:
+    return "".join(f"line {i:06d}\n" for i in range(count))
+
+
+def test_under_byte_bound_skips_encoding(encoding):
+    text = _lines(100)
+    assert truncate_text_by_tokens(text, len(text)) == text
+    assert encoding.encoded_lengths == []
+
+
+def test_large_text_encodes_only_windows(encoding):
+    text = _lines(200_000)  # 2.4M characters
+    result = truncate_text_by_tokens(text, 1000)
+
+    assert max(encoding.encoded_lengths) == 500 * token_utils.WINDOW_CHARS_PER_TOKEN
+    assert result.startswith("line 000000\n")
+    assert result.endswith("line 199999\n")
+    assert "[Content truncated: ~2400000 tokens -> ~1000 tokens limit]" in result
+    head, tail = result.split(" ...\n\n", 1)[0], result.rsplit("\n\n", 1)[1]
+    assert len(head) <= 500 + 80 and len(tail) <= 500
+
+
+def test_medium_text_uses_exact_count(encoding):
+    text = _lines(300)  # 3600 characters: windows would overlap
+    result = truncate_text_by_tokens(text, 1000)
+
+    assert encoding.encoded_lengths == [len(text)]
+    assert "[Content truncated: 3600 tokens -> ~1000 tokens limit]" in result
+    assert len(result) < 1200
+
+
+def test_non_ascii_bound_counts_bytes(encoding):
+    # 300 characters but 1200 UTF-8 bytes: not provably under a 500 token budget
+    text = "😀" * 300
+    truncate_text_by_tokens(text, 500)
+    assert encoding.encoded_lengths == [300]
+
+
+def test_fallback_without_tiktoken(monkeypatch):
+    monkeypatch.setattr(token_utils, "_encoding", None)
+    monkeypatch.setattr(token_utils, "_encoding_loaded", True)
+    text = _lines(10_000)
+    result = truncate_text_by_tokens(text, 1000)
+    assert result.startswith("line 000000\n") and result.endswith("line 009999\n")
+    assert "[Content truncated: ~" in result
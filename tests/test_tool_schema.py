@@ -4,7 +4,10 @@ from typing import Any
 
 import pytest
 
+from mini_agent.llm.anthropic_client import AnthropicClient
+from mini_agent.llm.openai_client import OpenAIClient
 from mini_agent.tools.base import Tool, ToolResult
+from mini_agent.tools.registry import ToolRegistry
 
 
 class MockWeatherTool(Tool):
@@ -253,5 +256,54 @@ async def test_tool_execute():
     assert result.content == "Weather data"
 
 
+def test_registry_caches_schemas_until_tools_change():
+    """Registry returns the same schema list until a tool is added or removed."""
+    registry = ToolRegistry([MockWeatherTool(), MockCalculatorTool()])
+
+    schemas = registry.to_schemas()
+    assert [s["name"] for s in schemas] == ["get_weather", "calculator"]
+    assert registry.to_schemas() is schemas
+    assert registry.to_openai_schemas() is registry.to_openai_schemas()
+
+    version = registry.version
+    registry.add(MockSearchTool())
+    assert registry.version == version + 1
+    updated = registry.to_schemas()
+    assert updated is not schemas
+    assert [s["name"] for s in updated] == ["get_weather", "calculator", "search_database"]
+
+    assert registry.remove("calculator").name == "calculator"
+    assert registry.remove("calculator") is None
+    assert [s["function"]["name"] for s in registry.to_openai_schemas()] == ["get_weather", "search_database"]
+
+
+def test_registry_behaves_like_tool_dict():
+    """Registry supports the dict operations Agent.tools callers rely on."""
+    registry = ToolRegistry([MockWeatherTool()])
+
+    assert "get_weather" in registry
+    assert registry["get_weather"].name == "get_weather"
+    assert list(registry) == ["get_weather"]
+    assert len(registry) == 1
+
+    registry["calculator"] = MockCalculatorTool()
+    del registry["get_weather"]
+    assert list(registry.keys()) == ["calculator"]
+    assert registry.version == 2
+
+
+def test_clients_reuse_registry_schemas():
+    """LLM clients use the registry's cached schemas instead of rebuilding them."""
+    registry = ToolRegistry([MockWeatherTool(), MockEnumTool()])
+
+    anthropic_client = AnthropicClient(api_key="test-key")
+    openai_client = OpenAIClient(api_key="test-key")
+
+    assert anthropic_client._convert_tools(registry) is registry.to_schemas()
+    assert openai_client._convert_tools(registry) is registry.to_openai_schemas()
+    # Plain lists are still converted as before
+    assert anthropic_client._convert_tools(list(registry.values())) == registry.to_schemas()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
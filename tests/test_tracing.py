@@ -0,0 +1,140 @@
+"""Test cases for tracing spans, counters and exporters."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mini_agent import LLMClient
+from mini_agent.agent import Agent
+from mini_agent.llm import AnthropicClient
+from mini_agent.schema import FunctionCall, LLMResponse, TokenUsage, ToolCall
+from mini_agent.tools.base import Tool, ToolResult
+from mini_agent.tracing import (
+    ChromeTraceExporter,
+    RecordingTracer,
+    RingBufferExporter,
+    Tracer,
+    get_tracer,
+    set_tracer,
+)
+
+
+class EchoTool(Tool):
+    @property
+    def name(self):
+        return "echo"
+
+    @property
+    def description(self):
+        return "Echo the text"
+
+    @property
+    def parameters(self):
+        return {"type": "object", "properties": {"text": {"type": "string"}}}
+
+    async def execute(self, text: str) -> ToolResult:
+        return ToolResult(success=True, content=text)
+
+
+def _agent(tmp_path, tracer) -> Agent:
+    call = ToolCall(id="c1", type="function", function=FunctionCall(name="echo", arguments={"text": "hi"}))
+    usage = TokenUsage(prompt_tokens=100, completion_tokens=10, total_tokens=110)
+    llm = MagicMock(spec=LLMClient)
+    llm.generate = AsyncMock(
+        side_effect=[
+            LLMResponse(content="", tool_calls=[call], finish_reason="tool_use", usage=usage),
+            LLMResponse(content="done", finish_reason="stop", usage=usage),
+        ]
+    )
+    agent = Agent(llm_client=llm, system_prompt="System", tools=[EchoTool()], workspace_dir=str(tmp_path), tracer=tracer)
+    agent.add_user_message("go")
+    return agent
+
+
+def test_default_tracer_is_noop():
+    tracer = get_tracer()
+    assert type(tracer) is Tracer and not tracer.enabled
+    with tracer.span("anything", key="value") as span:
+        span.set_attribute("ignored", True)
+    tracer.count("anything")
+
+
+@pytest.mark.asyncio
+async def test_agent_run_records_phase_spans(tmp_path):
+    ring = RingBufferExporter()
+    tracer = RecordingTracer([ring])
+    agent = _agent(tmp_path, tracer)
+
+    assert await agent.run() == "done"
+    agent.logger.close()
+
+    spans = list(ring.spans)
+    names = [span.name for span in spans]
+    for expected in ("agent.step", "agent.summarize_check", "llm.generate", "tool.execute", "log.request", "log.serialize", "log.write"):
+        assert expected in names, expected
+    assert names.count("agent.step") == 2
+
+    # Phases of a step are nested under its agent.step span
+    steps = {span.span_id for span in spans if span.name == "agent.step"}
+    tool_span = next(span for span in spans if span.name == "tool.execute")
+    assert tool_span.parent_id in steps
+    assert tool_span.attributes == {"tool": "echo", "success": True}
+    assert all(span.end_ns >= span.start_ns for span in spans)
+
+    assert ring.counters["llm.calls"] == 2
+    assert ring.counters["llm.input_tokens"] == 200
+    assert ring.counters["tool.calls"] == 1
+    assert "tool.failures" not in ring.counters
+    assert ring.summary()["agent.step"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_llm_client_spans_use_process_tracer():
+    ring = RingBufferExporter()
+    set_tracer(RecordingTracer([ring]))
+    try:
+        client = AnthropicClient(api_key="test-key")
+        client._make_api_request = AsyncMock(return_value="raw")
+        client._parse_response = MagicMock(return_value=LLMResponse(content="ok", finish_reason="stop"))
+
+        response = await client.generate([])
+    finally:
+        set_tracer(None)
+
+    assert response.content == "ok"
+    assert [span.name for span in ring.spans] == ["llm.convert_request", "llm.request", "llm.parse_response"]
+    assert get_tracer().enabled is False
+
+
+@pytest.mark.asyncio
+async def test_chrome_trace_export(tmp_path):
+    trace_file = tmp_path / "trace.json"
+    exporter = ChromeTraceExporter(trace_file)
+    agent = _agent(tmp_path, RecordingTracer([exporter]))
+
+    await agent.run()
+    agent.logger.close()
+    exporter.write()
+
+    events = json.loads(trace_file.read_text(encoding="utf-8"))["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    counters = [e for e in events if e["ph"] == "C"]
+    assert {"agent.step", "tool.execute"} <= {e["name"] for e in complete}
+    assert all(e["dur"] >= 0 and isinstance(e["tid"], int) for e in complete)
+    # Logger writer thread spans land on their own track
+    step_tid = next(e["tid"] for e in complete if e["name"] == "agent.step")
+    write_tid = next(e["tid"] for e in complete if e["name"] == "log.write")
+    assert step_tid != write_tid
+    assert [e["args"]["value"] for e in counters if e["name"] == "llm.calls"] == [1, 2]
+
+
+def test_chrome_trace_keeps_most_recent_events(tmp_path):
+    exporter = ChromeTraceExporter(tmp_path / "trace.json", max_events=3)
+    tracer = RecordingTracer([exporter])
+    for _ in range(5):
+        tracer.count("steps", 1)
+
+    trace = json.loads(exporter.write().read_text(encoding="utf-8"))
+    assert [e["args"]["value"] for e in trace["traceEvents"]] == [3, 4, 5]
+    assert trace["otherData"] == {"dropped_events": 2}
@@ -0,0 +1,106 @@
+"""Test cases for the shared LLM HTTP transport."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from mini_agent.config import Config
+from mini_agent.llm import LLMClient
+from mini_agent.llm import transport
+from mini_agent.llm.transport import (
+    TransportConfig,
+    close_shared_http_clients,
+    create_http_client,
+    get_shared_http_client,
+)
+from mini_agent.schema import LLMProvider
+
+
+@pytest.fixture(autouse=True)
+async def _reset_shared_clients():
+    await close_shared_http_clients()
+    yield
+    await close_shared_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_llm_clients_share_one_pool():
+    """LLM clients with the same transport settings reuse one httpx client."""
+    anthropic_llm = LLMClient(api_key="k1", provider=LLMProvider.ANTHROPIC)
+    openai_llm = LLMClient(api_key="k2", provider=LLMProvider.OPENAI)
+    other = LLMClient(api_key="k3", transport_config=TransportConfig(max_connections=5))
+
+    shared = get_shared_http_client()
+    assert anthropic_llm._client.client._client is shared
+    assert openai_llm._client.client._client is shared
+    assert other._client.client._client is not shared
+
+
+@pytest.mark.asyncio
+async def test_closed_client_is_replaced():
+    """Closing the shared clients makes the next lookup create a fresh pool."""
+    first = get_shared_http_client()
+    await close_shared_http_clients()
+    assert first.is_closed
+
+    second = get_shared_http_client()
+    assert second is not first
+    assert not second.is_closed
+
+
+def test_clients_not_shared_across_event_loops():
+    """A later asyncio.run gets its own pool; clients of closed loops are dropped."""
+
+    async def lookup():
+        return get_shared_http_client(), asyncio.get_running_loop()
+
+    async def lookup_and_close():
+        client = get_shared_http_client()
+        assert all(loop is not first_loop for loop, _ in transport._shared_clients)
+        await close_shared_http_clients()
+        return client
+
+    first, first_loop = asyncio.run(lookup())
+    second = asyncio.run(lookup_and_close())
+    assert second is not first
+    assert second.is_closed and not transport._shared_clients
+
+
+@pytest.mark.asyncio
+async def test_http_client_settings(monkeypatch):
+    """Pool limits and timeouts come from the transport configuration."""
+    config = TransportConfig(max_connections=7, max_keepalive_connections=3, connect_timeout=2.0, timeout=30.0)
+    client = create_http_client(config)
+    try:
+        assert client.timeout == httpx.Timeout(30.0, connect=2.0)
+        pool = client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+    finally:
+        await client.aclose()
+
+    # HTTP/2 falls back to HTTP/1.1 when h2 is missing
+    monkeypatch.setattr(transport, "http2_available", lambda: False)
+    client = create_http_client(TransportConfig(http2=True))
+    try:
+        assert client._transport._pool._http2 is False
+    finally:
+        await client.aclose()
+
+
+def test_http_config_from_yaml(tmp_path):
+    """The http section of config.yaml is parsed into LLMConfig.http."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        'api_key: "test-key"\nhttp:\n  max_connections: 50\n  http2: true\n  keepalive_expiry: 12.5\n',
+        encoding="utf-8",
+    )
+
+    config = Config.from_yaml(config_file)
+
+    assert config.llm.http.max_connections == 50
+    assert config.llm.http.http2 is True
+    assert config.llm.http.keepalive_expiry == 12.5
+    assert config.llm.http.max_keepalive_connections == 20
+    assert TransportConfig(**config.llm.http.model_dump()).key()[0] == 50